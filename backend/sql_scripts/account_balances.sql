@@ -0,0 +1,35 @@
+-- =============================================================================
+-- Table: account_balances
+-- =============================================================================
+-- Purpose: Running balance per (account, asset), so balance checks and reads
+-- do not have to SUM the whole ledger_entries history
+--
+-- Maintained by create_gold_trade in the same transaction as the ledger
+-- entries it writes:
+--   • balance = SUM(ledger_entries.amount) for the account and asset
+--   • version is incremented on every change (optimistic readers, audits)
+--
+-- Anything else that inserts ledger_entries must update this table too.
+-- src/balance_reconciliation.py checks (and optionally repairs) it against
+-- the ledger.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS account_balances (
+    account_id UUID NOT NULL REFERENCES accounts(id),
+    asset_id UUID NOT NULL REFERENCES assets(id),
+    balance NUMERIC(20, 6) NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (account_id, asset_id)
+);
+
+-- =============================================================================
+-- Backfill from the existing ledger (no-op for pairs that already have a row)
+-- =============================================================================
+-- Run before deploying the create_gold_trade version that maintains the
+-- table, while no trades are being written.
+INSERT INTO account_balances (account_id, asset_id, balance, version, updated_at)
+SELECT account_id, asset_id, SUM(amount), 1, NOW()
+FROM ledger_entries
+GROUP BY account_id, asset_id
+ON CONFLICT (account_id, asset_id) DO NOTHING;
@@ -0,0 +1,28 @@
+-- =============================================================================
+-- Trigger: accounts_changed_notify
+-- =============================================================================
+-- Purpose: Tell application processes that the accounts table changed
+--
+-- The backend caches account name -> id in memory (src/account_registry.py).
+-- Its listener runs LISTEN accounts_changed and reloads the cache when this
+-- trigger fires, instead of waiting for the cache TTL to expire.
+--
+-- One notification per statement; the payload is the operation name.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION notify_accounts_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('accounts_changed', TG_OP);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS accounts_changed_notify ON accounts;
+
+CREATE TRIGGER accounts_changed_notify
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON accounts
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_accounts_changed();
@@ -0,0 +1,141 @@
+-- =============================================================================
+-- Table: balance_checkpoints
+-- =============================================================================
+-- Purpose: Point-in-time balances, so "balance at value date X" adds up only
+-- the ledger entries since the nearest checkpoint instead of the whole history
+--
+--   • balance = SUM(ledger_entries.amount) for the account and asset over
+--     transactions with value_date <= as_of_date
+--   • Transactions without a value_date (opening deposits) count from the
+--     beginning, i.e. in every checkpoint
+--   • Written once a day by src/balance_checkpoints.py for the previous day
+--   • create_gold_trade adds back-dated trades to the checkpoints they fall
+--     before, so existing checkpoints stay exact
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS balance_checkpoints (
+    account_id UUID NOT NULL REFERENCES accounts(id),
+    asset_id UUID NOT NULL REFERENCES assets(id),
+    as_of_date DATE NOT NULL,
+    balance NUMERIC(20, 6) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (account_id, asset_id, as_of_date)
+);
+
+-- Entries since a checkpoint: transactions by value date, then their entries
+CREATE INDEX IF NOT EXISTS idx_transactions_value_date ON transactions (value_date);
+CREATE INDEX IF NOT EXISTS idx_ledger_entries_transaction_id ON ledger_entries (transaction_id);
+
+-- "Is this date checkpointed yet?" for the periodic job
+CREATE INDEX IF NOT EXISTS idx_balance_checkpoints_as_of_date ON balance_checkpoints (as_of_date);
+
+-- =============================================================================
+-- Function: balance_as_of
+-- =============================================================================
+-- Balance of one account and asset at the end of value date p_as_of:
+-- the nearest checkpoint on or before p_as_of plus the entries after it
+--
+-- Example Usage:
+--   SELECT balance_as_of(
+--       p_account_id := '123e4567-e89b-12d3-a456-426614174000',
+--       p_asset_id   := '123e4567-e89b-12d3-a456-426614174003',
+--       p_as_of      := '2026-02-03'
+--   );
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION balance_as_of(
+    p_account_id UUID,
+    p_asset_id UUID,
+    p_as_of DATE
+)
+RETURNS NUMERIC
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_checkpoint_date DATE;
+    v_checkpoint_balance NUMERIC(20, 6);
+    v_movement NUMERIC(20, 6);
+BEGIN
+    SELECT as_of_date, balance
+    INTO v_checkpoint_date, v_checkpoint_balance
+    FROM balance_checkpoints
+    WHERE account_id = p_account_id
+      AND asset_id = p_asset_id
+      AND as_of_date <= p_as_of
+    ORDER BY as_of_date DESC
+    LIMIT 1;
+
+    IF NOT FOUND THEN
+        -- No checkpoint yet: the whole history up to p_as_of
+        SELECT SUM(le.amount)
+        INTO v_movement
+        FROM ledger_entries le
+        JOIN transactions t ON t.id = le.transaction_id
+        WHERE le.account_id = p_account_id
+          AND le.asset_id = p_asset_id
+          AND (t.value_date <= p_as_of OR t.value_date IS NULL);
+
+        RETURN COALESCE(v_movement, 0);
+    END IF;
+
+    SELECT SUM(le.amount)
+    INTO v_movement
+    FROM transactions t
+    JOIN ledger_entries le ON le.transaction_id = t.id
+    WHERE t.value_date > v_checkpoint_date
+      AND t.value_date <= p_as_of
+      AND le.account_id = p_account_id
+      AND le.asset_id = p_asset_id;
+
+    RETURN v_checkpoint_balance + COALESCE(v_movement, 0);
+END;
+$$;
+
+-- =============================================================================
+-- Function: create_balance_checkpoints
+-- =============================================================================
+-- Write (or rewrite) the checkpoint at p_as_of for every row of
+-- account_balances, as the previous day's balance plus the entries dated
+-- p_as_of. Returns the number of checkpoints written.
+--
+-- The account_balances rows are share-locked in the order create_gold_trade
+-- locks them: trades in flight finish first, and trades arriving meanwhile
+-- wait, so none is missed by both the checkpoint and the back-dating step.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION create_balance_checkpoints(p_as_of DATE)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    PERFORM 1
+    FROM account_balances
+    ORDER BY account_id, asset_id
+    FOR SHARE;
+
+    INSERT INTO balance_checkpoints (account_id, asset_id, as_of_date, balance, created_at)
+    SELECT
+        ab.account_id,
+        ab.asset_id,
+        p_as_of,
+        balance_as_of(ab.account_id, ab.asset_id, p_as_of - 1) + COALESCE(d.amount, 0),
+        NOW()
+    FROM account_balances ab
+    LEFT JOIN (
+        SELECT le.account_id, le.asset_id, SUM(le.amount) AS amount
+        FROM transactions t
+        JOIN ledger_entries le ON le.transaction_id = t.id
+        WHERE t.value_date = p_as_of
+        GROUP BY le.account_id, le.asset_id
+    ) d ON d.account_id = ab.account_id AND d.asset_id = ab.asset_id
+    ON CONFLICT (account_id, asset_id, as_of_date) DO UPDATE
+    SET balance = EXCLUDED.balance,
+        created_at = EXCLUDED.created_at;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
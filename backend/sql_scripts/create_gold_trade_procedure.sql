@@ -7,18 +7,26 @@
 --   • Atomic execution (all-or-nothing)
 --   • Double-entry ledger correctness
 --   • Precision-safe financial calculations
---   • Balance verification before trade execution
+--   • Balance verification before trade execution (single-row locks on
+--     account_balances instead of locking every historical ledger row)
+--   • account_balances kept equal to the ledger in the same transaction
+--   • Back-dated trades added to existing balance_checkpoints
+--   • Safe retries: a repeated idempotency key returns the original trade
+--   • No per-trade asset lookups: callers pass the USD/XAU asset ids
 --   • Full auditability and traceability
 --
 -- Parameters:
 --   p_buyer_account_id    UUID    - Account purchasing gold
 --   p_seller_account_id   UUID    - Account selling gold (usually house)
+--   p_usd_asset_id        UUID    - assets.id of USD
+--   p_xau_asset_id        UUID    - assets.id of XAU
 --   p_gold_grams          NUMERIC - Quantity of gold in grams
 --   p_price_usd_per_oz    NUMERIC - Price in USD per troy ounce
 --   p_value_date          DATE    - Effective settlement date
 --   p_trade_type          TEXT    - Trade direction: 'buy' or 'sell'
 --   p_reference           TEXT    - Human-readable reference (auto-generated if NULL)
 --   p_created_by          UUID    - Admin/user creating the transaction
+--   p_idempotency_key     TEXT    - Client retry key (NULL = not idempotent)
 --
 -- Returns: UUID - The transaction ID
 --
@@ -26,24 +34,36 @@
 --   SELECT create_gold_trade(
 --       p_buyer_account_id   := '123e4567-e89b-12d3-a456-426614174000',
 --       p_seller_account_id  := '123e4567-e89b-12d3-a456-426614174001',
+--       p_usd_asset_id       := '123e4567-e89b-12d3-a456-426614174003',
+--       p_xau_asset_id       := '123e4567-e89b-12d3-a456-426614174004',
 --       p_gold_grams         := 100.0,
 --       p_price_usd_per_oz   := 2000.00,
 --       p_value_date         := '2026-02-03',
 --       p_trade_type         := 'buy',
 --       p_reference          := 'TXN-20260203-001',
---       p_created_by         := '123e4567-e89b-12d3-a456-426614174002'
+--       p_created_by         := '123e4567-e89b-12d3-a456-426614174002',
+--       p_idempotency_key    := '5f0c2a9e-client-retry-key'
 --   );
+--
+-- The overload at the end of this file keeps the signature without asset
+-- ids: it resolves USD and XAU by symbol and calls this function.
 -- =============================================================================
 
+-- Signature without p_idempotency_key; replaced by the one below
+DROP FUNCTION IF EXISTS create_gold_trade(UUID, UUID, NUMERIC, NUMERIC, DATE, TEXT, TEXT, UUID);
+
 CREATE OR REPLACE FUNCTION create_gold_trade(
     p_buyer_account_id UUID,
     p_seller_account_id UUID,
+    p_usd_asset_id UUID,
+    p_xau_asset_id UUID,
     p_gold_grams NUMERIC,
     p_price_usd_per_oz NUMERIC,
     p_value_date DATE,
     p_trade_type TEXT,
     p_reference TEXT DEFAULT NULL,
-    p_created_by UUID DEFAULT NULL
+    p_created_by UUID DEFAULT NULL,
+    p_idempotency_key TEXT DEFAULT NULL
 )
 RETURNS UUID
 LANGUAGE plpgsql
@@ -66,26 +86,36 @@ DECLARE
     c_grams_per_troy_oz CONSTANT NUMERIC := 31.1034768;
 BEGIN
     -- =============================================================================
-    -- STEP 1: Resolve Asset Identifiers
+    -- STEP 0: Replay a Retried Trade
     -- =============================================================================
-    SELECT id INTO v_usd_asset_id
-    FROM assets
-    WHERE symbol = 'USD'
-    LIMIT 1;
-
-    IF v_usd_asset_id IS NULL THEN
-        RAISE EXCEPTION 'Asset USD not found in assets table';
+    -- A committed trade with the same idempotency key is returned as is,
+    -- without validating, locking or booking anything.
+    --
+    -- Requests sharing a key are serialised first: a retry that arrives
+    -- while the original is still in flight waits here until it commits
+    -- and then replays it, instead of re-checking balances the original
+    -- has already debited (and failing with "Insufficient ... balance")
+    IF p_idempotency_key IS NOT NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext(p_idempotency_key));
     END IF;
 
-    SELECT id INTO v_xau_asset_id
-    FROM assets
-    WHERE symbol = 'XAU'
-    LIMIT 1;
+    v_transaction_id := replay_gold_trade(p_idempotency_key, p_trade_type, p_gold_grams, p_price_usd_per_oz);
+    IF v_transaction_id IS NOT NULL THEN
+        RETURN v_transaction_id;
+    END IF;
 
-    IF v_xau_asset_id IS NULL THEN
-        RAISE EXCEPTION 'Asset XAU not found in assets table';
+    -- =============================================================================
+    -- STEP 1: Asset Identifiers
+    -- =============================================================================
+    -- Resolved once by the caller (the backend caches them at startup);
+    -- an id that is not in assets fails the account_balances foreign key
+    IF p_usd_asset_id IS NULL OR p_xau_asset_id IS NULL THEN
+        RAISE EXCEPTION 'USD and XAU asset ids are required';
     END IF;
 
+    v_usd_asset_id := p_usd_asset_id;
+    v_xau_asset_id := p_xau_asset_id;
+
     -- =============================================================================
     -- STEP 2: Convert and Normalize Quantities
     -- =============================================================================
@@ -116,36 +146,54 @@ BEGIN
     -- STEP 3: Lock and Verify Account Balances
     -- =============================================================================
     -- This step prevents race conditions and overdrafts by:
-    --   1. Locking all ledger rows for the accounts/assets
-    --   2. Calculating current balances
+    --   1. Making sure a balance row exists for every (account, asset) touched
+    --   2. Locking those four account_balances rows in a fixed order, so a
+    --      concurrent buy and sell between the same accounts cannot deadlock
     --   3. Verifying sufficient funds before proceeding
+    --
+    -- The missing rows are inserted in the same (account_id, asset_id) order
+    -- as the lock: two first trades in opposite directions would otherwise
+    -- each wait on the other's uncommitted unique-index entry.
+    --
+    -- Each check is a single-row read instead of a SUM over the ledger history.
 
-    -- Lock buyer's USD ledger entries and check balance
-    SELECT COALESCE(SUM(amount), 0)
-    INTO v_buyer_usd_balance
+    INSERT INTO account_balances (account_id, asset_id)
+    SELECT v.account_id, v.asset_id
     FROM (
-        SELECT amount
-        FROM ledger_entries
-        WHERE account_id = p_buyer_account_id
-          AND asset_id = v_usd_asset_id
-        FOR UPDATE
-    ) AS locked_rows;
+        VALUES
+            (p_buyer_account_id, v_usd_asset_id),
+            (p_buyer_account_id, v_xau_asset_id),
+            (p_seller_account_id, v_usd_asset_id),
+            (p_seller_account_id, v_xau_asset_id)
+    ) AS v(account_id, asset_id)
+    ORDER BY v.account_id, v.asset_id
+    ON CONFLICT (account_id, asset_id) DO NOTHING;
+
+    PERFORM 1
+    FROM account_balances
+    WHERE account_id IN (p_buyer_account_id, p_seller_account_id)
+      AND asset_id IN (v_usd_asset_id, v_xau_asset_id)
+    ORDER BY account_id, asset_id
+    FOR UPDATE;
+
+    -- Check buyer's USD balance
+    SELECT balance
+    INTO v_buyer_usd_balance
+    FROM account_balances
+    WHERE account_id = p_buyer_account_id
+      AND asset_id = v_usd_asset_id;
 
     IF v_buyer_usd_balance < v_usd_amount THEN
         RAISE EXCEPTION 'Insufficient USD balance for buyer. Required: %, Available: %',
             v_usd_amount, v_buyer_usd_balance;
     END IF;
 
-    -- Lock seller's XAU ledger entries and check balance
-    SELECT COALESCE(SUM(amount), 0)
+    -- Check seller's XAU balance
+    SELECT balance
     INTO v_seller_xau_balance
-    FROM (
-        SELECT amount
-        FROM ledger_entries
-        WHERE account_id = p_seller_account_id
-          AND asset_id = v_xau_asset_id
-        FOR UPDATE
-    ) AS locked_rows;
+    FROM account_balances
+    WHERE account_id = p_seller_account_id
+      AND asset_id = v_xau_asset_id;
 
     IF v_seller_xau_balance < v_gold_oz THEN
         RAISE EXCEPTION 'Insufficient XAU balance for seller. Required: % oz, Available: % oz',
@@ -156,7 +204,10 @@ BEGIN
     -- STEP 4: Create the Business Transaction Record
     -- =============================================================================
     -- This documents WHAT happened from a business perspective
-    -- Auto-generate reference if not provided
+    -- Auto-generate reference if not provided; the id suffix keeps trades
+    -- booked in the same second apart
+    v_transaction_id := gen_random_uuid();
+
     INSERT INTO transactions (
         id,
         reference,
@@ -165,18 +216,30 @@ BEGIN
         price_usd_per_oz,
         value_date,
         created_by,
+        idempotency_key,
         created_at
     ) VALUES (
-        gen_random_uuid(),
-        COALESCE(p_reference, 'TXN-' || to_char(NOW(), 'YYYYMMDDHH24MISS')),
+        v_transaction_id,
+        COALESCE(
+            p_reference,
+            'TXN-' || to_char(NOW(), 'YYYYMMDDHH24MISS') || '-' || upper(left(v_transaction_id::TEXT, 8))
+        ),
         p_trade_type,
         p_gold_grams,
         p_price_usd_per_oz,
         p_value_date,
         p_created_by,
+        p_idempotency_key,
         NOW()
     )
-    RETURNING id INTO v_transaction_id;
+    ON CONFLICT (idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING;
+
+    -- Backstop for a row with this key written without the advisory lock
+    -- (outside create_gold_trade): the INSERT waited for it to commit, so
+    -- return that trade instead of booking a second one
+    IF NOT FOUND THEN
+        RETURN replay_gold_trade(p_idempotency_key, p_trade_type, p_gold_grams, p_price_usd_per_oz);
+    END IF;
 
     -- =============================================================================
     -- STEP 5: Generate Ledger Entries (Double-Entry Accounting)
@@ -267,7 +330,51 @@ BEGIN
     );
 
     -- =============================================================================
-    -- STEP 6: Validate Ledger Balance Integrity
+    -- STEP 6: Update Running Balances
+    -- =============================================================================
+    -- Apply the same four movements to account_balances (rows locked in STEP 3)
+    UPDATE account_balances ab
+    SET balance = ab.balance + m.amount,
+        version = ab.version + 1,
+        updated_at = NOW()
+    FROM (
+        -- Summed per row, so a trade with buyer = seller nets to zero
+        SELECT account_id, asset_id, SUM(amount) AS amount
+        FROM (VALUES
+            (p_buyer_account_id, v_usd_asset_id, -v_usd_amount::NUMERIC),
+            (p_buyer_account_id, v_xau_asset_id, v_gold_oz::NUMERIC),
+            (p_seller_account_id, v_usd_asset_id, v_usd_amount::NUMERIC),
+            (p_seller_account_id, v_xau_asset_id, -v_gold_oz::NUMERIC)
+        ) AS movements(account_id, asset_id, amount)
+        GROUP BY account_id, asset_id
+    ) AS m
+    WHERE ab.account_id = m.account_id
+      AND ab.asset_id = m.asset_id;
+
+    -- =============================================================================
+    -- STEP 7: Update Balance Checkpoints for Back-Dated Trades
+    -- =============================================================================
+    -- Checkpoints are taken for past value dates, so this normally matches no
+    -- rows; a trade dated on or before a checkpoint is added to it (and to
+    -- every later one). A NULL value date counts in every checkpoint.
+    UPDATE balance_checkpoints bc
+    SET balance = bc.balance + m.amount
+    FROM (
+        SELECT account_id, asset_id, SUM(amount) AS amount
+        FROM (VALUES
+            (p_buyer_account_id, v_usd_asset_id, -v_usd_amount::NUMERIC),
+            (p_buyer_account_id, v_xau_asset_id, v_gold_oz::NUMERIC),
+            (p_seller_account_id, v_usd_asset_id, v_usd_amount::NUMERIC),
+            (p_seller_account_id, v_xau_asset_id, -v_gold_oz::NUMERIC)
+        ) AS movements(account_id, asset_id, amount)
+        GROUP BY account_id, asset_id
+    ) AS m
+    WHERE bc.account_id = m.account_id
+      AND bc.asset_id = m.asset_id
+      AND (p_value_date IS NULL OR bc.as_of_date >= p_value_date);
+
+    -- =============================================================================
+    -- STEP 8: Validate Ledger Balance Integrity
     -- =============================================================================
     -- Verify that all ledger entries balance to zero per asset
     -- This is the fundamental requirement of double-entry accounting
@@ -282,7 +389,7 @@ BEGIN
     END IF;
 
     -- =============================================================================
-    -- STEP 7: Return Transaction ID
+    -- STEP 9: Return Transaction ID
     -- =============================================================================
     -- If we reach here, all validations passed and the transaction is complete
     -- PostgreSQL will automatically commit if this function returns successfully
@@ -291,11 +398,74 @@ BEGIN
 END;
 $$;
 
+-- =============================================================================
+-- Overload: create_gold_trade without asset ids
+-- =============================================================================
+-- Backward-compatible signature for callers that do not cache asset ids:
+-- looks up USD and XAU by symbol (two extra queries per trade) and books the
+-- trade with the function above.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION create_gold_trade(
+    p_buyer_account_id UUID,
+    p_seller_account_id UUID,
+    p_gold_grams NUMERIC,
+    p_price_usd_per_oz NUMERIC,
+    p_value_date DATE,
+    p_trade_type TEXT,
+    p_reference TEXT DEFAULT NULL,
+    p_created_by UUID DEFAULT NULL,
+    p_idempotency_key TEXT DEFAULT NULL
+)
+RETURNS UUID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_usd_asset_id UUID;
+    v_xau_asset_id UUID;
+BEGIN
+    SELECT id INTO v_usd_asset_id
+    FROM assets
+    WHERE symbol = 'USD'
+    LIMIT 1;
+
+    IF v_usd_asset_id IS NULL THEN
+        RAISE EXCEPTION 'Asset USD not found in assets table';
+    END IF;
+
+    SELECT id INTO v_xau_asset_id
+    FROM assets
+    WHERE symbol = 'XAU'
+    LIMIT 1;
+
+    IF v_xau_asset_id IS NULL THEN
+        RAISE EXCEPTION 'Asset XAU not found in assets table';
+    END IF;
+
+    RETURN create_gold_trade(
+        p_buyer_account_id,
+        p_seller_account_id,
+        v_usd_asset_id,
+        v_xau_asset_id,
+        p_gold_grams,
+        p_price_usd_per_oz,
+        p_value_date,
+        p_trade_type,
+        p_reference,
+        p_created_by,
+        p_idempotency_key
+    );
+END;
+$$;
+
 -- =============================================================================
 -- Post-Installation Notes
 -- =============================================================================
 -- After creating this function, you may want to grant execute permissions:
 --
--- GRANT EXECUTE ON FUNCTION create_gold_trade TO your_application_role;
+-- GRANT EXECUTE ON FUNCTION
+--     create_gold_trade(UUID, UUID, UUID, UUID, NUMERIC, NUMERIC, DATE, TEXT, TEXT, UUID, TEXT),
+--     create_gold_trade(UUID, UUID, NUMERIC, NUMERIC, DATE, TEXT, TEXT, UUID, TEXT)
+-- TO your_application_role;
 --
 -- =============================================================================
\ No newline at end of file
@@ -0,0 +1,133 @@
+-- =============================================================================
+-- Migration: partition ledger_entries by month, covering balance index
+-- =============================================================================
+-- Purpose: Keep ledger_entries manageable as history grows
+--
+--   • ledger_entries becomes RANGE partitioned on created_at, one partition
+--     per month (ledger_entries_YYYY_MM) plus a DEFAULT partition
+--   • Old months can be detached / archived without touching live ones
+--   • Primary key becomes (id, created_at): a partitioned table's unique
+--     keys must include the partition column
+--   • (account_id, asset_id) INCLUDE (amount) lets per-account sums
+--     (balance backfill, reconciliation repair, balance_as_of without a
+--     checkpoint) run as index-only scans
+--
+-- Trades no longer scan or lock ledger history: create_gold_trade locks
+-- single account_balances rows (sql_scripts/account_balances.sql).
+--
+-- The conversion copies the table under an ACCESS EXCLUSIVE lock and drops
+-- the original: take a backup and run it in a maintenance window. Running
+-- the script again on a partitioned table only adds missing partitions
+-- and indexes.
+--
+-- Upcoming months are created ahead of time by the app's checkpoint job
+-- (src/balance_checkpoints.py, LEDGER_PARTITION_MONTHS), which runs
+--   SELECT create_ledger_partitions(CURRENT_DATE, 3);
+-- Rows outside every monthly partition land in ledger_entries_default; a
+-- month cannot be created while the default partition holds rows for it.
+-- =============================================================================
+
+-- =============================================================================
+-- Function: create_ledger_partitions
+-- =============================================================================
+-- Create the monthly partitions for p_months months starting with the month
+-- of p_from (existing ones are skipped). Returns the number created.
+-- Concurrent calls (one per app worker) take turns on an advisory lock.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION create_ledger_partitions(p_from DATE, p_months INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_from)::DATE;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('create_ledger_partitions'));
+
+    FOR i IN 1..p_months LOOP
+        v_name := 'ledger_entries_' || to_char(v_month, 'YYYY_MM');
+        IF to_regclass(v_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF ledger_entries FOR VALUES FROM (%L) TO (%L)',
+                v_name,
+                v_month::TIMESTAMPTZ,
+                (v_month + INTERVAL '1 month')::TIMESTAMPTZ
+            );
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + INTERVAL '1 month')::DATE;
+    END LOOP;
+
+    RETURN v_created;
+END;
+$$;
+
+-- =============================================================================
+-- Conversion (skipped when ledger_entries is already partitioned)
+-- =============================================================================
+
+DO $$
+DECLARE
+    v_first_month DATE;
+    v_months INTEGER;
+    v_fk RECORD;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'ledger_entries'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE confrelid = 'ledger_entries'::regclass) THEN
+        RAISE EXCEPTION 'Foreign keys reference ledger_entries; drop them before partitioning';
+    END IF;
+
+    LOCK TABLE ledger_entries IN ACCESS EXCLUSIVE MODE;
+    ALTER TABLE ledger_entries RENAME TO ledger_entries_unpartitioned;
+
+    CREATE TABLE ledger_entries (
+        LIKE ledger_entries_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+    ) PARTITION BY RANGE (created_at);
+
+    FOR v_fk IN
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = 'ledger_entries_unpartitioned'::regclass
+          AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE ledger_entries ADD CONSTRAINT %I %s', v_fk.conname, v_fk.definition);
+    END LOOP;
+
+    -- Every month that has entries, through three months from now
+    SELECT date_trunc('month', COALESCE(MIN(created_at), NOW()))::DATE
+    INTO v_first_month
+    FROM ledger_entries_unpartitioned;
+
+    v_months := (EXTRACT(YEAR FROM age(date_trunc('month', NOW()), v_first_month)) * 12
+                 + EXTRACT(MONTH FROM age(date_trunc('month', NOW()), v_first_month)))::INTEGER + 4;
+
+    PERFORM create_ledger_partitions(v_first_month, v_months);
+    CREATE TABLE ledger_entries_default PARTITION OF ledger_entries DEFAULT;
+
+    INSERT INTO ledger_entries SELECT * FROM ledger_entries_unpartitioned;
+    DROP TABLE ledger_entries_unpartitioned;
+
+    -- After the drop: the old table's index still held the name ledger_entries_pkey
+    ALTER TABLE ledger_entries ADD PRIMARY KEY (id, created_at);
+END;
+$$;
+
+-- Make sure the coming months exist on every run
+SELECT create_ledger_partitions(CURRENT_DATE, 3);
+
+-- =============================================================================
+-- Indexes (created on every partition, existing and future)
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_ledger_entries_account_asset
+    ON ledger_entries (account_id, asset_id) INCLUDE (amount);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_entries_transaction_id
+    ON ledger_entries (transaction_id);
+
+ANALYZE ledger_entries;
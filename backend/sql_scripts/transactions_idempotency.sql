@@ -0,0 +1,65 @@
+-- =============================================================================
+-- Idempotency keys for trades
+-- =============================================================================
+-- Purpose: Let clients retry a trade safely. A retry carrying the same key
+-- returns the original transaction id instead of booking the trade twice.
+--
+--   • transactions.idempotency_key is unique when set (partial index)
+--   • create_gold_trade takes a transaction-level advisory lock on the key,
+--     then calls replay_gold_trade before taking any row locks, so a retry
+--     racing the original waits for it and replays it; the unique index
+--     stays as the backstop if its INSERT still loses a race
+--   • Reusing a key for a different trade raises unique_violation
+--     (the API answers 409)
+-- =============================================================================
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_idempotency_key
+    ON transactions (idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+-- =============================================================================
+-- Function: replay_gold_trade
+-- =============================================================================
+-- Returns the id of the committed trade booked under p_idempotency_key, or
+-- NULL if there is none. Raises if that trade differs from the one retried.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION replay_gold_trade(
+    p_idempotency_key TEXT,
+    p_trade_type TEXT,
+    p_gold_grams NUMERIC,
+    p_price_usd_per_oz NUMERIC
+)
+RETURNS UUID
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_trade transactions%ROWTYPE;
+BEGIN
+    IF p_idempotency_key IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT *
+    INTO v_trade
+    FROM transactions
+    WHERE idempotency_key = p_idempotency_key;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_trade.trade_type IS DISTINCT FROM p_trade_type
+        OR v_trade.gold_grams IS DISTINCT FROM p_gold_grams
+        OR v_trade.price_usd_per_oz IS DISTINCT FROM p_price_usd_per_oz THEN
+        RAISE EXCEPTION 'Idempotency key % was already used for a different trade (%)',
+            p_idempotency_key, v_trade.id
+            USING ERRCODE = 'unique_violation';
+    END IF;
+
+    RETURN v_trade.id;
+END;
+$$;
@@ -0,0 +1,165 @@
+import logging
+import select
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psycopg2
+from fastapi import HTTPException
+
+from src.app_config import app_config
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "accounts_changed"
+
+
+class AccountRegistry:
+    """
+    In-process map of account name -> id, and asset symbol -> id.
+
+    Loaded at startup and reloaded once `ttl_seconds` have passed, using the
+    connection of whichever request notices, so resolving an account is a
+    dict lookup instead of a query. A name that is not cached is looked up
+    individually (accounts created since the last load) before giving a 404.
+    With the listener running, `NOTIFY accounts_changed` (sent by the trigger
+    in sql_scripts/accounts_changed_notify.sql) marks the map stale at once.
+    Asset ids are loaded alongside, so create_gold_trade can be given the
+    USD/XAU ids instead of looking them up on every trade.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self.ids: Dict[str, str] = {}
+        self.asset_ids: Dict[str, str] = {}
+        self.expires_at = 0.0
+        # Bumped by every invalidation; a load only extends `expires_at` if
+        # none happened while it was reading
+        self.generation = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.notifications = 0
+
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def load(self, conn):
+        with self.lock:
+            generation = self.generation
+        with conn.cursor() as cur:
+            cur.execute("SELECT name, id FROM accounts")
+            rows = cur.fetchall()
+            cur.execute("SELECT symbol, id FROM assets")
+            asset_rows = cur.fetchall()
+        with self.lock:
+            self.ids = {name: str(account_id) for name, account_id in rows}
+            self.asset_ids = {symbol: str(asset_id) for symbol, asset_id in asset_rows}
+            if self.generation == generation:
+                self.expires_at = time.monotonic() + self.ttl_seconds
+            self.reloads += 1
+
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+            self.expires_at = 0.0
+
+    def resolve(self, conn, name: str) -> str:
+        if time.monotonic() >= self.expires_at:
+            self.load(conn)
+
+        account_id = self.ids.get(name)
+        if account_id is not None:
+            self.hits += 1
+            return account_id
+
+        self.misses += 1
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM accounts WHERE name = %s", (name,))
+            row = cur.fetchone()
+        if not row:
+            raise HTTPException(404, detail=f"Account '{name}' not found")
+        with self.lock:
+            self.ids[name] = str(row[0])
+        return str(row[0])
+
+    def resolve_asset(self, conn, symbol: str) -> str:
+        if time.monotonic() >= self.expires_at:
+            self.load(conn)
+
+        asset_id = self.asset_ids.get(symbol)
+        if asset_id is not None:
+            return asset_id
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM assets WHERE symbol = %s", (symbol,))
+            row = cur.fetchone()
+        if not row:
+            raise HTTPException(500, detail=f"Asset {symbol} not found in assets table")
+        with self.lock:
+            self.asset_ids[symbol] = str(row[0])
+        return str(row[0])
+
+    def start_listener(self, **connect_kwargs: Any):
+        """Invalidate on NOTIFY from a background thread with its own connection."""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(
+            target=self._listen,
+            kwargs=connect_kwargs,
+            name="account-registry-listener",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def stop_listener(self):
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def _listen(self, **connect_kwargs: Any):
+        retry_delay = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**connect_kwargs)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Changes made while we were not listening
+                self.invalidate()
+                retry_delay = 1
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.notifications += 1
+                        self.invalidate()
+            except psycopg2.Error as e:
+                logger.warning(f"Account registry listener error, retrying in {retry_delay}s: {e}")
+                self._stop.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "accounts": len(self.ids),
+            "assets": len(self.asset_ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "notifications": self.notifications,
+            "listening": self._listener is not None and self._listener.is_alive(),
+        }
+
+
+default_account_registry = AccountRegistry(ttl_seconds=app_config.ACCOUNT_REGISTRY_TTL_SECONDS)
@@ -68,8 +68,57 @@ class AppConfig(BaseSettings):
     DB_PASS: Optional[str] = None
     DB_HOST: Optional[str] = None
     DB_PORT: Optional[int] = None
+    # Postgres connection pool (src.db.default_pool)
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 20
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DB_POOL_HEALTHCHECK_AFTER: float = 30.0  # idle seconds before a SELECT 1 probe
+    DB_EXECUTOR_WORKERS: int = 20  # threads running blocking DB work
+    ACCOUNT_REGISTRY_TTL_SECONDS: float = 300.0
+    ACCOUNT_REGISTRY_LISTEN: bool = True  # reload on NOTIFY accounts_changed
+    BALANCE_RECONCILE_INTERVAL: float = 3600.0  # account_balances vs ledger check; 0 disables
+    BALANCE_CHECKPOINT_INTERVAL: float = 3600.0  # writes yesterday's balance_checkpoints if missing; 0 disables
+    LEDGER_PARTITION_MONTHS: int = 3  # ledger_entries partitions kept ahead by the checkpoint job; 0 disables
+    BATCH_MAX_TRADES: int = 1000  # per /transactions/batch request
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # recent Idempotency-Key -> transaction id
+    IDEMPOTENCY_CACHE_TTL_SECONDS: float = 3600.0
 
     GOLDIO: Optional[str] = None
+
+    # Livechart (OHLC) upstream HTTP pool
+    PRICING_API_BASE_URL: str = "https://gpcintegral.southeastasia.cloudapp.azure.com"
+    PRICING_HTTP_MAX_CONNECTIONS: int = 100
+    PRICING_HTTP_MAX_KEEPALIVE: int = 20
+    PRICING_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    PRICING_HTTP2: bool = True
+
+    # In-process OHLC candle cache
+    OHLC_CACHE_MAX_ENTRIES: int = 512
+    OHLC_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    OHLC_CACHE_SWEEP_INTERVAL: float = 30.0
+    OHLC_CACHE_STALE_SECONDS: int = 300  # serve-stale window past the TTL
+    OHLC_CACHE_REFRESH_AHEAD_TOP_N: int = 10  # 0 disables refresh-ahead
+    # Target interval -> cached source interval resampled locally ({} disables)
+    OHLC_DERIVED_INTERVALS: dict[int, int] = {14400: 3600, 86400: 3600}
+    OHLC_RESAMPLE_TZ: str = "UTC"
+    OHLC_SESSION_START_MINUTES: int = 0  # bucket offset from local midnight
+    # Thread pool for indicator computation off the event loop
+    INDICATOR_WORKERS: int = 4
+    # Live indicators kept alongside each tick stream
+    STREAM_INDICATOR_INTERVAL: int = 3600
+    STREAM_INDICATOR_HISTORY: int = 200  # closed candles used to seed the state
+    # Per-subscriber tick delivery; slower consumers are disconnected
+    STREAM_SEND_TIMEOUT: float = 5.0  # a single websocket send taking longer
+    STREAM_MAX_LAG: float = 2.0  # seconds a delivered tick may have waited
+    STREAM_SLOW_GRACE: float = 10.0  # how long lag may stay above STREAM_MAX_LAG
+
+    # Gold spot price (goldapi.io) for /transactions/gold-price
+    GOLD_SPOT_API_URL: str = "https://www.goldapi.io/api/XAU/USD"
+    GOLD_SPOT_TTL_SECONDS: float = 10.0
+    GOLD_SPOT_TIMEOUT: float = 3.0  # slower than this falls back to the internal feed
+    GOLD_SPOT_RATE_LIMIT_BACKOFF: float = 60.0  # skip goldapi this long after a 429
+    GOLD_SPOT_TICK_MAX_AGE: float = 300.0  # oldest stream tick usable as a fallback
+
     SERPI_API_KEY: Optional[str] = None
 
     GAMA_X_API_KEY: Optional[str] = None
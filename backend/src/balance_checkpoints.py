@@ -0,0 +1,170 @@
+"""
+Daily balance checkpoints for as-of balance queries.
+
+Run from the backend directory (uses the DB_* settings):
+    python -m src.balance_checkpoints                            # yesterday
+    python -m src.balance_checkpoints --date 2026-02-03 --days 30  # backfill
+
+The app checks periodically (BALANCE_CHECKPOINT_INTERVAL) and writes yesterday's
+checkpoint once, if no worker has written it yet; the CLI always (re)writes.
+The same job creates the coming months' ledger_entries partitions
+(LEDGER_PARTITION_MONTHS, sql_scripts/ledger_entries_partitioning.sql).
+Table and functions: sql_scripts/balance_checkpoints.sql.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import psycopg2
+
+from src.app_config import app_config
+from src.db import run_db
+
+logger = logging.getLogger(__name__)
+
+
+def create_balance_checkpoints(conn, as_of: date) -> int:
+    """Write the checkpoint at the end of `as_of` for every account and asset."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT create_balance_checkpoints(%s::DATE)", (as_of,))
+        return cur.fetchone()[0]
+
+
+def create_missing_balance_checkpoints(conn, as_of: date) -> Optional[int]:
+    """create_balance_checkpoints unless `as_of` already has checkpoints (then None)."""
+    with conn.cursor() as cur:
+        # One worker per date: the others wait here, then find its rows
+        cur.execute(
+            "SELECT pg_advisory_xact_lock(hashtext('balance_checkpoints'), %s)",
+            (as_of.toordinal(),),
+        )
+        cur.execute(
+            "SELECT EXISTS (SELECT 1 FROM balance_checkpoints WHERE as_of_date = %s)",
+            (as_of,),
+        )
+        if cur.fetchone()[0]:
+            return None
+    return create_balance_checkpoints(conn, as_of)
+
+
+def create_ledger_partitions(conn, months: int) -> int:
+    """Create any missing monthly ledger_entries partitions from this month on."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT create_ledger_partitions(CURRENT_DATE, %s)", (months,))
+        return cur.fetchone()[0]
+
+
+class BalanceCheckpointer:
+    """
+    Periodically checkpoints the previous day on the DB worker pool.
+
+    Each day is written once: a date this checkpointer already handled is
+    skipped without a query, and one that has checkpoint rows (written by
+    another worker or the CLI) is left alone, so account_balances is only
+    share-locked once a day rather than on every run of every worker.
+    Each run also makes sure the next `partition_months` months of
+    ledger_entries partitions exist, in a transaction of its own.
+    """
+
+    def __init__(self):
+        self.last_date: Optional[date] = None
+        self.last_count = 0
+        self.last_skipped = False
+        self.partitions_created = 0
+        self.last_run_at: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, as_of: Optional[date] = None) -> int:
+        """Checkpoint `as_of` (default yesterday) unless it already is; returns the rows written."""
+        as_of = as_of or date.today() - timedelta(days=1)
+        if as_of == self.last_date:
+            return 0
+        count = await run_db(create_missing_balance_checkpoints, as_of)
+        self.last_date = as_of
+        self.last_count = count or 0
+        self.last_skipped = count is None
+        self.last_run_at = datetime.now(timezone.utc).isoformat()
+        return self.last_count
+
+    async def create_partitions(self, months: int) -> int:
+        created = await run_db(create_ledger_partitions, months)
+        if created:
+            logger.info(f"Created {created} ledger_entries partitions")
+        self.partitions_created += created
+        return created
+
+    def start(self, interval_seconds: float, partition_months: int = 0):
+        if self._task and not self._task.done():
+            return
+
+        async def checkpoint():
+            while True:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Balance checkpoint failed: {e}")
+                if partition_months > 0:
+                    try:
+                        await self.create_partitions(partition_months)
+                    except Exception as e:
+                        logger.error(f"Creating ledger partitions failed: {e}")
+                await asyncio.sleep(interval_seconds)
+
+        self._task = asyncio.create_task(checkpoint())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "as_of_date": self.last_date.isoformat() if self.last_date else None,
+            "checkpoints": self.last_count,
+            "already_checkpointed": self.last_skipped,
+            "partitions_created": self.partitions_created,
+            "checked_at": self.last_run_at,
+        }
+
+
+default_checkpointer = BalanceCheckpointer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=1),
+        help="last value date to checkpoint (default: yesterday)",
+    )
+    parser.add_argument("--days", type=int, default=1, help="number of days ending at --date")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        dbname=app_config.DB_NAME,
+        user=app_config.DB_USER,
+        password=app_config.DB_PASS,
+        host=app_config.DB_HOST,
+        port=app_config.DB_PORT,
+    )
+    try:
+        # Oldest first, so each day builds on the previous day's checkpoint
+        for offset in range(args.days - 1, -1, -1):
+            as_of = args.date - timedelta(days=offset)
+            count = create_balance_checkpoints(conn, as_of)
+            conn.commit()
+            print(f"{as_of}: {count} checkpoints")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
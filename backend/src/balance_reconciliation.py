@@ -0,0 +1,178 @@
+"""
+Reconcile account_balances against the ledger.
+
+Run from the backend directory (uses the DB_* settings):
+    python -m src.balance_reconciliation            # report only
+    python -m src.balance_reconciliation --repair   # also fix mismatched rows
+
+The app runs the same check periodically (BALANCE_RECONCILE_INTERVAL).
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+
+from src.app_config import app_config
+from src.db import run_db
+
+logger = logging.getLogger(__name__)
+
+# One statement, so both sides come from the same snapshot
+_MISMATCH_QUERY = """
+    SELECT
+        COALESCE(l.account_id, b.account_id) AS account_id,
+        COALESCE(l.asset_id, b.asset_id) AS asset_id,
+        COALESCE(l.total, 0) AS ledger_total,
+        COALESCE(b.balance, 0) AS balance
+    FROM (
+        SELECT account_id, asset_id, SUM(amount) AS total
+        FROM ledger_entries
+        GROUP BY account_id, asset_id
+    ) l
+    FULL OUTER JOIN account_balances b
+        ON b.account_id = l.account_id AND b.asset_id = l.asset_id
+    WHERE COALESCE(l.total, 0) <> COALESCE(b.balance, 0)
+"""
+
+
+def find_balance_mismatches(conn) -> List[Dict[str, Any]]:
+    with conn.cursor() as cur:
+        cur.execute(_MISMATCH_QUERY)
+        rows = cur.fetchall()
+    return [
+        {
+            "account_id": str(account_id),
+            "asset_id": str(asset_id),
+            "ledger_total": float(ledger_total),
+            "balance": float(balance),
+        }
+        for account_id, asset_id, ledger_total, balance in rows
+    ]
+
+
+def repair_balance(conn, account_id: str, asset_id: str):
+    """Reset one balance row to its ledger total, under the row lock trades take."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO account_balances (account_id, asset_id)
+            VALUES (%s::UUID, %s::UUID)
+            ON CONFLICT (account_id, asset_id) DO NOTHING
+            """,
+            (account_id, asset_id),
+        )
+        cur.execute(
+            "SELECT 1 FROM account_balances WHERE account_id = %s::UUID AND asset_id = %s::UUID FOR UPDATE",
+            (account_id, asset_id),
+        )
+        # Trades touching this row have committed by now, so the sum is current
+        cur.execute(
+            """
+            UPDATE account_balances
+            SET balance = (
+                    SELECT COALESCE(SUM(amount), 0)
+                    FROM ledger_entries
+                    WHERE account_id = %s::UUID AND asset_id = %s::UUID
+                ),
+                version = version + 1,
+                updated_at = NOW()
+            WHERE account_id = %s::UUID AND asset_id = %s::UUID
+            """,
+            (account_id, asset_id, account_id, asset_id),
+        )
+
+
+def reconcile_balances(conn, repair: bool = False) -> Dict[str, Any]:
+    mismatches = find_balance_mismatches(conn)
+    if repair:
+        for mismatch in mismatches:
+            repair_balance(conn, mismatch["account_id"], mismatch["asset_id"])
+    return {
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "mismatches": mismatches,
+        "repaired": len(mismatches) if repair else 0,
+    }
+
+
+class BalanceReconciler:
+    """Periodic reconciliation on the DB worker pool; reports, never repairs."""
+
+    def __init__(self):
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        result = await run_db(reconcile_balances)
+        self.last_result = result
+        if result["mismatches"]:
+            logger.error(f"account_balances disagrees with the ledger: {result['mismatches']}")
+        return result
+
+    def start(self, interval_seconds: float):
+        if self._task and not self._task.done():
+            return
+
+        async def reconcile():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Balance reconciliation failed: {e}")
+
+        self._task = asyncio.create_task(reconcile())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        if self.last_result is None:
+            return {"checked_at": None, "mismatches": None}
+        return {
+            "checked_at": self.last_result["checked_at"],
+            "mismatches": len(self.last_result["mismatches"]),
+        }
+
+
+default_reconciler = BalanceReconciler()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true", help="reset mismatched rows to the ledger total")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        dbname=app_config.DB_NAME,
+        user=app_config.DB_USER,
+        password=app_config.DB_PASS,
+        host=app_config.DB_HOST,
+        port=app_config.DB_PORT,
+    )
+    try:
+        result = reconcile_balances(conn, repair=args.repair)
+        conn.commit()
+    finally:
+        conn.close()
+
+    for mismatch in result["mismatches"]:
+        print(
+            f"{mismatch['account_id']} {mismatch['asset_id']}: "
+            f"balance {mismatch['balance']} != ledger {mismatch['ledger_total']}"
+        )
+    print(f"{len(result['mismatches'])} mismatched balances, {result['repaired']} repaired")
+    raise SystemExit(1 if result["mismatches"] and not args.repair else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark: list-of-model analytics vs the vectorised pricings.analytics.
+
+For 50, 5k and 500k candles it times the statistics `analyze_price_trend`
+needs (change, change %, volatility, high, low) plus a date-range filter,
+first with the previous per-function list implementations and then with one
+`compute_price_stats` pass and a bisected filter on an OHLCSeries.
+
+Run from the backend directory:
+    python -m src.benchmarks.analytics
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+from src.pricings.analytics import compute_price_stats, filter_by_date_range
+from src.pricings.models import OHLCData
+from src.pricings.series import OHLCSeries
+
+SIZES = (50, 5_000, 500_000)
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_candles(count: int) -> List[OHLCData]:
+    # Newest first, the order the livechart API returns by default
+    candles = []
+    for i in range(count - 1, -1, -1):
+        base = 2000.0 + (i % 500) * 0.5
+        candles.append(
+            OHLCData(
+                timestamp=_EPOCH + timedelta(hours=i),
+                open=base,
+                high=base + 3.0,
+                low=base - 2.5,
+                close=base + 1.0 + (i % 3),
+                volume=100.0 + i % 7,
+                trading_pair="xau_usd",
+            )
+        )
+    return candles
+
+
+# Previous implementations, kept here as the baseline
+def _legacy_price_change(data):
+    if len(data) < 2:
+        return 0.0
+    sorted_data = sorted(data, key=lambda x: x.timestamp)
+    return sorted_data[-1].close - sorted_data[0].close
+
+
+def _legacy_price_change_percentage(data):
+    if len(data) < 2:
+        return 0.0
+    sorted_data = sorted(data, key=lambda x: x.timestamp)
+    return ((sorted_data[-1].close - sorted_data[0].close) / sorted_data[0].close) * 100
+
+
+def _legacy_volatility(data):
+    if len(data) < 2:
+        return 0.0
+    prices = [item.close for item in data]
+    mean_price = sum(prices) / len(prices)
+    variance = sum((price - mean_price) ** 2 for price in prices) / len(prices)
+    return variance ** 0.5
+
+
+def _legacy_filter(data, start_date, end_date):
+    return [item for item in data if start_date <= item.timestamp <= end_date]
+
+
+def _legacy_trend_stats(data, start_date, end_date):
+    return (
+        _legacy_price_change(data),
+        _legacy_price_change_percentage(data),
+        _legacy_volatility(data),
+        max(item.high for item in data),
+        min(item.low for item in data),
+        len(_legacy_filter(data, start_date, end_date)),
+    )
+
+
+def _vector_trend_stats(series, start_date, end_date):
+    stats = compute_price_stats(series)
+    return (
+        stats["change"],
+        stats["change_percent"],
+        stats["volatility"],
+        stats["high"],
+        stats["low"],
+        len(filter_by_date_range(series, start_date, end_date)),
+    )
+
+
+def _time_per_call(fn: Callable[[], object], budget: float = 1.0) -> float:
+    fn()
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= budget:
+            return elapsed / calls
+
+
+def main():
+    print(f"{'candles':>9} {'list':>12} {'vectorised':>12} {'speedup':>9}")
+    for size in SIZES:
+        candles = _make_candles(size)
+        series = OHLCSeries.from_ohlc(candles)
+        start_date = _EPOCH + timedelta(hours=size // 4)
+        end_date = _EPOCH + timedelta(hours=size // 2)
+
+        legacy = _legacy_trend_stats(candles, start_date, end_date)
+        vector = _vector_trend_stats(series, start_date, end_date)
+        for a, b in zip(legacy, vector):
+            assert abs(a - b) <= 1e-9 * max(1.0, abs(a)), (legacy, vector)
+
+        before = _time_per_call(lambda: _legacy_trend_stats(candles, start_date, end_date))
+        after = _time_per_call(lambda: _vector_trend_stats(series, start_date, end_date))
+        print(
+            f"{size:>9} {before * 1e6:>10.1f}us {after * 1e6:>10.1f}us {before / after:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
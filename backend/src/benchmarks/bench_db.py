@@ -0,0 +1,82 @@
+"""
+Scratch schema for the database benchmarks.
+
+Creates the accounts / assets / transactions / ledger_entries tables the
+transactions router and `create_gold_trade` expect, loads every script in
+sql_scripts/, and funds the MC and House Admin accounts. Point it at a
+throwaway database: existing tables are dropped.
+"""
+
+import os
+from pathlib import Path
+
+import psycopg2
+
+DEFAULT_DSN = os.environ.get("BENCH_DATABASE_URL", "postgresql://postgres@127.0.0.1:5432/gold_bench")
+SQL_SCRIPTS = Path(__file__).resolve().parents[2] / "sql_scripts"
+
+_SCHEMA = """
+DROP TABLE IF EXISTS balance_checkpoints, account_balances, ledger_entries, transactions, accounts, assets CASCADE;
+
+CREATE TABLE accounts (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE assets (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    symbol TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE transactions (
+    id UUID PRIMARY KEY,
+    reference TEXT,
+    trade_type TEXT NOT NULL,
+    gold_grams NUMERIC,
+    price_usd_per_oz NUMERIC,
+    value_date DATE,
+    created_by UUID,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE ledger_entries (
+    id UUID PRIMARY KEY,
+    transaction_id UUID NOT NULL REFERENCES transactions(id),
+    account_id UUID NOT NULL REFERENCES accounts(id),
+    asset_id UUID NOT NULL REFERENCES assets(id),
+    amount NUMERIC(20, 6) NOT NULL,
+    entry_type TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+_SEED = """
+INSERT INTO accounts (name) VALUES ('MC'), ('House Admin');
+INSERT INTO assets (symbol) VALUES ('USD'), ('XAU');
+INSERT INTO transactions (id, reference, trade_type) VALUES (gen_random_uuid(), 'OPENING', 'deposit');
+INSERT INTO ledger_entries (id, transaction_id, account_id, asset_id, amount, entry_type)
+SELECT gen_random_uuid(), t.id, a.id, s.id, v.amount, 'credit'
+FROM (VALUES ('MC', 'USD', 1000000000), ('House Admin', 'XAU', 10000000)) AS v(account, asset, amount)
+JOIN accounts a ON a.name = v.account
+JOIN assets s ON s.symbol = v.asset
+CROSS JOIN (SELECT id FROM transactions WHERE reference = 'OPENING') t;
+
+INSERT INTO account_balances (account_id, asset_id, balance, version)
+SELECT account_id, asset_id, SUM(amount), 1
+FROM ledger_entries
+GROUP BY account_id, asset_id;
+"""
+
+
+def reset_bench_database(dsn: str = DEFAULT_DSN):
+    conn = psycopg2.connect(dsn)
+    conn.set_client_encoding("UTF8")  # the scripts contain non-ASCII comments
+    try:
+        with conn.cursor() as cur:
+            cur.execute(_SCHEMA)
+            for script in sorted(SQL_SCRIPTS.glob("*.sql")):
+                cur.execute(script.read_text(encoding="utf-8"))
+            cur.execute(_SEED)
+        conn.commit()
+    finally:
+        conn.close()
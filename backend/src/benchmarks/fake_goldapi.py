@@ -0,0 +1,54 @@
+"""
+Local fake of goldapi.io's `/api/XAU/USD`, for tests and benchmarks.
+
+Answers with a goldapi-shaped quote after `latency` seconds, or with
+`status` (e.g. 429) when set, and counts the requests it receives.
+"""
+
+import asyncio
+import json
+import time
+
+from .stand_in_server import StandInServer
+
+
+class FakeGoldApi(StandInServer):
+    def __init__(self, port: int = 8767, latency: float = 0.0, price: float = 2350.25):
+        super().__init__(port=port, latency=latency)
+        self.price = price
+        self.status = 200
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/api/XAU/USD"
+
+    async def app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.request_count += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.status == 200:
+            payload = {
+                "timestamp": int(time.time()),
+                "metal": "XAU",
+                "currency": "USD",
+                "price": self.price,
+            }
+        else:
+            payload = {"error": "You have exceeded your request limit"}
+
+        body = json.dumps(payload).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: create_gold_trade with and without pre-resolved asset ids.
+
+Books `--trades` alternating MC buys and sells back to back on one
+connection, committing each, through the overload that looks up USD/XAU
+by symbol on every call and through the signature that takes the ids
+(what the backend does, with the ids cached in the account registry).
+The two variants alternate for `--rounds` rounds and the medians are
+reported, since a single run is within the noise of the difference. Needs a local, throwaway Postgres database; it is reset by
+`bench_db.reset_bench_database` before each variant.
+
+Run from the backend directory:
+    python -m src.benchmarks.gold_trade_procedure --dsn postgresql://postgres@127.0.0.1:5432/gold_bench
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+import psycopg2
+
+from src.benchmarks.bench_db import DEFAULT_DSN, reset_bench_database
+
+_BY_SYMBOL = (
+    "SELECT create_gold_trade(%(buyer)s::UUID, %(seller)s::UUID, "
+    "1::NUMERIC, 2350::NUMERIC, CURRENT_DATE, %(side)s::TEXT)"
+)
+_BY_ID = (
+    "SELECT create_gold_trade(%(buyer)s::UUID, %(seller)s::UUID, %(usd)s::UUID, %(xau)s::UUID, "
+    "1::NUMERIC, 2350::NUMERIC, CURRENT_DATE, %(side)s::TEXT)"
+)
+
+
+def _run(dsn: str, query: str, trades: int) -> Dict[str, float]:
+    reset_bench_database(dsn)
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT name, id FROM accounts")
+            accounts = {name: str(account_id) for name, account_id in cur.fetchall()}
+            cur.execute("SELECT symbol, id FROM assets")
+            assets = {symbol: str(asset_id) for symbol, asset_id in cur.fetchall()}
+
+            latencies: List[float] = []
+            started = time.perf_counter()
+            for i in range(trades):
+                buy = i % 2 == 0
+                params = {
+                    "buyer": accounts["MC"] if buy else accounts["House Admin"],
+                    "seller": accounts["House Admin"] if buy else accounts["MC"],
+                    "usd": assets["USD"],
+                    "xau": assets["XAU"],
+                    "side": "buy" if buy else "sell",
+                }
+                call_started = time.perf_counter()
+                cur.execute(query, params)
+                conn.commit()
+                latencies.append(time.perf_counter() - call_started)
+            elapsed = time.perf_counter() - started
+    finally:
+        conn.close()
+
+    return {
+        "trades_per_second": trades / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--trades", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {"asset lookup per trade": _BY_SYMBOL, "pre-resolved asset ids": _BY_ID}
+    runs: Dict[str, List[Dict[str, float]]] = {name: [] for name in variants}
+
+    # The first run after a reset pays for cold caches; keep it out of the numbers
+    _run(args.dsn, _BY_ID, min(args.trades, 200))
+    for _ in range(args.rounds):
+        for name, query in variants.items():
+            runs[name].append(_run(args.dsn, query, args.trades))
+
+    results = {
+        name: {field: statistics.median(r[field] for r in rounds) for field in rounds[0]}
+        for name, rounds in runs.items()
+    }
+
+    print(f"{args.trades} sequential trades, median of {args.rounds} rounds")
+    print(f"{'variant':<24} {'trades/s':>9} {'mean ms':>8} {'p50 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<24} {r['trades_per_second']:>9.1f} {r['mean_ms']:>8.3f} {r['p50_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
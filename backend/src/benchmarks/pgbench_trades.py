@@ -0,0 +1,139 @@
+"""
+pgbench scaling run for create_gold_trade: trades/sec by client count.
+
+Resets a throwaway database with `bench_db.reset_bench_database` (which
+applies every sql_scripts/*.sql, including the ledger partitioning),
+funds both accounts in both assets, optionally preloads `--history` ledger
+entries (one transaction a minute back from now), then runs pgbench with a
+custom script of alternating MC buys and sells against House Admin for
+each `--clients` value. Every trade locks
+the same house balance rows, so the curve shows how far that hot spot lets
+throughput scale, independently of the history size.
+
+Run from the backend directory (pgbench must be on PATH or passed):
+    python -m src.benchmarks.pgbench_trades --dsn postgresql://postgres@127.0.0.1:5432/gold_bench \\
+        --clients 1,2,4,8,16,32 --history 1000000
+"""
+
+import argparse
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+
+import psycopg2
+
+from src.benchmarks.bench_db import DEFAULT_DSN, reset_bench_database
+
+# One trade per transaction; :side picks buy or sell so balances stay put
+_PGBENCH_SCRIPT = """
+\\set grams random(1, 100)
+\\set side random(0, 1)
+\\if :side = 0
+SELECT create_gold_trade((SELECT id FROM accounts WHERE name = 'MC'), (SELECT id FROM accounts WHERE name = 'House Admin'), :grams, 2350, CURRENT_DATE, 'buy');
+\\else
+SELECT create_gold_trade((SELECT id FROM accounts WHERE name = 'House Admin'), (SELECT id FROM accounts WHERE name = 'MC'), :grams, 2350, CURRENT_DATE, 'sell');
+\\endif
+"""
+
+# bench_db funds MC with USD and House Admin with XAU; sells need the reverse
+_FUNDING = """
+INSERT INTO transactions (id, reference, trade_type) VALUES (gen_random_uuid(), 'FUNDING', 'deposit');
+
+INSERT INTO ledger_entries (id, transaction_id, account_id, asset_id, amount, entry_type)
+SELECT gen_random_uuid(), t.id, a.id, s.id, v.amount, 'credit'
+FROM (VALUES ('House Admin', 'USD', 1000000000), ('MC', 'XAU', 10000000)) AS v(account, asset, amount)
+JOIN accounts a ON a.name = v.account
+JOIN assets s ON s.symbol = v.asset
+CROSS JOIN (SELECT id FROM transactions WHERE reference = 'FUNDING') t;
+
+INSERT INTO account_balances (account_id, asset_id, balance, version)
+SELECT account_id, asset_id, SUM(amount), 1
+FROM ledger_entries
+GROUP BY account_id, asset_id
+ON CONFLICT (account_id, asset_id) DO UPDATE SET balance = EXCLUDED.balance;
+"""
+
+_HISTORY = """
+-- Monthly partitions for the backfilled months, so nothing lands in the default one
+SELECT create_ledger_partitions((NOW() - %(transactions)s * INTERVAL '1 minute')::DATE, %(months)s);
+
+INSERT INTO transactions (id, reference, trade_type, value_date, created_at)
+SELECT gen_random_uuid(), 'HISTORY', 'deposit', (NOW() - g * INTERVAL '1 minute')::DATE, NOW() - g * INTERVAL '1 minute'
+FROM generate_series(1, %(transactions)s) AS g;
+
+INSERT INTO ledger_entries (id, transaction_id, account_id, asset_id, amount, entry_type, created_at)
+SELECT gen_random_uuid(), t.id, a.id, s.id, 0, 'credit', t.created_at
+FROM transactions t
+CROSS JOIN accounts a
+CROSS JOIN assets s
+WHERE t.reference = 'HISTORY';
+
+ANALYZE;
+"""
+
+
+def _prepare(dsn: str, history: int):
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(_FUNDING)
+            if history:
+                # Four zero-amount entries (2 accounts x 2 assets) per transaction, one a minute
+                transactions = max(1, history // 4)
+                cur.execute(_HISTORY, {"transactions": transactions, "months": transactions // (30 * 24 * 60) + 2})
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run_pgbench(pgbench: str, dsn: str, script: Path, clients: int, seconds: int) -> float:
+    result = subprocess.run(
+        [
+            pgbench,
+            "--no-vacuum",
+            "--protocol=prepared",
+            f"--file={script}",
+            f"--client={clients}",
+            f"--jobs={min(clients, 8)}",
+            f"--time={seconds}",
+            dsn,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r"tps = ([\d.]+)", result.stdout)
+    if not match:
+        raise RuntimeError(f"Unexpected pgbench output:\n{result.stdout}\n{result.stderr}")
+    return float(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--pgbench", default="pgbench", help="path to the pgbench binary")
+    parser.add_argument("--clients", default="1,2,4,8,16,32", help="comma-separated client counts")
+    parser.add_argument("--seconds", type=int, default=10, help="duration of each run")
+    parser.add_argument("--history", type=int, default=0, help="ledger entries to preload")
+    args = parser.parse_args()
+
+    reset_bench_database(args.dsn)
+    _prepare(args.dsn, args.history)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".sql", delete=False) as f:
+        f.write(_PGBENCH_SCRIPT)
+        script = Path(f.name)
+
+    try:
+        print(f"history {args.history} ledger entries, {args.seconds}s per run")
+        print(f"{'clients':>7} {'trades/s':>10}")
+        for clients in (int(c) for c in args.clients.split(",")):
+            tps = _run_pgbench(args.pgbench, args.dsn, script, clients, args.seconds)
+            print(f"{clients:>7} {tps:>10.1f}")
+    finally:
+        script.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: per-call httpx client vs the shared pooled client in price_client.
+
+Starts a local stand-in livechart server and hammers it with concurrent OHLC
+fetches, reporting requests/sec for both strategies.
+
+Run from the backend directory:
+    python -m src.benchmarks.price_client_pool
+"""
+
+import asyncio
+import contextlib
+import io
+import time
+
+import httpx
+
+from src.benchmarks.stand_in_server import StandInServer
+from src.pricings import price_client
+from src.pricings.models import TradingPair
+
+CONCURRENCY = 32
+DURATION = 5.0  # seconds per run
+
+
+async def _fetch_with_fresh_client(pair: TradingPair):
+    # Previous behaviour: new client (new TCP/TLS handshake) per call
+    params = price_client._build_params(pair, 3600, 50, 0, "desc")
+    async with httpx.AsyncClient(timeout=price_client._REQUEST_TIMEOUT) as client:
+        response = await client.get(f"{price_client.BASE_URL}/livechart/data/", params=params)
+        response.raise_for_status()
+        return price_client._parse_ohlc_response(response.json(), pair)
+
+
+async def _fetch_with_pool(pair: TradingPair):
+    # Bypass request coalescing so only connection reuse is measured
+    return await price_client._fetch_ohlc_data(pair, 3600, 50, 0, "desc")
+
+
+async def _run(fetch) -> float:
+    completed = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def worker():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            await fetch(TradingPair.XAU_USD)
+            completed += 1
+
+    started = time.perf_counter()
+    # price_client logs every fetch; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+    return completed / (time.perf_counter() - started)
+
+
+async def main():
+    server = StandInServer()
+    server.start()
+    price_client.BASE_URL = server.base_url
+    try:
+        before = await _run(_fetch_with_fresh_client)
+        after = await _run(_fetch_with_pool)
+    finally:
+        await price_client.close_http_clients()
+        server.stop()
+
+    print(f"Concurrency {CONCURRENCY}, {DURATION:.0f}s per run")
+    print(f"  per-call client: {before:10.1f} req/s")
+    print(f"  pooled client:   {after:10.1f} req/s")
+    print(f"  speedup:         {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
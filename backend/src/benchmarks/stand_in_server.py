@@ -0,0 +1,104 @@
+"""
+Local stand-in for the gpcintegral livechart upstream, used by the benchmarks.
+
+Serves `/livechart/data/` with deterministic synthetic candles so benchmarks
+never touch the real host. Runs uvicorn in a background thread.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import parse_qs
+
+import uvicorn
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_TOTAL_CANDLES = 100_000
+
+
+def make_candles(interval: int, limit: int, offset: int, sort: str) -> list[dict]:
+    """Synthetic series of `_TOTAL_CANDLES` candles, sliced like the real API."""
+    if sort == "desc":
+        positions = range(_TOTAL_CANDLES - 1 - offset, _TOTAL_CANDLES - 1 - offset - limit, -1)
+    else:
+        positions = range(offset, offset + limit)
+
+    candles = []
+    for i in positions:
+        if i < 0 or i >= _TOTAL_CANDLES:
+            continue
+        base = 2000.0 + (i % 500) * 0.5
+        candles.append(
+            {
+                "Date_time": (_EPOCH + timedelta(seconds=i * interval)).isoformat(),
+                "Open": base,
+                "High": base + 3.0,
+                "Low": base - 2.5,
+                "Close": base + 1.0,
+                "Volume": 100.0 + i % 7,
+            }
+        )
+    return candles
+
+
+class StandInServer:
+    def __init__(self, port: int = 8765, latency: float = 0.0):
+        self.port = port
+        self.latency = latency
+        self.request_count = 0
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.request_count += 1
+        query = parse_qs(scope.get("query_string", b"").decode())
+        interval = int(query.get("interval", ["3600"])[0])
+        limit = int(query.get("limit", ["50"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        sort = query.get("sort", ["desc"])[0]
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        body = json.dumps({"data": make_candles(interval, limit, offset, sort)}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def start(self):
+        config = uvicorn.Config(
+            self.app,
+            host="127.0.0.1",
+            port=self.port,
+            interface="asgi3",
+            log_level="warning",
+            access_log=False,
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.05)
+
+    def stop(self):
+        if self._server:
+            self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=5)
@@ -0,0 +1,110 @@
+"""
+Throughput benchmark: per-trade /transactions/buy|sell calls vs /transactions/batch.
+
+Submits the same alternating buy/sell trades one HTTP call at a time (how
+back-office imports used to run) and then in batches, both all-or-nothing
+and with a savepoint per trade, and prints trades/sec for each. The
+transactions router runs in-process (httpx ASGI transport) on the
+connection pool. Needs a local, throwaway Postgres database; it is reset by
+`bench_db.reset_bench_database` before each mode.
+
+Run from the backend directory:
+    python -m src.benchmarks.transactions_batch --dsn postgresql://postgres@127.0.0.1:5432/gold_bench
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+import src.db
+from src.account_registry import default_account_registry
+from src.benchmarks.bench_db import DEFAULT_DSN, reset_bench_database
+from src.db import DatabasePool, default_db_stats, shutdown_db_executor
+from src.routers.transactions import router as transactions_router
+
+
+def _trades(total: int) -> List[dict]:
+    return [
+        {
+            "side": "buy" if i % 2 == 0 else "sell",
+            "gold_grams": 1.0,
+            "price_usd_per_oz": 2350.0,
+            "reference": f"BENCH-{i}",
+        }
+        for i in range(total)
+    ]
+
+
+async def _one_call_per_trade(client: httpx.AsyncClient, trades: List[dict]) -> int:
+    errors = 0
+    for trade in trades:
+        body = {k: v for k, v in trade.items() if k != "side"}
+        response = await client.post(f"/transactions/{trade['side']}", json=body)
+        if response.status_code != 200:
+            errors += 1
+    return errors
+
+
+async def _batched(client: httpx.AsyncClient, trades: List[dict], batch_size: int, atomic: bool) -> int:
+    errors = 0
+    for start in range(0, len(trades), batch_size):
+        batch = trades[start:start + batch_size]
+        response = await client.post("/transactions/batch", json={"trades": batch, "atomic": atomic})
+        if response.status_code != 200:
+            errors += len(batch)
+        else:
+            errors += response.json()["failed"]
+    return errors
+
+
+async def _run(app: FastAPI, mode: str, trades: List[dict], batch_size: int) -> Dict[str, float]:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.perf_counter()
+        if mode == "one call per trade":
+            errors = await _one_call_per_trade(client, trades)
+        else:
+            errors = await _batched(client, trades, batch_size, atomic=mode == "batch, atomic")
+        elapsed = time.perf_counter() - started
+
+    return {"trades_per_second": len(trades) / elapsed, "seconds": elapsed, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--trades", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    app = FastAPI()
+    app.include_router(transactions_router)
+    trades = _trades(args.trades)
+
+    results = {}
+    for mode in ("one call per trade", "batch, atomic", "batch, savepoints"):
+        reset_bench_database(args.dsn)
+        default_account_registry.invalidate()
+        default_db_stats.reset()
+        pool = DatabasePool(min_size=1, max_size=4, dsn=args.dsn)
+        pool.open()
+        src.db.default_pool = pool
+        try:
+            results[mode] = asyncio.run(_run(app, mode, trades, args.batch_size))
+        finally:
+            pool.close()
+            shutdown_db_executor()
+
+    print(f"{args.trades} trades, batch size {args.batch_size}")
+    print(f"{'mode':<20} {'trades/s':>9} {'seconds':>8} {'errors':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<20} {r['trades_per_second']:>9.1f} {r['seconds']:>8.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
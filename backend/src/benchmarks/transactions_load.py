@@ -0,0 +1,132 @@
+"""
+Load benchmark: /transactions/buy and /transactions/balances against Postgres.
+
+Runs the transactions router in-process (httpx ASGI transport) with
+`--concurrency` clients, first opening a connection per request (the
+previous get_db) and then on the connection pool, and prints where the
+pooled requests spent their time (worker queue, pool wait, queries).
+Needs a local, throwaway Postgres database; it is reset by
+`bench_db.reset_bench_database`.
+
+Run from the backend directory:
+    python -m src.benchmarks.transactions_load --dsn postgresql://postgres@127.0.0.1:5432/gold_bench
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+import src.db
+from src.account_registry import default_account_registry
+from src.benchmarks.bench_db import DEFAULT_DSN, reset_bench_database
+from src.db import DatabasePool, default_db_stats, shutdown_db_executor
+from src.routers.transactions import router as transactions_router
+
+
+class _ConnectPerRequestPool(DatabasePool):
+    # Previous get_db behaviour: a fresh psycopg2 connection per request
+    def checkout(self):
+        return self._connect()
+
+    def release(self, conn):
+        conn.close()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _load(app: FastAPI, method: str, path: str, body: dict | None, total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": _percentile(latencies, 0.95) * 1000,
+        "p99": _percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+async def _run_mode(app: FastAPI, requests_per_endpoint: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    buy = {"gold_grams": 1.0, "price_usd_per_oz": 2350.0, "reference": "BENCH"}
+    return {
+        "buy": await _load(app, "POST", "/transactions/buy", buy, requests_per_endpoint, concurrency),
+        "balances": await _load(app, "GET", "/transactions/balances", None, requests_per_endpoint, concurrency),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    app = FastAPI()
+    app.include_router(transactions_router)
+
+    pools = {
+        "connect per request": _ConnectPerRequestPool(dsn=args.dsn),
+        "pooled": DatabasePool(min_size=args.pool_size, max_size=args.pool_size, dsn=args.dsn),
+    }
+    results = {}
+    for mode, pool in pools.items():
+        reset_bench_database(args.dsn)
+        # The reset recreates the accounts with new ids
+        default_account_registry.invalidate()
+        default_db_stats.reset()
+        pool.open()
+        src.db.default_pool = pool
+        try:
+            results[mode] = asyncio.run(_run_mode(app, args.requests, args.concurrency))
+        finally:
+            pool.close()
+            shutdown_db_executor()
+
+    print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}")
+    print(f"{'mode':<20} {'endpoint':<9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, endpoints in results.items():
+        for endpoint, r in endpoints.items():
+            print(
+                f"{mode:<20} {endpoint:<9} {r['rps']:>8.1f} {r['p50']:>8.2f} "
+                f"{r['p95']:>8.2f} {r['p99']:>8.2f} {r['errors']:>7}"
+            )
+
+    # Where the pooled run's time went: handler-visible total vs queueing vs DB
+    print(f"\n{'operation':<22} {'calls':>6} {'total ms':>9} {'queue ms':>9} {'pool ms':>8} {'db ms':>8}")
+    for name, op in default_db_stats.get_stats()["operations"].items():
+        print(
+            f"{name:<22} {op['calls']:>6} {op['avg_total_ms']:>9.2f} {op['avg_queue_ms']:>9.2f} "
+            f"{op['avg_pool_wait_ms']:>8.2f} {op['avg_db_ms']:>8.2f}"
+        )
+    print(f"pool: {pools['pooled'].get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
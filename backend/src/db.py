@@ -1,19 +1,294 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection, cursor
 from fastapi import HTTPException
 
 from src.app_config import app_config
 
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_QUERY_LABEL_LENGTH = 80
+_MAX_TRACKED_QUERIES = 200
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool's checkout timeout."""
+
+
+class DatabaseStats:
+    """Per-query and per-operation timings, shared by every DB worker thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries: Dict[str, Dict[str, float]] = {}
+        self.operations: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _label(query: Any) -> str:
+        text = query.decode() if isinstance(query, bytes) else str(query)
+        return re.sub(r"\s+", " ", text).strip()[:_QUERY_LABEL_LENGTH]
+
+    def record_query(self, query: Any, seconds: float):
+        label = self._label(query)
+        with self.lock:
+            stats = self.queries.get(label)
+            if stats is None:
+                if len(self.queries) >= _MAX_TRACKED_QUERIES:
+                    return
+                stats = self.queries[label] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+            ms = seconds * 1000
+            stats["calls"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+
+    def record_operation(self, name: str, total: float, queue: float, pool_wait: float, db: float):
+        with self.lock:
+            stats = self.operations.setdefault(
+                name,
+                {"calls": 0, "total_ms": 0.0, "queue_ms": 0.0, "pool_wait_ms": 0.0, "db_ms": 0.0, "max_total_ms": 0.0},
+            )
+            stats["calls"] += 1
+            stats["total_ms"] += total * 1000
+            stats["queue_ms"] += queue * 1000
+            stats["pool_wait_ms"] += pool_wait * 1000
+            stats["db_ms"] += db * 1000
+            stats["max_total_ms"] = max(stats["max_total_ms"], total * 1000)
+
+    def reset(self):
+        with self.lock:
+            self.queries.clear()
+            self.operations.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        def averaged(stats: Dict[str, float], fields: Tuple[str, ...]) -> Dict[str, float]:
+            calls = stats["calls"] or 1
+            result = {"calls": stats["calls"]}
+            for field in fields:
+                result[f"avg_{field}"] = round(stats[field] / calls, 3)
+            result.update({k: round(v, 3) for k, v in stats.items() if k.startswith("max_")})
+            return result
+
+        with self.lock:
+            return {
+                "operations": {
+                    name: averaged(stats, ("total_ms", "queue_ms", "pool_wait_ms", "db_ms"))
+                    for name, stats in self.operations.items()
+                },
+                "queries": {
+                    label: averaged(stats, ("total_ms",))
+                    for label, stats in sorted(self.queries.items(), key=lambda item: -item[1]["total_ms"])
+                },
+            }
+
+
+default_db_stats = DatabaseStats()
+
+
+class TimedCursor(cursor):
+    """Cursor that reports each statement's execution time to its connection."""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self.connection.record_query(query, time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self.connection.record_query(query, time.perf_counter() - started)
+
+
+class TimedConnection(connection):
+    """Connection whose cursors are timed; `query_seconds` accumulates their time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = TimedCursor
+        self.query_seconds = 0.0
+
+    def record_query(self, query: Any, seconds: float):
+        self.query_seconds += seconds
+        default_db_stats.record_query(query, seconds)
+
+
+class DatabasePool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    At most `max_size` connections exist at once; `checkout` waits up to
+    `timeout` seconds for one to be returned. Idle connections are reused
+    most-recently-used first, and one that sat idle longer than
+    `healthcheck_after` seconds is probed with `SELECT 1` before being
+    handed out, so connections dropped by the server are replaced instead
+    of failing the request. Returned connections are rolled back if they
+    are still inside a transaction.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        healthcheck_after: float = 30.0,
+        **connect_kwargs: Any,
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        connect_kwargs.setdefault("connection_factory", TimedConnection)
+        self.connect_kwargs = connect_kwargs
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._closed = False
+
+        self.connections_created = 0
+        self.connections_discarded = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connect_kwargs)
+        with self._lock:
+            self.connections_created += 1
+        return conn
+
+    def open(self):
+        """Pre-open `min_size` connections; failures are logged and retried on demand."""
+        self._closed = False
+        try:
+            while len(self._idle) < self.min_size:
+                conn = self._connect()
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        except psycopg2.OperationalError as e:
+            logger.warning(f"Database pool warm-up failed, connecting on demand: {e}")
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def checkout(self):
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(f"No database connection free after {self.timeout}s")
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.wait_seconds += waited
+
+        try:
+            while True:
+                with self._lock:
+                    conn, last_used = self._idle.pop() if self._idle else (None, 0.0)
+                if conn is None:
+                    conn = self._connect()
+                elif not self._is_healthy(conn, last_used):
+                    self._discard(conn)
+                    continue
+
+                with self._lock:
+                    self._in_use += 1
+                    self.checkouts += 1
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        try:
+            reusable = not conn.closed
+            if reusable and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            reusable = False
+
+        with self._lock:
+            self._in_use -= 1
+            if reusable and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+        if conn is not None:
+            self._discard(conn)
+        self._slots.release()
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self.connections_discarded += 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self.checkouts,
+                "connections_created": self.connections_created,
+                "connections_discarded": self.connections_discarded,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            }
+
+
+default_pool = DatabasePool(
+    min_size=app_config.DB_POOL_MIN_SIZE,
+    max_size=app_config.DB_POOL_MAX_SIZE,
+    timeout=app_config.DB_POOL_TIMEOUT,
+    healthcheck_after=app_config.DB_POOL_HEALTHCHECK_AFTER,
+    dbname=app_config.DB_NAME,
+    user=app_config.DB_USER,
+    password=app_config.DB_PASS,
+    host=app_config.DB_HOST,
+    port=app_config.DB_PORT,
+)
+
+
 def get_db():
+    """Per-request connection checked out of `default_pool` and returned afterwards."""
     try:
-        conn = psycopg2.connect(
-            dbname=app_config.DB_NAME,
-            user=app_config.DB_USER,
-            password=app_config.DB_PASS,
-            host=app_config.DB_HOST,
-            port=app_config.DB_PORT,
-        )
-    except psycopg2.OperationalError as e:
+        conn = default_pool.checkout()
+    except (psycopg2.OperationalError, PoolTimeout) as e:
         raise HTTPException(503, detail=f"Database unavailable: {e}")
 
     try:
@@ -23,4 +298,78 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        default_pool.release(conn)
+
+
+# App-lifetime worker pool for blocking database calls, created lazily and
+# shut down from the FastAPI lifespan. Sized like the connection pool, so a
+# worker never waits long for a connection.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app_config.DB_EXECUTOR_WORKERS,
+            thread_name_prefix="db",
+        )
+    return _executor
+
+
+def shutdown_db_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def run_db(work: Callable[..., T], *args: Any) -> T:
+    """
+    Run `work(conn, *args)` as one transaction on the database worker pool.
+
+    Checkout, the queries, commit (or rollback on error) and the return to
+    `default_pool` all happen on one worker thread, so the event loop never
+    blocks and no connection is held across an await. Timings are recorded
+    in `default_db_stats` under the function's name: time queued for a
+    worker, waiting for a connection, executing queries, and the total as
+    seen by the awaiting handler.
+    """
+    pool = default_pool
+    submitted = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    def unit() -> T:
+        started = time.perf_counter()
+        timings["queue"] = started - submitted
+        try:
+            conn = pool.checkout()
+        except (psycopg2.OperationalError, PoolTimeout) as e:
+            raise HTTPException(503, detail=f"Database unavailable: {e}")
+        checked_out = time.perf_counter()
+        timings["pool_wait"] = checked_out - started
+        db_before = getattr(conn, "query_seconds", 0.0)
+
+        try:
+            result = work(conn, *args)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            timings["db"] = getattr(conn, "query_seconds", 0.0) - db_before
+            pool.release(conn)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_db_executor(), unit)
+    finally:
+        if "db" in timings:
+            default_db_stats.record_operation(
+                getattr(work, "__name__", "db"),
+                time.perf_counter() - submitted,
+                timings["queue"],
+                timings["pool_wait"],
+                timings["db"],
+            )
@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from src.app_config import app_config
+from src.pricings.single_flight import SingleFlight
+
+
+class IdempotencyCache:
+    """
+    Recently committed idempotency key -> transaction id.
+
+    A retry whose key is cached is answered without touching the database,
+    and concurrent requests with the same key and trade share one booking.
+    Keys are kept for `ttl_seconds`, at most `max_entries` of them (least
+    recently used dropped first); older retries fall through to
+    create_gold_trade, which replays them from the unique index on
+    transactions.idempotency_key. Only touched from the event loop.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, Tuple[Hashable, str, float]]" = OrderedDict()
+
+        self.flight = SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, fingerprint: Hashable) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None or entry[2] <= time.monotonic():
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        cached_fingerprint, transaction_id, _ = entry
+        if cached_fingerprint != fingerprint:
+            raise HTTPException(
+                409,
+                detail=f"Idempotency key {key} was already used for a different trade ({transaction_id})",
+            )
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return transaction_id
+
+    def put(self, key: str, fingerprint: Hashable, transaction_id: str):
+        self.entries[key] = (fingerprint, transaction_id, time.monotonic() + self.ttl_seconds)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def run(self, key: str, fingerprint: Hashable, book: Callable[[], Awaitable[str]]) -> str:
+        """Transaction id for `key`: cached, shared with an in-flight booking, or booked now."""
+        transaction_id = self.get(key, fingerprint)
+        if transaction_id is not None:
+            return transaction_id
+
+        async def book_and_remember() -> str:
+            transaction_id = await book()
+            self.put(key, fingerprint, transaction_id)
+            return transaction_id
+
+        return await self.flight.do((key, fingerprint), book_and_remember)
+
+    def get_stats(self) -> Dict[str, Any]:
+        flight = self.flight.get_stats()
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": flight["in_flight"],
+            "bookings": flight["upstream_fetches"],
+            "requests_coalesced": flight["callers_served"] - flight["upstream_fetches"],
+        }
+
+
+default_idempotency_cache = IdempotencyCache(
+    max_entries=app_config.IDEMPOTENCY_CACHE_SIZE,
+    ttl_seconds=app_config.IDEMPOTENCY_CACHE_TTL_SECONDS,
+)
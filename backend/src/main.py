@@ -2,12 +2,12 @@
 import re
 import time
 from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Set
 
-import numpy as np
-import requests
+import httpx
 from fastapi import (
     FastAPI,
     File,
@@ -22,29 +22,64 @@ from src.schema import ChatRequest, UserThread, UserQuestion, NewsRequest, Initi
 from typing import Optional, Dict, Any
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import requests
 import logging
 
-import requests
 from typing import Dict, Any, Optional, List
 import logging
-import pandas as pd
-import numpy as np
 from src.routers.transactions import router as transactions_router
 from src.routers.pricing import router as pricing_router
 from src.routers.news import router as news_router
 from src.routers.agent import router as agent_router
 from src.routers.facebook_webhook import router as facebook_webhook_router
 from src.tools import get_latest_news
+from src.pricings.price_client import close_http_clients, get_livechart_payload
+from src.pricings.cache import default_cache as ohlc_cache
+from src.pricings.stream_manager import default_stream_manager
+from src.pricings.indicators import add_technical_indicators_async, shutdown_indicator_executor
+from src.app_config import app_config
+from src.db import default_pool as db_pool, run_db, shutdown_db_executor
+from src.account_registry import default_account_registry
+from src.balance_checkpoints import default_checkpointer
+from src.balance_reconciliation import default_reconciler
 import re
 
 
 logger = logging.getLogger(__name__)
 
 
-
-
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db_pool.open()
+    try:
+        await run_db(default_account_registry.load)
+    except Exception as e:
+        logger.warning(f"Account registry not loaded at startup, loading on first use: {e}")
+    if app_config.ACCOUNT_REGISTRY_LISTEN:
+        listen_kwargs = {k: v for k, v in db_pool.connect_kwargs.items() if k != "connection_factory"}
+        default_account_registry.start_listener(**listen_kwargs)
+    if app_config.BALANCE_RECONCILE_INTERVAL > 0:
+        default_reconciler.start(app_config.BALANCE_RECONCILE_INTERVAL)
+    if app_config.BALANCE_CHECKPOINT_INTERVAL > 0:
+        default_checkpointer.start(
+            app_config.BALANCE_CHECKPOINT_INTERVAL, app_config.LEDGER_PARTITION_MONTHS
+        )
+    ohlc_cache.start_sweeper(app_config.OHLC_CACHE_SWEEP_INTERVAL)
+    if app_config.OHLC_CACHE_REFRESH_AHEAD_TOP_N > 0:
+        ohlc_cache.start_refresh_ahead(app_config.OHLC_CACHE_REFRESH_AHEAD_TOP_N)
+    yield
+    await ohlc_cache.stop_refresh_ahead()
+    await ohlc_cache.stop_sweeper()
+    await default_stream_manager.stop_all()
+    await close_http_clients()
+    shutdown_indicator_executor()
+    await default_checkpointer.stop()
+    await default_reconciler.stop()
+    default_account_registry.stop_listener()
+    shutdown_db_executor()
+    db_pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -104,134 +139,19 @@ class SentimentAnalysisResponse(BaseModel):
     analysis: str
     keywords: List[str]
 
-def calculate_ema(data: pd.Series, period: int) -> pd.Series:
-    """Calculate Exponential Moving Average"""
-    return data.ewm(span=period, adjust=False).mean()
-
-def calculate_stochastic_d(high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3) -> pd.Series:
-    """Calculate Stochastic %D"""
-    # First calculate %K
-    lowest_low = low.rolling(window=k_period).min()
-    highest_high = high.rolling(window=k_period).max()
-    k_percent = 100 * (close - lowest_low) / (highest_high - lowest_low)
-    
-    # Then calculate %D (SMA of %K)
-    d_percent = k_percent.rolling(window=d_period).mean()
-    return d_percent
-
-def calculate_cci(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
-    """Calculate Commodity Channel Index"""
-    typical_price = (high + low + close) / 3
-    sma_tp = typical_price.rolling(window=period).mean()
-    mean_deviation = typical_price.rolling(window=period).apply(
-        lambda x: np.mean(np.abs(x - np.mean(x))), raw=True
-    )
-    cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
-    return cci
-
-def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate Average Directional Index (ADX)"""
-    # Calculate True Range
-    high_low = high - low
-    high_close = np.abs(high - close.shift())
-    low_close = np.abs(low - close.shift())
-    true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-    
-    # Calculate Directional Movement
-    plus_dm = high.diff()
-    minus_dm = low.diff() * -1
-    
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    plus_dm[(plus_dm < minus_dm)] = 0
-    minus_dm[(minus_dm < plus_dm)] = 0
-    
-    # Calculate smoothed averages
-    tr_smooth = true_range.ewm(alpha=1/period, adjust=False).mean()
-    plus_dm_smooth = plus_dm.ewm(alpha=1/period, adjust=False).mean()
-    minus_dm_smooth = minus_dm.ewm(alpha=1/period, adjust=False).mean()
-    
-    # Calculate Directional Indicators
-    plus_di = 100 * plus_dm_smooth / tr_smooth
-    minus_di = 100 * minus_dm_smooth / tr_smooth
-    
-    # Calculate ADX
-    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-    adx = dx.ewm(alpha=1/period, adjust=False).mean()
-    
-    return adx
-
-def add_technical_indicators(data: list) -> list:
-    """Add technical indicators to the OHLCV data"""
-    if not data or len(data) < 20:  # Need at least 20 periods for reliable calculations
-        logger.warning(f"Insufficient data for technical indicator calculations. Got {len(data) if data else 0} records, need at least 20")
-        # Still add the indicator columns with None values
-        for record in data:
-            record.update({
-                'EMA_20': None,
-                'Stochastic_D': None,
-                'CCI': None,
-                'ADX': None
-            })
-        return data
-    
-    try:
-        # Convert to DataFrame for easier calculations
-        df = pd.DataFrame(data)
-        df['Date_time'] = pd.to_datetime(df['Date_time'])
-        df = df.sort_values('Date_time').reset_index(drop=True)
-        
-        # Calculate technical indicators
-        df['EMA_20'] = calculate_ema(df['Close'], 20)
-        df['Stochastic_D'] = calculate_stochastic_d(df['High'], df['Low'], df['Close'])
-        df['CCI'] = calculate_cci(df['High'], df['Low'], df['Close'])
-        df['ADX'] = calculate_adx(df['High'], df['Low'], df['Close'])
-        
-        # Round values to reasonable precision
-        df['EMA_20'] = df['EMA_20'].round(2)
-        df['Stochastic_D'] = df['Stochastic_D'].round(2)
-        df['CCI'] = df['CCI'].round(2)
-        df['ADX'] = df['ADX'].round(2)
-        
-        # Convert back to list of dictionaries
-        enhanced_data = df.to_dict('records')
-        
-        # Convert datetime back to string format and handle NaN values
-        for record in enhanced_data:
-            if pd.notna(record['Date_time']):
-                record['Date_time'] = record['Date_time'].isoformat()
-            # Handle NaN values by converting to None
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
-        
-        logger.info(f"Technical indicators calculated successfully for {len(enhanced_data)} records")
-        return enhanced_data
-        
-    except Exception as e:
-        logger.error(f"Error calculating technical indicators: {e}")
-        # Fallback: add indicator columns with None values
-        for record in data:
-            record.update({
-                'EMA_20': None,
-                'Stochastic_D': None,
-                'CCI': None,
-                'ADX': None
-            })
-        return data
-
-def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
+async def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
     """
     Fetch live chart data from the API endpoint and add technical indicators.
+
+    The upstream call goes through the shared async pricing client and the
+    indicator computation runs on the indicator worker pool, so a slow
+    upstream or a large window never blocks the event loop.
     """
-    base_url = "https://gpcintegral.southeastasia.cloudapp.azure.com/livechart/data/"
     params = payload.dict()
     
     try:
         logger.info(f"Fetching data for {payload.trading_pairs} with params: {params}")
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status() 
-        data = response.json()
+        data = await get_livechart_payload(params, timeout=30)
         
         original_count = len(data.get('data', []))
         logger.info(f"Successfully fetched {original_count} records")
@@ -239,7 +159,9 @@ def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
         # Add technical indicators to the data
         if 'data' in data and data['data']:
             logger.info("Calculating technical indicators...")
-            enhanced_data = add_technical_indicators(data['data'])
+            enhanced_data = await add_technical_indicators_async(
+                data['data'], payload.trading_pairs, payload.interval
+            )
             data['data'] = enhanced_data
             
             # Count records with calculated indicators (non-null EMA_20)
@@ -248,7 +170,7 @@ def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
         
         return data
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request failed: {e}")
         return None
     except ValueError as e:
@@ -299,12 +221,12 @@ async def get_livechart_data_endpoint(request: LiveChartRequest):
     - CCI: Commodity Channel Index
     - ADX: Average Directional Index
     """
-    data = get_livechart_data(request)
+    data = await get_livechart_data(request)
     if data is None:
         raise HTTPException(status_code=500, detail="Failed to fetch data from external API")
     return data
 
-def fetch_gold_data():
+async def fetch_gold_data():
     """Convenience function to fetch XAU/USD data with default parameters."""
     req = LiveChartRequest(
         trading_pairs="xau_usd",
@@ -314,9 +236,9 @@ def fetch_gold_data():
         limit=2,
         offset=7001
     )
-    return get_livechart_data(req)
+    return await get_livechart_data(req)
 
-def fetch_more_data_for_indicators():
+async def fetch_more_data_for_indicators():
     """
     Fetch more data points to ensure reliable technical indicator calculations.
     Recommended for testing with sufficient data.
@@ -329,7 +251,7 @@ def fetch_more_data_for_indicators():
         limit=50,  # Get more data points for better indicator accuracy
         offset=6950  # Start earlier to get enough historical data
     )
-    return get_livechart_data(req)
+    return await get_livechart_data(req)
 
 def extract_financial_keywords(text: str) -> List[str]:
     """Extract relevant financial and market keywords from text"""
@@ -20,8 +20,7 @@ from src.schema import (
 )
 
 from src.llm import FallbackLLM
-import numpy as np 
-import pandas as pd
+from src.pricings.indicators import add_technical_indicators
 import requests
 from typing import Optional, Dict, Any
 import logging
@@ -50,122 +49,6 @@ class LiveChartRequest(BaseModel):
 
 
 
-def calculate_ema(data: pd.Series, period: int) -> pd.Series:
-    """Calculate Exponential Moving Average"""
-    return data.ewm(span=period, adjust=False).mean()
-
-def calculate_stochastic_d(high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3) -> pd.Series:
-    """Calculate Stochastic %D"""
-    # First calculate %K
-    lowest_low = low.rolling(window=k_period).min()
-    highest_high = high.rolling(window=k_period).max()
-    k_percent = 100 * (close - lowest_low) / (highest_high - lowest_low)
-    
-    # Then calculate %D (SMA of %K)
-    d_percent = k_percent.rolling(window=d_period).mean()
-    return d_percent
-
-def calculate_cci(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
-    """Calculate Commodity Channel Index"""
-    typical_price = (high + low + close) / 3
-    sma_tp = typical_price.rolling(window=period).mean()
-    mean_deviation = typical_price.rolling(window=period).apply(
-        lambda x: np.mean(np.abs(x - np.mean(x))), raw=True
-    )
-    cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
-    return cci
-
-def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate Average Directional Index (ADX)"""
-    # Calculate True Range
-    high_low = high - low
-    high_close = np.abs(high - close.shift())
-    low_close = np.abs(low - close.shift())
-    true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-    
-    # Calculate Directional Movement
-    plus_dm = high.diff()
-    minus_dm = low.diff() * -1
-    
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    plus_dm[(plus_dm < minus_dm)] = 0
-    minus_dm[(minus_dm < plus_dm)] = 0
-    
-    # Calculate smoothed averages
-    tr_smooth = true_range.ewm(alpha=1/period, adjust=False).mean()
-    plus_dm_smooth = plus_dm.ewm(alpha=1/period, adjust=False).mean()
-    minus_dm_smooth = minus_dm.ewm(alpha=1/period, adjust=False).mean()
-    
-    # Calculate Directional Indicators
-    plus_di = 100 * plus_dm_smooth / tr_smooth
-    minus_di = 100 * minus_dm_smooth / tr_smooth
-    
-    # Calculate ADX
-    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-    adx = dx.ewm(alpha=1/period, adjust=False).mean()
-    
-    return adx
-
-def add_technical_indicators(data: list) -> list:
-    """Add technical indicators to the OHLCV data"""
-    if not data or len(data) < 20:  # Need at least 20 periods for reliable calculations
-        logger.warning(f"Insufficient data for technical indicator calculations. Got {len(data) if data else 0} records, need at least 20")
-        # Still add the indicator columns with None values
-        for record in data:
-            record.update({
-                'EMA_20': None,
-                'Stochastic_D': None,
-                'CCI': None,
-                'ADX': None
-            })
-        return data
-    
-    try:
-        # Convert to DataFrame for easier calculations
-        df = pd.DataFrame(data)
-        df['Date_time'] = pd.to_datetime(df['Date_time'])
-        df = df.sort_values('Date_time').reset_index(drop=True)
-        
-        # Calculate technical indicators
-        df['EMA_20'] = calculate_ema(df['Close'], 20)
-        df['Stochastic_D'] = calculate_stochastic_d(df['High'], df['Low'], df['Close'])
-        df['CCI'] = calculate_cci(df['High'], df['Low'], df['Close'])
-        df['ADX'] = calculate_adx(df['High'], df['Low'], df['Close'])
-        
-        # Round values to reasonable precision
-        df['EMA_20'] = df['EMA_20'].round(2)
-        df['Stochastic_D'] = df['Stochastic_D'].round(2)
-        df['CCI'] = df['CCI'].round(2)
-        df['ADX'] = df['ADX'].round(2)
-        
-        # Convert back to list of dictionaries
-        enhanced_data = df.to_dict('records')
-        
-        # Convert datetime back to string format and handle NaN values
-        for record in enhanced_data:
-            if pd.notna(record['Date_time']):
-                record['Date_time'] = record['Date_time'].isoformat()
-            # Handle NaN values by converting to None
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
-        
-        logger.info(f"Technical indicators calculated successfully for {len(enhanced_data)} records")
-        return enhanced_data
-        
-    except Exception as e:
-        logger.error(f"Error calculating technical indicators: {e}")
-        # Fallback: add indicator columns with None values
-        for record in data:
-            record.update({
-                'EMA_20': None,
-                'Stochastic_D': None,
-                'CCI': None,
-                'ADX': None
-            })
-        return data
-
 def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
     """
     Fetch live chart data from the API endpoint and add technical indicators.
@@ -185,7 +68,9 @@ def get_livechart_data(payload: LiveChartRequest) -> Optional[Dict[str, Any]]:
         # Add technical indicators to the data
         if 'data' in data and data['data']:
             logger.info("Calculating technical indicators...")
-            enhanced_data = add_technical_indicators(data['data'])
+            enhanced_data = add_technical_indicators(
+                data['data'], payload.trading_pairs, payload.interval
+            )
             data['data'] = enhanced_data
             
             # Count records with calculated indicators (non-null EMA_20)
@@ -1,11 +1,13 @@
 from .price_client import (
     get_ohlc_data,
     get_ohlc_data_sync,
+    get_ohlc_series,
     get_gold_ohlc,
     get_silver_ohlc,
     get_platinum_ohlc,
     get_sgd_ohlc,
     get_myr_ohlc,
+    close_http_clients,
 )
 from .websocket_client import (
     PriceWebSocketClient,
@@ -17,8 +19,27 @@ from .websocket_client import (
     connect_to_sgd_feed,
     connect_to_myr_feed,
 )
+from .cache import (
+    OHLCCache,
+    get_cached_ohlc_data,
+    get_cached_ohlc_data_with_status,
+    get_cached_ohlc_series,
+)
 from .models import OHLCData, TickData, TradingPair, WebSocketSymbol
-from .stream_manager import PriceStreamManager
+from .series import OHLCSeries
+from .tick_batch import TickBatch
+from .analytics import compute_price_stats
+from .resample import resample_series
+from .indicators import (
+    IndicatorEngine,
+    compute_indicators,
+    add_technical_indicators,
+    add_technical_indicators_async,
+)
+from .incremental import IncrementalIndicators, LiveIndicatorTracker
+from .stream_manager import PriceStreamManager, default_stream_manager
+from .tick_subscriber import TickSubscriber, create_tick_subscriber
+from .spot_price import GoldSpotService, SpotQuote, default_spot_service
 from .utils import (
     filter_ohlc_by_date_range,
     get_latest_ohlc,
@@ -36,11 +57,13 @@ from .utils import (
 __all__ = [
     "get_ohlc_data",
     "get_ohlc_data_sync",
+    "get_ohlc_series",
     "get_gold_ohlc",
     "get_silver_ohlc",
     "get_platinum_ohlc",
     "get_sgd_ohlc",
     "get_myr_ohlc",
+    "close_http_clients",
     "PriceWebSocketClient",
     "MultiPriceWebSocketClient",
     "connect_to_price_feed",
@@ -49,11 +72,31 @@ __all__ = [
     "connect_to_platinum_feed",
     "connect_to_sgd_feed",
     "connect_to_myr_feed",
+    "OHLCCache",
+    "get_cached_ohlc_data",
+    "get_cached_ohlc_data_with_status",
+    "get_cached_ohlc_series",
     "OHLCData",
+    "OHLCSeries",
+    "TickBatch",
+    "compute_price_stats",
+    "resample_series",
+    "IndicatorEngine",
+    "compute_indicators",
+    "add_technical_indicators",
+    "add_technical_indicators_async",
+    "IncrementalIndicators",
+    "LiveIndicatorTracker",
     "TickData",
     "TradingPair",
     "WebSocketSymbol",
     "PriceStreamManager",
+    "default_stream_manager",
+    "TickSubscriber",
+    "create_tick_subscriber",
+    "GoldSpotService",
+    "SpotQuote",
+    "default_spot_service",
     "filter_ohlc_by_date_range",
     "get_latest_ohlc",
     "get_price_change",
@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import OHLCData
+from .series import OHLCSeries, _to_naive_utc, as_series
+
+
+def first_last_indices(series: OHLCSeries) -> Tuple[int, int]:
+    """
+    Positions of the oldest and newest candle.
+
+    Ties resolve the way a stable sort by timestamp would: the oldest is the
+    first occurrence of the minimum, the newest the last occurrence of the max.
+    """
+    if series.direction == 1:
+        return 0, len(series) - 1
+    if series.direction == -1:
+        return len(series) - 1, 0
+
+    timestamps = series.timestamps
+    first = int(np.argmin(timestamps))
+    last = len(timestamps) - 1 - int(np.argmax(timestamps[::-1]))
+    return first, last
+
+
+def compute_price_stats(data: OHLCSeries | Sequence[OHLCData]) -> Dict[str, float]:
+    """
+    All the per-window statistics the pricing utils expose, in one pass.
+
+    Matches the list helpers in `utils` including their empty and
+    single-candle fallbacks (0.0), so callers can compute once and read
+    several values instead of re-sorting the same candles per statistic.
+    """
+    series = as_series(data)
+    count = len(series)
+    if not count:
+        return {
+            "count": 0,
+            "first_close": 0.0,
+            "last_close": 0.0,
+            "change": 0.0,
+            "change_percent": 0.0,
+            "high": 0.0,
+            "low": 0.0,
+            "average": 0.0,
+            "volatility": 0.0,
+        }
+
+    first, last = first_last_indices(series)
+    closes = series.close
+    first_close = float(closes[first])
+    last_close = float(closes[last])
+    average = float(closes.sum()) / count
+
+    if count < 2:
+        change = change_percent = volatility = 0.0
+    else:
+        change = last_close - first_close
+        change_percent = (change / first_close) * 100
+        # Population standard deviation, as the list helper computed it
+        centered = closes - average
+        volatility = (float(centered.dot(centered)) / count) ** 0.5
+
+    return {
+        "count": count,
+        "first_close": first_close,
+        "last_close": last_close,
+        "change": change,
+        "change_percent": change_percent,
+        "high": float(series.high.max()),
+        "low": float(series.low.min()),
+        "average": average,
+        "volatility": volatility,
+    }
+
+
+def date_range_indices(
+    series: OHLCSeries,
+    start_date: datetime,
+    end_date: datetime,
+) -> np.ndarray | slice:
+    """
+    Positions of candles with start_date <= timestamp <= end_date, in series order.
+
+    Ascending and descending series are bisected on their timestamps, so the
+    result is a slice and costs O(log n); unordered input falls back to a mask.
+    """
+    timestamps = series.timestamps
+    start = np.datetime64(_to_naive_utc(start_date), "us")
+    end = np.datetime64(_to_naive_utc(end_date), "us")
+
+    if series.direction == 1:
+        lo = int(np.searchsorted(timestamps, start, side="left"))
+        hi = int(np.searchsorted(timestamps, end, side="right"))
+        return slice(lo, max(lo, hi))
+
+    if series.direction == -1:
+        reversed_ts = timestamps[::-1]
+        n = len(timestamps)
+        lo = int(np.searchsorted(reversed_ts, start, side="left"))
+        hi = int(np.searchsorted(reversed_ts, end, side="right"))
+        return slice(n - max(lo, hi), n - lo)
+
+    return np.flatnonzero((timestamps >= start) & (timestamps <= end))
+
+
+def filter_by_date_range(
+    series: OHLCSeries,
+    start_date: datetime,
+    end_date: datetime,
+) -> OHLCSeries:
+    return series[date_range_indices(series, start_date, end_date)]
+
+
+def moving_average(closes: np.ndarray, window: int) -> float:
+    """Mean of the last `window` closes (all of them if there are fewer)."""
+    if not len(closes):
+        return 0.0
+    return float(closes[-window:].mean())
+
+
+def select(data: Sequence[OHLCData], indices: np.ndarray | slice) -> List[OHLCData]:
+    """Pick the original candle objects at `indices`, keeping their order."""
+    if isinstance(indices, slice):
+        return list(data[indices])
+    return [data[i] for i in indices.tolist()]
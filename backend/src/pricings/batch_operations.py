@@ -1,7 +1,9 @@
 import asyncio
 from typing import List, Dict
-from .price_client import get_ohlc_data
+from .analytics import first_last_indices
+from .cache import get_cached_ohlc_data, get_cached_ohlc_series
 from .models import OHLCData, TradingPair
+from .series import OHLCSeries, as_series
 
 
 async def get_all_metals_ohlc(
@@ -11,9 +13,9 @@ async def get_all_metals_ohlc(
     sort: str = "desc",
 ) -> Dict[str, List[OHLCData]]:
     results = await asyncio.gather(
-        get_ohlc_data(TradingPair.XAU_USD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.XAG_USD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.XPT_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XAU_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XAG_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XPT_USD, interval, limit, offset, sort),
         return_exceptions=True,
     )
 
@@ -31,8 +33,8 @@ async def get_all_currencies_ohlc(
     sort: str = "desc",
 ) -> Dict[str, List[OHLCData]]:
     results = await asyncio.gather(
-        get_ohlc_data(TradingPair.USD_SGD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.USD_MYR, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.USD_SGD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.USD_MYR, interval, limit, offset, sort),
         return_exceptions=True,
     )
 
@@ -49,11 +51,11 @@ async def get_all_trading_pairs_ohlc(
     sort: str = "desc",
 ) -> Dict[str, List[OHLCData]]:
     results = await asyncio.gather(
-        get_ohlc_data(TradingPair.XAU_USD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.XAG_USD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.XPT_USD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.USD_SGD, interval, limit, offset, sort),
-        get_ohlc_data(TradingPair.USD_MYR, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XAU_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XAG_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.XPT_USD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.USD_SGD, interval, limit, offset, sort),
+        get_cached_ohlc_data(TradingPair.USD_MYR, interval, limit, offset, sort),
         return_exceptions=True,
     )
 
@@ -74,7 +76,7 @@ async def get_multiple_pairs_ohlc(
     sort: str = "desc",
 ) -> Dict[str, List[OHLCData]]:
     tasks = [
-        get_ohlc_data(pair, interval, limit, offset, sort)
+        get_cached_ohlc_data(pair, interval, limit, offset, sort)
         for pair in pairs
     ]
 
@@ -88,43 +90,65 @@ async def get_multiple_pairs_ohlc(
 
 def calculate_portfolio_value(
     holdings: Dict[TradingPair, float],
-    latest_prices: Dict[TradingPair, List[OHLCData]],
+    latest_prices: Dict[TradingPair, OHLCSeries | List[OHLCData]],
 ) -> float:
     total_value = 0.0
 
     for pair, quantity in holdings.items():
-        if pair in latest_prices and latest_prices[pair]:
-            latest_price = latest_prices[pair][0].close
+        prices = latest_prices.get(pair)
+        if prices is not None and len(prices):
+            if isinstance(prices, OHLCSeries):
+                latest_price = float(prices.close[0])
+            else:
+                latest_price = prices[0].close
             total_value += quantity * latest_price
 
     return total_value
 
 
-def get_market_summary(ohlc_data: List[OHLCData]) -> Dict[str, float]:
-    if not ohlc_data:
+def get_market_summary(ohlc_data: OHLCSeries | List[OHLCData]) -> Dict[str, float]:
+    series = as_series(ohlc_data)
+    if not len(series):
         return {}
 
-    sorted_data = sorted(ohlc_data, key=lambda x: x.timestamp)
+    first, last = first_last_indices(series)
+    open_price = float(series.open[first])
+    current_price = float(series.close[last])
 
     return {
-        "current_price": sorted_data[-1].close,
-        "open_price": sorted_data[0].open,
-        "high": max(item.high for item in ohlc_data),
-        "low": min(item.low for item in ohlc_data),
-        "change": sorted_data[-1].close - sorted_data[0].open,
-        "change_percent": ((sorted_data[-1].close - sorted_data[0].open) / sorted_data[0].open) * 100,
-        "avg_price": sum(item.close for item in ohlc_data) / len(ohlc_data),
+        "current_price": current_price,
+        "open_price": open_price,
+        "high": float(series.high.max()),
+        "low": float(series.low.min()),
+        "change": current_price - open_price,
+        "change_percent": ((current_price - open_price) / open_price) * 100,
+        "avg_price": float(series.close.sum()) / len(series),
     }
 
 
+_SUMMARY_PAIRS = {
+    "xau_usd": TradingPair.XAU_USD,
+    "xag_usd": TradingPair.XAG_USD,
+    "xpt_usd": TradingPair.XPT_USD,
+    "usd_sgd": TradingPair.USD_SGD,
+    "usd_myr": TradingPair.USD_MYR,
+}
+
+
 async def get_all_market_summaries(
     interval: int = 3600,
     limit: int = 50,
 ) -> Dict[str, Dict[str, float]]:
-    all_data = await get_all_trading_pairs_ohlc(interval, limit)
+    results = await asyncio.gather(
+        *[
+            get_cached_ohlc_series(pair, interval, limit)
+            for pair in _SUMMARY_PAIRS.values()
+        ],
+        return_exceptions=True,
+    )
 
     return {
-        pair: get_market_summary(data)
-        for pair, data in all_data.items()
-        if data
+        name: get_market_summary(series)
+        for name, series in zip(_SUMMARY_PAIRS, results)
+        if not isinstance(series, Exception) and len(series)
     }
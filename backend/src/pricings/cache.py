@@ -1,28 +1,248 @@
 import asyncio
+import sys
+from collections import Counter, OrderedDict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from .price_client import get_ohlc_data
+import numpy as np
+from src.app_config import app_config
+from .price_client import get_ohlc_series
 from .models import OHLCData, TradingPair
+from .resample import resample_series
+from .series import OHLCSeries, as_series
+
+
+# Per-segment bookkeeping on top of the column arrays
+_SEGMENT_OVERHEAD = 6 * sys.getsizeof(np.empty(0)) + 128
+
+
+class _CandleSegment:
+    """
+    Contiguous run of candles covering offsets [start, end) of one series.
+
+    Offsets count from the end of the series selected by `sort`: for "desc"
+    offset 0 is the newest candle, for "asc" it is the oldest. Candles are
+    stored in offset order; a window is only stitched on when it overlaps
+    the segment by at least one candle and the overlap agrees by timestamp,
+    so a gap or a shift caused by a newly closed candle is never merged
+    silently. (Steps between candles are not checked against the interval:
+    market closures leave legitimate gaps.)
+    """
+
+    __slots__ = ("sort", "start", "series", "fetched_at", "exhausted")
+
+    def __init__(
+        self,
+        sort: str,
+        start: int,
+        series: OHLCSeries,
+        fetched_at: datetime,
+        exhausted: bool,
+    ):
+        self.sort = sort
+        self.start = start
+        self.series = series
+        self.fetched_at = fetched_at
+        # Upstream returned a short page, so nothing exists past `end`
+        self.exhausted = exhausted
+
+    @property
+    def nbytes(self) -> int:
+        return _SEGMENT_OVERHEAD + self.series.nbytes
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.series)
+
+    def covers(self, offset: int, limit: int) -> bool:
+        return self.start <= offset and (offset + limit <= self.end or self.exhausted)
+
+    def touches(self, offset: int, limit: int) -> bool:
+        """True if the window overlaps or abuts this segment."""
+        return offset <= self.end and offset + limit >= self.start
+
+    def slice(self, offset: int, limit: int) -> OHLCSeries:
+        begin = offset - self.start
+        return self.series[begin:begin + limit]
+
+    def merge(
+        self,
+        offset: int,
+        series: OHLCSeries,
+        exhausted: bool,
+        fetched_at: datetime,
+    ) -> bool:
+        """
+        Stitch an overlapping window into this segment.
+
+        Returns False when the window disagrees with what is cached (a new
+        candle arrived and shifted the offsets) or merely abuts it, so there
+        is nothing to check it against; the segment is then left untouched
+        and the caller should replace it. An empty window (nothing past the
+        end) needs no check.
+        """
+        new_end = offset + len(series)
+        overlap_start = max(self.start, offset)
+        overlap_end = min(self.end, new_end)
+        if overlap_end > overlap_start:
+            cached = self.series.timestamps[overlap_start - self.start:overlap_end - self.start]
+            incoming = series.timestamps[overlap_start - offset:overlap_end - offset]
+            if not np.array_equal(cached, incoming):
+                return False
+        elif len(series) and len(self.series):
+            return False
+
+        parts = []
+        if offset > self.start:
+            parts.append(self.series[:offset - self.start])
+        parts.append(series)
+        if self.end > new_end:
+            parts.append(self.series[new_end - self.start:])
+        merged = OHLCSeries.concat(parts) if len(parts) > 1 else series
+
+        steps = np.diff(merged.timestamps)
+        zero = np.timedelta64(0, "us")
+        if np.any(steps >= zero) if self.sort == "desc" else np.any(steps <= zero):
+            return False
+
+        if new_end >= self.end:
+            self.exhausted = exhausted
+        self.start = min(self.start, offset)
+        self.series = merged
+        self.fetched_at = min(self.fetched_at, fetched_at)
+        return True
+
+
+CACHE_HIT = "HIT"
+CACHE_STALE = "STALE"
+CACHE_PARTIAL = "PARTIAL"
+CACHE_MISS = "MISS"
+
+# Candle interval (seconds) -> TTL (seconds); short candles move faster
+DEFAULT_TTL_POLICY: Dict[int, int] = {
+    60: 5,
+    300: 15,
+    900: 30,
+    3600: 60,
+    14400: 120,
+    86400: 300,
+}
 
 
 class OHLCCache:
-    def __init__(self, ttl_seconds: int = 60):
-        self.cache: Dict[Tuple[str, int], Tuple[datetime, List[OHLCData]]] = {}
+    """
+    Range-aware OHLC cache keyed per (pair, interval).
+
+    Each series keeps one contiguous segment per sort direction, so a cached
+    `limit=200` window also answers `limit=24` or `offset=10, limit=5`, and a
+    request that overhangs the cached range only fetches the missing edges.
+
+    Segments live in an LRU bounded by `max_entries` and `max_bytes`; a
+    background sweeper drops expired segments between reads.
+
+    Past its TTL a segment is stale. For another `stale_seconds` (capped at
+    one candle interval) `get_or_fetch` still answers from it immediately and
+    refreshes it in the background (stale-while-revalidate). The optional
+    refresh-ahead loop re-fetches the most requested series shortly before
+    they go stale.
+
+    `ttl_policy` maps candle interval (seconds) to TTL (seconds), so 1m
+    candles can expire faster than 1d; other intervals use `ttl_seconds`.
+
+    `derived_intervals` maps a target interval to a finer source interval
+    it is a multiple of (e.g. 4h -> 1h). Newest-first reads of a derived
+    interval are resampled from the cached source candles, aligned to
+    `resample_tz` and `session_start`, instead of going upstream.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 60,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        stale_seconds: int = 0,
+        ttl_policy: Optional[Dict[int, int]] = None,
+        derived_intervals: Optional[Dict[int, int]] = None,
+        resample_tz: str = "UTC",
+        session_start: timedelta = timedelta(0),
+    ):
+        self.cache: "OrderedDict[Tuple[str, int, str], _CandleSegment]" = OrderedDict()
         self.ttl = timedelta(seconds=ttl_seconds)
+        self.ttl_policy = {
+            interval: timedelta(seconds=ttl) for interval, ttl in (ttl_policy or {}).items()
+        }
+        self.stale_window = timedelta(seconds=stale_seconds)
+        self.derived_intervals = dict(derived_intervals or {})
+        self.resample_tz = resample_tz
+        self.session_start = session_start
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         self.lock = asyncio.Lock()
 
-    def _is_expired(self, timestamp: datetime) -> bool:
-        return datetime.now() - timestamp > self.ttl
+        self.bytes = 0
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._refreshing: Dict[Tuple[str, int, str], asyncio.Task] = {}
+        self._access_counts: Counter = Counter()
+
+    def ttl_for(self, interval: int) -> timedelta:
+        return self.ttl_policy.get(interval, self.ttl)
+
+    def _is_expired(self, key: Tuple[str, int, str], timestamp: datetime) -> bool:
+        """Too old to serve at all."""
+        interval = key[1]
+        stale_window = min(self.stale_window, timedelta(seconds=interval))
+        return datetime.now() - timestamp > self.ttl_for(interval) + stale_window
+
+    def _is_stale(self, key: Tuple[str, int, str], timestamp: datetime) -> bool:
+        return datetime.now() - timestamp > self.ttl_for(key[1])
 
     def _get_cache_key(
         self,
         trading_pair: TradingPair,
         interval: int,
-        limit: int,
-        offset: int,
         sort: str,
-    ) -> Tuple[str, int, int, int, str]:
-        return (trading_pair.value, interval, limit, offset, sort)
+    ) -> Tuple[str, int, str]:
+        return (TradingPair(trading_pair).value, interval, sort)
+
+    def _get_segment(
+        self,
+        key: Tuple[str, int, str],
+        allow_stale: bool = False,
+    ) -> Optional[_CandleSegment]:
+        segment = self.cache.get(key)
+        if segment is None:
+            return None
+
+        if self._is_expired(key, segment.fetched_at):
+            self._remove(key)
+            self.expirations += 1
+            return None
+
+        if not allow_stale and self._is_stale(key, segment.fetched_at):
+            return None
+
+        self.cache.move_to_end(key)
+        return segment
+
+    def _remove(self, key: Tuple[str, int, str]):
+        segment = self.cache.pop(key)
+        self.bytes -= segment.nbytes
+
+    def _evict(self):
+        while self.cache and (
+            len(self.cache) > self.max_entries or self.bytes > self.max_bytes
+        ):
+            key = next(iter(self.cache))
+            self._remove(key)
+            self.evictions += 1
 
     async def get(
         self,
@@ -32,31 +252,70 @@ class OHLCCache:
         offset: int = 0,
         sort: str = "desc",
     ) -> Optional[List[OHLCData]]:
-        key = self._get_cache_key(trading_pair, interval, limit, offset, sort)
+        key = self._get_cache_key(trading_pair, interval, sort)
 
         async with self.lock:
-            if key in self.cache:
-                timestamp, data = self.cache[key]
-                if not self._is_expired(timestamp):
-                    return data
-                else:
-                    del self.cache[key]
+            segment = self._get_segment(key)
+            if segment and segment.covers(offset, limit):
+                self.hits += 1
+                return segment.slice(offset, limit).to_ohlc()
 
+        self.misses += 1
         return None
 
     async def set(
         self,
         trading_pair: TradingPair,
-        data: List[OHLCData],
+        data: OHLCSeries | List[OHLCData],
         interval: int = 3600,
         limit: int = 50,
         offset: int = 0,
         sort: str = "desc",
     ):
-        key = self._get_cache_key(trading_pair, interval, limit, offset, sort)
+        key = self._get_cache_key(trading_pair, interval, sort)
+        now = datetime.now()
+        series = as_series(data)
+        exhausted = len(series) < limit
+
+        async with self.lock:
+            segment = self._get_segment(key)
+            if segment and segment.touches(offset, len(series)):
+                old_bytes = segment.nbytes
+                if segment.merge(offset, series, exhausted, now):
+                    self.bytes += segment.nbytes - old_bytes
+                    self._evict()
+                    return
+
+            self._store(key, _CandleSegment(sort, offset, series, now, exhausted))
 
+    def _store(self, key: Tuple[str, int, str], segment: _CandleSegment):
+        if key in self.cache:
+            self._remove(key)
+        self.cache[key] = segment
+        self.bytes += segment.nbytes
+        self._evict()
+
+    async def _missing_edges(
+        self,
+        key: Tuple[str, int, str],
+        limit: int,
+        offset: int,
+    ) -> Optional[List[Tuple[int, int]]]:
+        """(offset, limit) pairs still needed, or None if nothing usable is cached."""
         async with self.lock:
-            self.cache[key] = (datetime.now(), data)
+            segment = self._get_segment(key)
+            if not segment or not segment.touches(offset, limit):
+                return None
+
+            # Each edge reaches one candle into the segment, so `merge` can
+            # tell whether the offsets shifted since the segment was fetched
+            overlap = 1 if len(segment.series) else 0
+            edges = []
+            if offset < segment.start:
+                edges.append((offset, segment.start - offset + overlap))
+            if offset + limit > segment.end and not segment.exhausted:
+                edges.append((segment.end - overlap, offset + limit - segment.end + overlap))
+            return edges
 
     async def get_or_fetch(
         self,
@@ -66,44 +325,262 @@ class OHLCCache:
         offset: int = 0,
         sort: str = "desc",
     ) -> List[OHLCData]:
-        cached_data = await self.get(trading_pair, interval, limit, offset, sort)
+        data, _ = await self.get_or_fetch_with_status(
+            trading_pair, interval, limit, offset, sort
+        )
+        return data
+
+    async def get_or_fetch_with_status(
+        self,
+        trading_pair: TradingPair,
+        interval: int = 3600,
+        limit: int = 50,
+        offset: int = 0,
+        sort: str = "desc",
+    ) -> Tuple[List[OHLCData], str]:
+        """Like `get_or_fetch`, plus how it was served: HIT, STALE, PARTIAL or MISS."""
+        series, status = await self.get_series_with_status(
+            trading_pair, interval, limit, offset, sort
+        )
+        return series.to_ohlc(), status
+
+    async def get_series(
+        self,
+        trading_pair: TradingPair,
+        interval: int = 3600,
+        limit: int = 50,
+        offset: int = 0,
+        sort: str = "desc",
+    ) -> OHLCSeries:
+        """Columnar variant of `get_or_fetch` for internal analytics."""
+        series, _ = await self.get_series_with_status(
+            trading_pair, interval, limit, offset, sort
+        )
+        return series
+
+    async def get_series_with_status(
+        self,
+        trading_pair: TradingPair,
+        interval: int = 3600,
+        limit: int = 50,
+        offset: int = 0,
+        sort: str = "desc",
+    ) -> Tuple[OHLCSeries, str]:
+        """Columnar core of `get_or_fetch_with_status`."""
+        source_interval = self.derived_intervals.get(interval)
+        if source_interval and sort == "desc":
+            return await self._get_derived_series(
+                trading_pair, interval, source_interval, limit, offset
+            )
+
+        key = self._get_cache_key(trading_pair, interval, sort)
+        self._access_counts[key] += 1
+
+        async with self.lock:
+            segment = self._get_segment(key, allow_stale=True)
+            if segment and segment.covers(offset, limit):
+                if self._is_stale(key, segment.fetched_at):
+                    self.stale_hits += 1
+                    self._schedule_refresh(key)
+                    return segment.slice(offset, limit), CACHE_STALE
+                self.hits += 1
+                return segment.slice(offset, limit), CACHE_HIT
 
-        if cached_data is not None:
-            return cached_data
+        edges = await self._missing_edges(key, limit, offset)
+        if edges:
+            edge_data = await asyncio.gather(
+                *[
+                    get_ohlc_series(trading_pair, interval, edge_limit, edge_offset, sort)
+                    for edge_offset, edge_limit in edges
+                ]
+            )
+            for (edge_offset, edge_limit), data in zip(edges, edge_data):
+                await self.set(trading_pair, data, interval, edge_limit, edge_offset, sort)
 
-        fresh_data = await get_ohlc_data(trading_pair, interval, limit, offset, sort)
+            async with self.lock:
+                segment = self._get_segment(key)
+                if segment and segment.covers(offset, limit):
+                    self.partial_hits += 1
+                    return segment.slice(offset, limit), CACHE_PARTIAL
+
+        self.misses += 1
+        fresh_data = await get_ohlc_series(trading_pair, interval, limit, offset, sort)
         await self.set(trading_pair, fresh_data, interval, limit, offset, sort)
 
-        return fresh_data
+        return fresh_data, CACHE_MISS
+
+    async def _get_derived_series(
+        self,
+        trading_pair: TradingPair,
+        interval: int,
+        source_interval: int,
+        limit: int,
+        offset: int,
+    ) -> Tuple[OHLCSeries, str]:
+        """Newest-first buckets of `interval` built from cached `source_interval` candles."""
+        ratio = -(-interval // source_interval)
+        # Each bucket holds at most `ratio` candles, so this always yields enough
+        # buckets; one extra covers the oldest bucket being cut by the window
+        source_limit = (offset + limit + 1) * ratio
+        source, status = await self.get_series_with_status(
+            trading_pair, source_interval, source_limit, 0, "desc"
+        )
+
+        buckets = resample_series(
+            source, interval, tz=self.resample_tz, session_start=self.session_start
+        )
+        if len(source) >= source_limit:
+            buckets = buckets[1:]
+        return buckets[::-1][offset:offset + limit], status
+
+    def _schedule_refresh(self, key: Tuple[str, int, str]):
+        """Re-fetch a segment's whole window in the background, once per key."""
+        if key in self._refreshing or key not in self.cache:
+            return
+
+        segment = self.cache[key]
+        pair, interval, sort = key
+        start, length = segment.start, max(len(segment.series), 1)
+
+        async def refresh():
+            try:
+                data = await get_ohlc_series(pair, interval, length, start, sort)
+                # Replace rather than merge: offsets may have shifted since the original fetch
+                async with self.lock:
+                    self._store(
+                        key,
+                        _CandleSegment(sort, start, data, datetime.now(), len(data) < length),
+                    )
+                self.refreshes += 1
+            except Exception as e:
+                self.refresh_failures += 1
+                print(f"Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def start_refresh_ahead(
+        self,
+        top_n: int = 10,
+        interval_seconds: float = 5.0,
+        lead_seconds: float = 10.0,
+    ):
+        """
+        Keep the `top_n` most requested series warm.
+
+        Every `interval_seconds`, series among the hottest that will go stale
+        within `lead_seconds` are refreshed. Access counts are halved each
+        round so the ranking follows current traffic.
+        """
+        if self._refresher and not self._refresher.done():
+            return
+
+        lead = timedelta(seconds=lead_seconds)
+
+        async def refresh_loop():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                now = datetime.now()
+                for key, _ in self._access_counts.most_common(top_n):
+                    segment = self.cache.get(key)
+                    if segment and now - segment.fetched_at > self.ttl_for(key[1]) - lead:
+                        self._schedule_refresh(key)
+                for key in list(self._access_counts):
+                    self._access_counts[key] //= 2
+                    if not self._access_counts[key]:
+                        del self._access_counts[key]
+
+        self._refresher = asyncio.create_task(refresh_loop())
+
+    async def stop_refresh_ahead(self):
+        tasks = list(self._refreshing.values())
+        if self._refresher:
+            tasks.append(self._refresher)
+            self._refresher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def clear(self):
         async with self.lock:
             self.cache.clear()
+            self.bytes = 0
 
     async def clear_expired(self):
         async with self.lock:
             expired_keys = [
-                key for key, (timestamp, _) in self.cache.items()
-                if self._is_expired(timestamp)
+                key for key, segment in self.cache.items()
+                if self._is_expired(key, segment.fetched_at)
             ]
             for key in expired_keys:
-                del self.cache[key]
+                self._remove(key)
+            self.expirations += len(expired_keys)
+
+    def start_sweeper(self, interval_seconds: float = 30.0):
+        if self._sweeper and not self._sweeper.done():
+            return
+
+        async def sweep():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.clear_expired()
+                except Exception as e:
+                    print(f"OHLC cache sweep failed: {e}")
+
+        self._sweeper = asyncio.create_task(sweep())
 
-    def get_cache_stats(self) -> Dict[str, int]:
+    async def stop_sweeper(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def get_cache_stats(self) -> Dict[str, int | float]:
+        lookups = self.hits + self.stale_hits + self.partial_hits + self.misses
         return {
             "total_entries": len(self.cache),
             "expired_entries": sum(
-                1 for timestamp, _ in self.cache.values()
-                if self._is_expired(timestamp)
+                1 for key, segment in self.cache.items()
+                if self._is_expired(key, segment.fetched_at)
             ),
+            "cached_candles": sum(len(segment.series) for segment in self.cache.values()),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "hit_ratio": round(
+                (self.hits + self.stale_hits + self.partial_hits) / lookups, 4
+            ) if lookups else 0.0,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._refreshing),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
         }
 
 
-default_cache = OHLCCache(ttl_seconds=60)
+default_cache = OHLCCache(
+    ttl_seconds=60,
+    ttl_policy=DEFAULT_TTL_POLICY,
+    max_entries=app_config.OHLC_CACHE_MAX_ENTRIES,
+    max_bytes=app_config.OHLC_CACHE_MAX_BYTES,
+    stale_seconds=app_config.OHLC_CACHE_STALE_SECONDS,
+    derived_intervals=app_config.OHLC_DERIVED_INTERVALS,
+    resample_tz=app_config.OHLC_RESAMPLE_TZ,
+    session_start=timedelta(minutes=app_config.OHLC_SESSION_START_MINUTES),
+)
 
 
 async def get_cached_ohlc_data(
-    trading_pair: TradingPair,
+    trading_pair: TradingPair | str,
     interval: int = 3600,
     limit: int = 50,
     offset: int = 0,
@@ -112,3 +589,29 @@ async def get_cached_ohlc_data(
 ) -> List[OHLCData]:
     cache_instance = cache or default_cache
     return await cache_instance.get_or_fetch(trading_pair, interval, limit, offset, sort)
+
+
+async def get_cached_ohlc_data_with_status(
+    trading_pair: TradingPair | str,
+    interval: int = 3600,
+    limit: int = 50,
+    offset: int = 0,
+    sort: str = "desc",
+    cache: Optional[OHLCCache] = None,
+) -> Tuple[List[OHLCData], str]:
+    cache_instance = cache or default_cache
+    return await cache_instance.get_or_fetch_with_status(
+        trading_pair, interval, limit, offset, sort
+    )
+
+
+async def get_cached_ohlc_series(
+    trading_pair: TradingPair | str,
+    interval: int = 3600,
+    limit: int = 50,
+    offset: int = 0,
+    sort: str = "desc",
+    cache: Optional[OHLCCache] = None,
+) -> OHLCSeries:
+    cache_instance = cache or default_cache
+    return await cache_instance.get_series(trading_pair, interval, limit, offset, sort)
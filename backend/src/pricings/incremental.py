@@ -0,0 +1,330 @@
+import math
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from .indicators import (
+    ADX_PERIOD,
+    CCI_PERIOD,
+    EMA_PERIOD,
+    INDICATOR_COLUMNS,
+    ROUND_DECIMALS,
+    STOCH_D_PERIOD,
+    STOCH_K_PERIOD,
+    ewm_step,
+    span_alpha,
+    wilder_alpha,
+)
+from .series import OHLCSeries
+
+_NAN = float("nan")
+
+
+def _fold(values) -> float:
+    # Left-to-right, like indicators.window_sum
+    it = iter(values)
+    total = next(it)
+    for value in it:
+        total += value
+    return total
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    # numpy semantics (inf / nan) instead of ZeroDivisionError
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return _NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+_ROUND_SCALE = 10.0 ** ROUND_DECIMALS
+
+
+def _round(value: float) -> float:
+    # np.round: scale, round half to even, unscale (keeps the sign of zero)
+    if not math.isfinite(value):
+        return value
+    scaled = value * _ROUND_SCALE
+    return math.copysign(float(round(scaled)), scaled) / _ROUND_SCALE
+
+
+class RollingExtreme:
+    """Rolling max (or min) over the last `window` values via a monotonic deque."""
+
+    __slots__ = ("window", "is_max", "entries", "index")
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.entries: Deque[Tuple[int, float]] = deque()
+        self.index = 0
+
+    def push(self, value: float) -> float:
+        entries = self.entries
+        if self.is_max:
+            while entries and entries[-1][1] <= value:
+                entries.pop()
+        else:
+            while entries and entries[-1][1] >= value:
+                entries.pop()
+        entries.append((self.index, value))
+        if entries[0][0] <= self.index - self.window:
+            entries.popleft()
+        self.index += 1
+        return entries[0][1]
+
+    def copy(self) -> "RollingExtreme":
+        clone = RollingExtreme(self.window, self.is_max)
+        clone.entries = deque(self.entries)
+        clone.index = self.index
+        return clone
+
+
+class IncrementalIndicators:
+    """
+    Streaming EMA-20, Stochastic %D, CCI and ADX, one closed candle at a time.
+
+    Every update replays the arithmetic of `indicators.compute_indicators`
+    in the same order (pandas-style EWM steps, left-to-right window sums,
+    numpy division semantics), so after feeding candles 0..t the values
+    equal row t of the batch result exactly. EMA and the Wilder smoothing
+    are O(1); Stochastic uses monotonic deques and CCI keeps its 20-value
+    window because the mean absolute deviation needs a pass over it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.ema_alpha = span_alpha(EMA_PERIOD)
+        self.wilder_alpha = wilder_alpha(ADX_PERIOD)
+        self.ema_state = (_NAN, 1.0)
+
+        self.highest_high = RollingExtreme(STOCH_K_PERIOD, is_max=True)
+        self.lowest_low = RollingExtreme(STOCH_K_PERIOD, is_max=False)
+        self.k_values: Deque[float] = deque(maxlen=STOCH_D_PERIOD)
+
+        self.typical_prices: Deque[float] = deque(maxlen=CCI_PERIOD)
+
+        self.prev_high = _NAN
+        self.prev_low = _NAN
+        self.prev_close = _NAN
+        self.tr_state = (_NAN, 1.0)
+        self.plus_dm_state = (_NAN, 1.0)
+        self.minus_dm_state = (_NAN, 1.0)
+        self.dx_state = (_NAN, 1.0)
+
+    @classmethod
+    def from_series(cls, series: OHLCSeries) -> "IncrementalIndicators":
+        state = cls()
+        for high, low, close in zip(
+            series.high.tolist(), series.low.tolist(), series.close.tolist()
+        ):
+            state.update(high, low, close)
+        return state
+
+    def copy(self) -> "IncrementalIndicators":
+        clone = IncrementalIndicators.__new__(IncrementalIndicators)
+        clone.__dict__.update(self.__dict__)
+        clone.highest_high = self.highest_high.copy()
+        clone.lowest_low = self.lowest_low.copy()
+        clone.k_values = deque(self.k_values, maxlen=STOCH_D_PERIOD)
+        clone.typical_prices = deque(self.typical_prices, maxlen=CCI_PERIOD)
+        return clone
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """Commit a closed candle and return its indicator values (NaN while warming up)."""
+        self.count += 1
+        alpha = self.ema_alpha
+        self.ema_state = ewm_step(*self.ema_state, close, alpha)
+
+        values = {
+            "EMA_20": self.ema_state[0],
+            "Stochastic_D": self._update_stochastic(high, low, close),
+            "CCI": self._update_cci(high, low, close),
+            "ADX": self._update_adx(high, low, close),
+        }
+        return {name: _round(value) for name, value in values.items()}
+
+    def preview(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """Values as if the (still forming) candle closed now, without committing it."""
+        return self.copy().update(high, low, close)
+
+    def _update_stochastic(self, high: float, low: float, close: float) -> float:
+        highest_high = self.highest_high.push(high)
+        lowest_low = self.lowest_low.push(low)
+        if self.count < STOCH_K_PERIOD:
+            return _NAN
+
+        self.k_values.append(_divide(100 * (close - lowest_low), highest_high - lowest_low))
+        if len(self.k_values) < STOCH_D_PERIOD:
+            return _NAN
+        return _fold(self.k_values) / STOCH_D_PERIOD
+
+    def _update_cci(self, high: float, low: float, close: float) -> float:
+        typical_price = (high + low + close) / 3
+        self.typical_prices.append(typical_price)
+        if len(self.typical_prices) < CCI_PERIOD:
+            return _NAN
+
+        sma = _fold(self.typical_prices) / CCI_PERIOD
+        mean_deviation = _fold(abs(tp - sma) for tp in self.typical_prices) / CCI_PERIOD
+        return _divide(typical_price - sma, 0.015 * mean_deviation)
+
+    def _update_adx(self, high: float, low: float, close: float) -> float:
+        if self.count == 1:
+            true_range = plus_dm = minus_dm = _NAN
+        else:
+            true_range = max(high - low, max(abs(high - self.prev_close), abs(low - self.prev_close)))
+            plus_dm = high - self.prev_high
+            minus_dm = (low - self.prev_low) * -1
+            if plus_dm < 0:
+                plus_dm = 0.0
+            if minus_dm < 0:
+                minus_dm = 0.0
+            if plus_dm < minus_dm:
+                plus_dm = 0.0
+            if minus_dm < plus_dm:
+                minus_dm = 0.0
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        alpha = self.wilder_alpha
+        self.tr_state = ewm_step(*self.tr_state, true_range, alpha)
+        self.plus_dm_state = ewm_step(*self.plus_dm_state, plus_dm, alpha)
+        self.minus_dm_state = ewm_step(*self.minus_dm_state, minus_dm, alpha)
+
+        tr_smooth = self.tr_state[0]
+        plus_di = _divide(100 * self.plus_dm_state[0], tr_smooth)
+        minus_di = _divide(100 * self.minus_dm_state[0], tr_smooth)
+        dx = _divide(100 * abs(plus_di - minus_di), plus_di + minus_di)
+
+        self.dx_state = ewm_step(*self.dx_state, dx, alpha)
+        return self.dx_state[0]
+
+
+class LiveIndicatorTracker:
+    """
+    Latest indicator values for one pair, kept current from the tick feed.
+
+    Seeded with recent closed candles, it folds each tick's mid price into
+    the forming candle of `interval` seconds (UTC-aligned) and commits that
+    candle to the incremental state once a tick from the next bucket arrives.
+    """
+
+    def __init__(self, trading_pair: str, interval: int = 3600):
+        self.trading_pair = trading_pair
+        self.interval = interval
+        self.state: Optional[IncrementalIndicators] = None
+        self.bucket: Optional[int] = None
+        self.candle: Optional[Dict[str, float]] = None
+        self.closed: Dict[str, float] = {}
+        self.latest: Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state is not None
+
+    def seed(self, series: OHLCSeries):
+        """Load history; the newest candle is treated as the one still forming."""
+        series = series.sort_by_time()
+        if not len(series):
+            return
+
+        self.state = IncrementalIndicators.from_series(series[:-1])
+        epoch_seconds = int(series.timestamps[-1].view(np.int64)) // 1_000_000
+        self.bucket = epoch_seconds // self.interval
+        self.candle = {
+            "open": float(series.open[-1]),
+            "high": float(series.high[-1]),
+            "low": float(series.low[-1]),
+            "close": float(series.close[-1]),
+        }
+        self._refresh()
+
+    def on_price(self, price: float, timestamp: datetime):
+        if self.state is None:
+            return
+
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)  # feed times are UTC
+        bucket = int(timestamp.timestamp()) // self.interval
+        if self.bucket is not None and bucket < self.bucket:
+            return  # late tick for a candle that is already closed
+
+        if self.candle is None or bucket != self.bucket:
+            if self.candle is not None:
+                self.closed = self.state.update(
+                    self.candle["high"], self.candle["low"], self.candle["close"]
+                )
+            self.bucket = bucket
+            self.candle = {"open": price, "high": price, "low": price, "close": price}
+        else:
+            self.candle["high"] = max(self.candle["high"], price)
+            self.candle["low"] = min(self.candle["low"], price)
+            self.candle["close"] = price
+        self._refresh()
+
+    def on_prices(self, prices: np.ndarray, timestamps: np.ndarray):
+        """
+        Fold a batch of ticks at once; same state as on_price for each in turn.
+
+        `timestamps` are datetime64 (UTC wall time). Each run of ticks in the
+        same bucket is reduced with numpy, and indicators are previewed once.
+        """
+        if self.state is None or not len(prices):
+            return
+
+        buckets = timestamps.astype("datetime64[s]").view(np.int64) // self.interval
+        # Late ticks: behind the newest bucket seen so far, this batch included
+        newest = np.maximum.accumulate(buckets)
+        if self.bucket is not None:
+            newest = np.maximum(newest, self.bucket)
+        on_time = buckets == newest
+        prices, buckets = prices[on_time], buckets[on_time]
+        if not len(prices):
+            return
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        ends = np.append(starts[1:], len(prices))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            run = prices[start:end]
+            bucket = int(buckets[start])
+            high, low, close = float(run.max()), float(run.min()), float(run[-1])
+            if self.candle is None or bucket != self.bucket:
+                if self.candle is not None:
+                    self.closed = self.state.update(
+                        self.candle["high"], self.candle["low"], self.candle["close"]
+                    )
+                self.bucket = bucket
+                self.candle = {"open": float(run[0]), "high": high, "low": low, "close": close}
+            else:
+                self.candle["high"] = max(self.candle["high"], high)
+                self.candle["low"] = min(self.candle["low"], low)
+                self.candle["close"] = close
+        self._refresh()
+
+    def _refresh(self):
+        self.latest = self.state.preview(
+            self.candle["high"], self.candle["low"], self.candle["close"]
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        def clean(values: Dict[str, float]) -> Dict[str, Optional[float]]:
+            return {
+                name: values[name] if name in values and math.isfinite(values[name]) else None
+                for name in INDICATOR_COLUMNS
+            }
+
+        return {
+            "trading_pair": self.trading_pair,
+            "interval": self.interval,
+            "candle_start": (
+                datetime.fromtimestamp(self.bucket * self.interval, tz=timezone.utc).isoformat()
+                if self.bucket is not None
+                else None
+            ),
+            "candle": dict(self.candle) if self.candle else None,
+            "indicators": clean(self.latest),
+            "last_closed": clean(self.closed),
+        }
@@ -0,0 +1,364 @@
+import asyncio
+import logging
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.app_config import app_config
+from .series import OHLCSeries, _parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+EMA_PERIOD = 20
+STOCH_K_PERIOD = 14
+STOCH_D_PERIOD = 3
+CCI_PERIOD = 20
+ADX_PERIOD = 14
+# Need at least 20 periods for reliable calculations
+MIN_CANDLES = 20
+
+INDICATOR_COLUMNS = ("EMA_20", "Stochastic_D", "CCI", "ADX")
+ROUND_DECIMALS = 2
+
+
+def span_alpha(span: int) -> float:
+    # Same derivation as pandas' ewm(span=...), so the float is bit-identical
+    com = (span - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+def wilder_alpha(period: int) -> float:
+    # pandas' ewm(alpha=1/period) round-trips alpha through the centre of mass
+    alpha = 1 / period
+    com = (1 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def ewm_step(
+    weighted: float,
+    old_weight: float,
+    value: float,
+    alpha: float,
+) -> tuple[float, float]:
+    """
+    One step of pandas' ewm(adjust=False).mean() recursion.
+
+    Returns the new (weighted, old_weight). NaN inputs decay the weight
+    and carry the previous mean forward, as pandas does with ignore_na=False.
+    """
+    if weighted == weighted:
+        old_weight *= 1.0 - alpha
+        if value == value:
+            if weighted != value:
+                weighted = (old_weight * weighted + alpha * value) / (old_weight + alpha)
+            old_weight = 1.0
+    elif value == value:
+        weighted = value
+    return weighted, old_weight
+
+
+def ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean matching `Series.ewm(alpha, adjust=False).mean()`.
+
+    The recursion is inherently sequential, so it runs over native floats.
+    """
+    out = np.empty(len(values))
+    if not len(values):
+        return out
+
+    items = values.tolist()
+    weighted, old_weight = items[0], 1.0
+    out[0] = weighted
+    for i in range(1, len(items)):
+        weighted, old_weight = ewm_step(weighted, old_weight, items[i], alpha)
+        out[i] = weighted
+    return out
+
+
+def window_sum(windows: np.ndarray) -> np.ndarray:
+    """Sum each row left to right, so a streaming fold gives identical floats."""
+    total = windows[:, 0].copy()
+    for j in range(1, windows.shape[1]):
+        total += windows[:, j]
+    return total
+
+
+def _pad(values: np.ndarray, length: int) -> np.ndarray:
+    """Left-pad a trailing-window result with NaN to `length`."""
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values
+    return out
+
+
+def ema(close: np.ndarray, period: int = EMA_PERIOD) -> np.ndarray:
+    return ewm_mean(close, span_alpha(period))
+
+
+def stochastic_d(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int = STOCH_K_PERIOD,
+    d_period: int = STOCH_D_PERIOD,
+) -> np.ndarray:
+    """Stochastic %D: `d_period` mean of %K over `k_period` high/low ranges."""
+    n = len(close)
+    if n < k_period:
+        return np.full(n, np.nan)
+
+    lowest_low = sliding_window_view(low, k_period).min(axis=1)
+    highest_high = sliding_window_view(high, k_period).max(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k_percent = 100 * (close[k_period - 1:] - lowest_low) / (highest_high - lowest_low)
+
+    if len(k_percent) < d_period:
+        return np.full(n, np.nan)
+    d_percent = window_sum(sliding_window_view(k_percent, d_period)) / d_period
+    return _pad(d_percent, n)
+
+
+def cci(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = CCI_PERIOD,
+) -> np.ndarray:
+    """Commodity Channel Index with a vectorised mean absolute deviation."""
+    n = len(close)
+    typical_price = (high + low + close) / 3
+    if n < period:
+        return np.full(n, np.nan)
+
+    windows = sliding_window_view(typical_price, period)
+    sma = window_sum(windows) / period
+    mean_deviation = window_sum(np.abs(windows - sma[:, None])) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (typical_price[period - 1:] - sma) / (0.015 * mean_deviation)
+    return _pad(result, n)
+
+
+def directional_movement(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """True range, +DM and -DM per candle (NaN for the first)."""
+    prev_close = np.r_[np.nan, close[:-1]]
+    high_low = high - low
+    high_close = np.abs(high - prev_close)
+    low_close = np.abs(low - prev_close)
+    true_range = np.maximum(high_low, np.maximum(high_close, low_close))
+
+    plus_dm = np.r_[np.nan, np.diff(high)]
+    minus_dm = np.r_[np.nan, np.diff(low)] * -1
+
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+    plus_dm[plus_dm < minus_dm] = 0
+    minus_dm[minus_dm < plus_dm] = 0
+    return true_range, plus_dm, minus_dm
+
+
+def adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = ADX_PERIOD,
+) -> np.ndarray:
+    """Average Directional Index with Wilder smoothing."""
+    true_range, plus_dm, minus_dm = directional_movement(high, low, close)
+
+    alpha = wilder_alpha(period)
+    tr_smooth = ewm_mean(true_range, alpha)
+    plus_dm_smooth = ewm_mean(plus_dm, alpha)
+    minus_dm_smooth = ewm_mean(minus_dm, alpha)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * plus_dm_smooth / tr_smooth
+        minus_di = 100 * minus_dm_smooth / tr_smooth
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return ewm_mean(dx, alpha)
+
+
+def compute_indicators(series: OHLCSeries) -> Dict[str, np.ndarray]:
+    """
+    EMA-20, Stochastic %D, CCI and ADX for an oldest-first series.
+
+    Returns one float64 column per indicator, aligned with the candles and
+    rounded to two decimals; warm-up positions are NaN.
+    """
+    high, low, close = series.high, series.low, series.close
+    columns = {
+        "EMA_20": ema(close),
+        "Stochastic_D": stochastic_d(high, low, close),
+        "CCI": cci(high, low, close),
+        "ADX": adx(high, low, close),
+    }
+    return {name: np.round(values, ROUND_DECIMALS) for name, values in columns.items()}
+
+
+class IndicatorEngine:
+    """
+    Memoised indicator computation.
+
+    Results are keyed by (pair, interval, last candle timestamp). The key
+    also carries the window's first timestamp and length, because EMA and
+    ADX are seeded from the first candle, and the last candle's high, low
+    and close, because the newest candle keeps changing until it closes.
+    Cached columns are read-only and shared between callers.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.results: "OrderedDict[Hashable, Dict[str, np.ndarray]]" = OrderedDict()
+        # Computations may run on worker threads
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_key(self, series: OHLCSeries, interval: int) -> Hashable:
+        return (
+            series.trading_pair,
+            interval,
+            int(series.timestamps[-1].view(np.int64)),
+            int(series.timestamps[0].view(np.int64)),
+            len(series),
+            float(series.high[-1]),
+            float(series.low[-1]),
+            float(series.close[-1]),
+        )
+
+    def compute(
+        self,
+        series: OHLCSeries,
+        interval: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        series = series.sort_by_time()
+        if interval is None or not len(series):
+            return compute_indicators(series)
+
+        key = self._get_key(series, interval)
+        with self.lock:
+            cached = self.results.get(key)
+            if cached is not None:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        result = compute_indicators(series)
+        for values in result.values():
+            values.flags.writeable = False
+
+        with self.lock:
+            self.misses += 1
+            self.results[key] = result
+            while len(self.results) > self.max_entries:
+                self.results.popitem(last=False)
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.results),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+default_engine = IndicatorEngine()
+
+
+def _set_empty_indicators(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for record in records:
+        record.update({name: None for name in INDICATOR_COLUMNS})
+    return records
+
+
+def add_technical_indicators(
+    data: List[Dict[str, Any]],
+    trading_pair: Optional[str] = None,
+    interval: Optional[int] = None,
+    engine: Optional[IndicatorEngine] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Add EMA_20, Stochastic_D, CCI and ADX to raw livechart records.
+
+    Records come back oldest first with `Date_time` in ISO format; warm-up
+    and undefined values are None. Pass `trading_pair` and `interval` to
+    memoise the computation.
+    """
+    if not data or len(data) < MIN_CANDLES:
+        logger.warning(f"Insufficient data for technical indicator calculations. Got {len(data) if data else 0} records, need at least {MIN_CANDLES}")
+        # Still add the indicator columns with None values
+        return _set_empty_indicators(data)
+
+    try:
+        timestamps = [_parse_timestamp(record["Date_time"]) for record in data]
+        order = sorted(range(len(data)), key=timestamps.__getitem__)
+        ordered = [data[i] for i in order]
+
+        series = OHLCSeries.from_records(ordered, trading_pair or "")
+        engine_instance = engine or default_engine
+        columns = engine_instance.compute(series, interval if trading_pair else None)
+        values = {name: column.tolist() for name, column in columns.items()}
+
+        enhanced_data = []
+        for position, index in enumerate(order):
+            record = dict(data[index])
+            record["Date_time"] = timestamps[index].isoformat()
+            for name in INDICATOR_COLUMNS:
+                value = values[name][position]
+                record[name] = value if math.isfinite(value) else None
+            enhanced_data.append(record)
+
+        logger.info(f"Technical indicators calculated successfully for {len(enhanced_data)} records")
+        return enhanced_data
+
+    except Exception as e:
+        logger.error(f"Error calculating technical indicators: {e}")
+        # Fallback: add indicator columns with None values
+        return _set_empty_indicators(data)
+
+
+# App-lifetime worker pool, created lazily and shut down from the FastAPI lifespan.
+# Threads (not processes) so workers share the engine's memoised results.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_indicator_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app_config.INDICATOR_WORKERS,
+            thread_name_prefix="indicators",
+        )
+    return _executor
+
+
+def shutdown_indicator_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def add_technical_indicators_async(
+    data: List[Dict[str, Any]],
+    trading_pair: Optional[str] = None,
+    interval: Optional[int] = None,
+    engine: Optional[IndicatorEngine] = None,
+) -> List[Dict[str, Any]]:
+    """`add_technical_indicators` on the worker pool, so the event loop keeps serving."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_indicator_executor(),
+        partial(add_technical_indicators, data, trading_pair, interval, engine),
+    )
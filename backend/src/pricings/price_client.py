@@ -1,15 +1,102 @@
 import asyncio
 import httpx
-from typing import List, Optional, Literal
+from typing import Any, List, Optional, Literal
+from src.app_config import app_config
 from .models import OHLCData, TradingPair
+from .series import OHLCSeries
+from .single_flight import SingleFlight
 
 
-BASE_URL = "https://gpcintegral.southeastasia.cloudapp.azure.com"
+BASE_URL = app_config.PRICING_API_BASE_URL
 
 _REQUEST_TIMEOUT = 10.0  # seconds
 _MAX_RETRIES = 3
 _RETRY_DELAY = 2.0  # seconds between retries
 
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# App-lifetime connection pools, created lazily and closed from the FastAPI lifespan.
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+
+# Concurrent identical OHLC requests share one upstream fetch
+_ohlc_flight = SingleFlight()
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=app_config.PRICING_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=app_config.PRICING_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=app_config.PRICING_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client for the livechart upstream."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=_REQUEST_TIMEOUT,
+            limits=_pool_limits(),
+            http2=app_config.PRICING_HTTP2 and _HTTP2_AVAILABLE,
+        )
+    return _async_client
+
+
+def get_sync_client() -> httpx.Client:
+    """Return the shared keep-alive client used by the synchronous helpers."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            timeout=_REQUEST_TIMEOUT,
+            limits=_pool_limits(),
+            http2=app_config.PRICING_HTTP2 and _HTTP2_AVAILABLE,
+        )
+    return _sync_client
+
+
+async def close_http_clients():
+    global _async_client, _sync_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+def _build_params(
+    trading_pair: TradingPair,
+    interval: int,
+    limit: int,
+    offset: int,
+    sort: str,
+) -> dict:
+    return {
+        "trading_pairs": trading_pair.value,
+        "interval": interval,
+        "limit": limit,
+        "offset": offset,
+        "sort": sort,
+    }
+
+
+def _parse_ohlc_response(response_data: Any, trading_pair: TradingPair) -> OHLCSeries:
+    # Handle both direct array and wrapped response formats
+    if isinstance(response_data, dict):
+        data = response_data.get("data", response_data.get("results", []))
+    elif isinstance(response_data, list):
+        data = response_data
+    else:
+        raise ValueError(f"Unexpected response format: {type(response_data)}")
+
+    return OHLCSeries.from_records(data, trading_pair.value)
+
 
 async def get_ohlc_data(
     trading_pair: TradingPair | str,
@@ -18,59 +105,49 @@ async def get_ohlc_data(
     offset: int = 0,
     sort: Literal["asc", "desc"] = "desc",
 ) -> List[OHLCData]:
+    series = await get_ohlc_series(trading_pair, interval, limit, offset, sort)
+    return series.to_ohlc()
+
+
+async def get_ohlc_series(
+    trading_pair: TradingPair | str,
+    interval: int = 3600,
+    limit: int = 50,
+    offset: int = 0,
+    sort: Literal["asc", "desc"] = "desc",
+) -> OHLCSeries:
     if isinstance(trading_pair, str):
         trading_pair = TradingPair(trading_pair)
 
+    key = (trading_pair.value, interval, limit, offset, sort)
+    # The series is immutable, so every coalesced caller can share it
+    return await _ohlc_flight.do(
+        key,
+        lambda: _fetch_ohlc_data(trading_pair, interval, limit, offset, sort),
+    )
+
+
+def get_ohlc_flight_stats() -> dict:
+    return _ohlc_flight.get_stats()
+
+
+async def _fetch_ohlc_data(
+    trading_pair: TradingPair,
+    interval: int,
+    limit: int,
+    offset: int,
+    sort: str,
+) -> OHLCSeries:
     url = f"{BASE_URL}/livechart/data/"
-    params = {
-        "trading_pairs": trading_pair.value,
-        "interval": interval,
-        "limit": limit,
-        "offset": offset,
-        "sort": sort,
-    }
+    params = _build_params(trading_pair, interval, limit, offset, sort)
+    client = get_async_client()
 
     last_error: Exception | None = None
     for attempt in range(1, _MAX_RETRIES + 1):
         try:
-            async with httpx.AsyncClient(timeout=_REQUEST_TIMEOUT) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                response_data = response.json()
-
-            # Handle both direct array and wrapped response formats
-            if isinstance(response_data, dict):
-                data = response_data.get("data", response_data.get("results", []))
-            elif isinstance(response_data, list):
-                data = response_data
-            else:
-                raise ValueError(f"Unexpected response format: {type(response_data)}")
-
-            result = []
-            for item in data:
-                try:
-                    # Handle both capitalized and lowercase field names
-                    timestamp = item.get("Date_time") or item.get("timestamp") or item.get("Timestamp")
-                    open_price = item.get("Open") or item.get("open")
-                    high_price = item.get("High") or item.get("high")
-                    low_price = item.get("Low") or item.get("low")
-                    close_price = item.get("Close") or item.get("close")
-                    volume = item.get("Volume") or item.get("volume")
-
-                    ohlc = OHLCData(
-                        timestamp=timestamp,
-                        open=float(open_price),
-                        high=float(high_price),
-                        low=float(low_price),
-                        close=float(close_price),
-                        volume=float(volume) if volume is not None else None,
-                        trading_pair=trading_pair.value,
-                    )
-                    result.append(ohlc)
-                except Exception as e:
-                    print(f"Error parsing OHLC item: {e}")
-                    print(f"Item data: {item}")
-                    raise
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            result = _parse_ohlc_response(response.json(), trading_pair)
 
             print(f"Successfully parsed {len(result)} OHLC records")
             return result
@@ -86,6 +163,15 @@ async def get_ohlc_data(
     raise last_error
 
 
+async def get_livechart_payload(params: dict, timeout: float = 30.0) -> Any:
+    """Raw livechart response for pass-through endpoints, on the shared pool."""
+    response = await get_async_client().get(
+        f"{BASE_URL}/livechart/data/", params=params, timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 def get_ohlc_data_sync(
     trading_pair: TradingPair | str,
     interval: int = 3600,
@@ -97,49 +183,11 @@ def get_ohlc_data_sync(
         trading_pair = TradingPair(trading_pair)
 
     url = f"{BASE_URL}/livechart/data/"
-    params = {
-        "trading_pairs": trading_pair.value,
-        "interval": interval,
-        "limit": limit,
-        "offset": offset,
-        "sort": sort,
-    }
+    params = _build_params(trading_pair, interval, limit, offset, sort)
 
-    with httpx.Client() as client:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        response_data = response.json()
-
-        # Handle both direct array and wrapped response formats
-        if isinstance(response_data, dict):
-            data = response_data.get("data", response_data.get("results", []))
-        elif isinstance(response_data, list):
-            data = response_data
-        else:
-            raise ValueError(f"Unexpected response format: {type(response_data)}")
-
-        result = []
-        for item in data:
-            # Handle both capitalized and lowercase field names
-            timestamp = item.get("Date_time") or item.get("timestamp") or item.get("Timestamp")
-            open_price = item.get("Open") or item.get("open")
-            high_price = item.get("High") or item.get("high")
-            low_price = item.get("Low") or item.get("low")
-            close_price = item.get("Close") or item.get("close")
-            volume = item.get("Volume") or item.get("volume")
-
-            ohlc = OHLCData(
-                timestamp=timestamp,
-                open=float(open_price),
-                high=float(high_price),
-                low=float(low_price),
-                close=float(close_price),
-                volume=float(volume) if volume is not None else None,
-                trading_pair=trading_pair.value,
-            )
-            result.append(ohlc)
-
-        return result
+    response = get_sync_client().get(url, params=params)
+    response.raise_for_status()
+    return _parse_ohlc_response(response.json(), trading_pair).to_ohlc()
 
 
 async def get_gold_ohlc(
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Callable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .series import OHLCSeries
+
+_US = 1_000_000
+_US_PER_HOUR = 3_600 * _US
+_US_PER_DAY = 24 * _US_PER_HOUR
+_US_PER_WEEK = 7 * _US_PER_DAY
+# 1970-01-01 was a Thursday; weekly buckets start on Monday
+_MONDAY_SHIFT_US = 4 * _US_PER_DAY
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def _resolve_tz(tz: str | tzinfo | None) -> tzinfo:
+    if tz is None:
+        return timezone.utc
+    if isinstance(tz, str):
+        return timezone.utc if tz.upper() == "UTC" else ZoneInfo(tz)
+    return tz
+
+
+def _offset_us(offset: Optional[timedelta]) -> int:
+    return (offset or timedelta(0)) // timedelta(microseconds=1)
+
+
+def _offsets(
+    values: np.ndarray,
+    offset_at: Callable[[int], int],
+    granularities: Tuple[int, ...] = (_US_PER_WEEK, _US_PER_DAY, _US_PER_HOUR),
+) -> np.ndarray:
+    """
+    UTC offset (us) for each value with as few `offset_at` calls as possible.
+
+    Values are binned by the first granularity and the offset evaluated at
+    both ends of each bin. Bins whose ends agree cannot contain a DST change
+    (those are months apart); the rest are refined with the next, finer
+    granularity and finally evaluated per value.
+    """
+    if not granularities:
+        return np.array([offset_at(int(v)) for v in values], dtype=np.int64)
+
+    size = granularities[0]
+    bins = values // size
+    unique_bins, inverse = np.unique(bins, return_inverse=True)
+    bin_starts = unique_bins * size
+    at_start = np.array([offset_at(int(b)) for b in bin_starts], dtype=np.int64)
+    at_end = np.array([offset_at(int(b) + size - 1) for b in bin_starts], dtype=np.int64)
+
+    offsets = at_start[inverse]
+    changing = unique_bins[at_start != at_end]
+    if len(changing):
+        selected = np.isin(bins, changing)
+        offsets[selected] = _offsets(values[selected], offset_at, granularities[1:])
+    return offsets
+
+
+def _utc_to_local_offsets(utc_us: np.ndarray, tz: tzinfo) -> np.ndarray:
+    if isinstance(tz, timezone):
+        return np.full(len(utc_us), _offset_us(tz.utcoffset(None)), dtype=np.int64)
+
+    def offset_at(us: int) -> int:
+        moment = (_UNIX_EPOCH + timedelta(microseconds=us)).replace(tzinfo=timezone.utc)
+        return _offset_us(moment.astimezone(tz).utcoffset())
+
+    return _offsets(utc_us, offset_at)
+
+
+def _local_to_utc_offsets(local_us: np.ndarray, tz: tzinfo) -> np.ndarray:
+    if isinstance(tz, timezone):
+        return np.full(len(local_us), _offset_us(tz.utcoffset(None)), dtype=np.int64)
+
+    def offset_at(us: int) -> int:
+        return _offset_us((_UNIX_EPOCH + timedelta(microseconds=us)).replace(tzinfo=tz).utcoffset())
+
+    return _offsets(local_us, offset_at)
+
+
+def resample_series(
+    series: OHLCSeries,
+    interval_seconds: int,
+    tz: str | tzinfo | None = "UTC",
+    session_start: timedelta = timedelta(0),
+    fill_gaps: bool = False,
+) -> OHLCSeries:
+    """
+    Aggregate candles into calendar-aligned buckets of `interval_seconds`.
+
+    Buckets are aligned to wall-clock time in `tz` (so 4h buckets start at
+    00:00, 04:00, ... local time and 1d buckets at local midnight, including
+    across DST changes), shifted by `session_start` for exchange sessions
+    such as a 17:00 New York daily open. Weekly buckets start on Monday.
+
+    Each bucket takes the first open, max high, min low, last close and the
+    summed volume (NaN if no source candle had one); buckets are labelled
+    with their start time. Buckets without any source candle are omitted,
+    or with `fill_gaps` emitted as flat candles at the previous close.
+    """
+    if not len(series):
+        return series
+
+    series = series.sort_by_time()
+    zone = _resolve_tz(tz)
+    interval_us = int(interval_seconds) * _US
+    origin = _offset_us(session_start)
+    if interval_us % _US_PER_WEEK == 0:
+        origin += _MONDAY_SHIFT_US
+
+    utc_us = series.timestamps.view(np.int64)
+    local_us = utc_us + _utc_to_local_offsets(utc_us, zone)
+    keys = (local_us - origin) // interval_us * interval_us + origin
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    has_volume = ~np.isnan(series.volume)
+    volume = np.add.reduceat(np.where(has_volume, series.volume, 0.0), starts)
+    volume[~np.logical_or.reduceat(has_volume, starts)] = np.nan
+
+    bucket_keys = keys[starts]
+    opens = series.open[starts]
+    highs = np.maximum.reduceat(series.high, starts)
+    lows = np.minimum.reduceat(series.low, starts)
+    closes = series.close[ends]
+
+    if fill_gaps:
+        all_keys = np.arange(bucket_keys[0], bucket_keys[-1] + 1, interval_us, dtype=np.int64)
+        source = np.full(len(all_keys), -1, dtype=np.int64)
+        present = np.searchsorted(all_keys, bucket_keys)
+        source[present] = np.arange(len(bucket_keys))
+        # Every empty bucket points at the last bucket that had candles
+        source = np.maximum.accumulate(source)
+        missing = np.ones(len(all_keys), dtype=bool)
+        missing[present] = False
+
+        previous_close = closes[source]
+        opens = np.where(missing, previous_close, opens[source])
+        highs = np.where(missing, previous_close, highs[source])
+        lows = np.where(missing, previous_close, lows[source])
+        closes = previous_close
+        volume = np.where(missing, np.nan, volume[source])
+        bucket_keys = all_keys
+
+    labels = bucket_keys - _local_to_utc_offsets(bucket_keys, zone)
+
+    if fill_gaps and not isinstance(zone, timezone):
+        # Filler buckets at local times skipped by a DST change do not exist
+        exists = labels + _utc_to_local_offsets(labels, zone) == bucket_keys
+        keep = exists | ~missing
+        labels, opens, highs, lows, closes, volume = (
+            column[keep] for column in (labels, opens, highs, lows, closes, volume)
+        )
+
+    return OHLCSeries(
+        series.trading_pair,
+        labels.view("datetime64[us]"),
+        opens,
+        highs,
+        lows,
+        closes,
+        volume,
+        tz_aware=series.tz_aware,
+    )
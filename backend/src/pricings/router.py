@@ -1,20 +1,34 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
 from typing import List, Literal
-from .price_client import (
-    get_gold_ohlc,
-    get_silver_ohlc,
-    get_platinum_ohlc,
-    get_sgd_ohlc,
-    get_myr_ohlc,
-    get_ohlc_data,
-)
+from .price_client import get_ohlc_flight_stats
+from .cache import default_cache, get_cached_ohlc_data_with_status
+from .indicators import default_engine
+from .spot_price import default_spot_service
 from .models import OHLCData, TradingPair
 
 router = APIRouter(prefix="/api/pricing", tags=["Pricing"])
 
 
+async def _cached_ohlc(
+    response: Response,
+    trading_pair: TradingPair,
+    interval: int,
+    limit: int,
+    offset: int,
+    sort: str,
+) -> List[OHLCData]:
+    data, status = await get_cached_ohlc_data_with_status(
+        trading_pair, interval, limit, offset, sort
+    )
+    ttl = int(default_cache.ttl_for(interval).total_seconds())
+    response.headers["X-Cache"] = status
+    response.headers["Cache-Control"] = f"public, max-age={ttl}"
+    return data
+
+
 @router.get("/ohlc/{trading_pair}", response_model=List[OHLCData])
 async def get_ohlc(
+    response: Response,
     trading_pair: TradingPair,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
@@ -22,7 +36,7 @@ async def get_ohlc(
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_ohlc_data(trading_pair, interval, limit, offset, sort)
+        return await _cached_ohlc(response, trading_pair, interval, limit, offset, sort)
     except Exception as e:
         print(f"Error in get_ohlc endpoint: {e}")
         import traceback
@@ -32,64 +46,79 @@ async def get_ohlc(
 
 @router.get("/ohlc/gold", response_model=List[OHLCData])
 async def get_gold_prices(
+    response: Response,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_gold_ohlc(interval, limit, offset, sort)
+        return await _cached_ohlc(response, TradingPair.XAU_USD, interval, limit, offset, sort)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/ohlc/silver", response_model=List[OHLCData])
 async def get_silver_prices(
+    response: Response,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_silver_ohlc(interval, limit, offset, sort)
+        return await _cached_ohlc(response, TradingPair.XAG_USD, interval, limit, offset, sort)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/ohlc/platinum", response_model=List[OHLCData])
 async def get_platinum_prices(
+    response: Response,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_platinum_ohlc(interval, limit, offset, sort)
+        return await _cached_ohlc(response, TradingPair.XPT_USD, interval, limit, offset, sort)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/ohlc/sgd", response_model=List[OHLCData])
 async def get_sgd_prices(
+    response: Response,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_sgd_ohlc(interval, limit, offset, sort)
+        return await _cached_ohlc(response, TradingPair.USD_SGD, interval, limit, offset, sort)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/ohlc/myr", response_model=List[OHLCData])
 async def get_myr_prices(
+    response: Response,
     interval: int = Query(3600, description="Interval in seconds"),
     limit: int = Query(50, ge=1, le=1000, description="Number of data points"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     sort: Literal["asc", "desc"] = Query("desc", description="Sort order"),
 ):
     try:
-        return await get_myr_ohlc(interval, limit, offset, sort)
+        return await _cached_ohlc(response, TradingPair.USD_MYR, interval, limit, offset, sort)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def get_pricing_stats():
+    return {
+        "cache": default_cache.get_cache_stats(),
+        "coalescing": get_ohlc_flight_stats(),
+        "indicators": default_engine.get_stats(),
+        "gold_spot": default_spot_service.get_stats(),
+    }
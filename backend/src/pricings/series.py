@@ -0,0 +1,236 @@
+import sys
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .models import OHLCData
+
+_TS_DTYPE = "datetime64[us]"
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    raise ValueError(f"Unsupported timestamp value: {value!r}")
+
+
+class OHLCSeries:
+    """
+    Columnar OHLC candles for one trading pair.
+
+    Timestamps are `datetime64[us]` (UTC wall time when the source was
+    timezone-aware) and prices are float64 arrays; missing volume is NaN.
+    The pair string is interned and stored once per series rather than per
+    candle. Instances are treated as immutable: slicing returns views and
+    every transformation builds new arrays, so a series can be shared
+    between cache readers safely.
+
+    Convert to and from `List[OHLCData]` only at the API edge.
+    """
+
+    __slots__ = (
+        "trading_pair",
+        "timestamps",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "tz_aware",
+        "_direction",
+    )
+
+    def __init__(
+        self,
+        trading_pair: str,
+        timestamps: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: Optional[np.ndarray] = None,
+        tz_aware: bool = False,
+    ):
+        self.trading_pair = sys.intern(str(trading_pair))
+        self.timestamps = np.asarray(timestamps, dtype=_TS_DTYPE)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = (
+            np.full(len(self.timestamps), np.nan)
+            if volume is None
+            else np.asarray(volume, dtype=np.float64)
+        )
+        self.tz_aware = tz_aware
+        self._direction: Optional[int] = None
+
+    @classmethod
+    def empty(cls, trading_pair: str) -> "OHLCSeries":
+        return cls(trading_pair, [], [], [], [], [], [])
+
+    @classmethod
+    def from_ohlc(
+        cls,
+        data: Sequence[OHLCData],
+        trading_pair: Optional[str] = None,
+    ) -> "OHLCSeries":
+        if not data:
+            return cls.empty(trading_pair or "")
+
+        tz_aware = data[0].timestamp.tzinfo is not None
+        return cls(
+            trading_pair or data[0].trading_pair,
+            [_to_naive_utc(item.timestamp) for item in data],
+            [item.open for item in data],
+            [item.high for item in data],
+            [item.low for item in data],
+            [item.close for item in data],
+            [np.nan if item.volume is None else item.volume for item in data],
+            tz_aware=tz_aware,
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], trading_pair: str) -> "OHLCSeries":
+        """Build directly from raw livechart items, skipping per-candle models."""
+        timestamps, opens, highs, lows, closes, volumes = [], [], [], [], [], []
+        tz_aware = False
+        for item in records:
+            try:
+                # Handle both capitalized and lowercase field names
+                timestamp = _parse_timestamp(
+                    item.get("Date_time") or item.get("timestamp") or item.get("Timestamp")
+                )
+                volume = item.get("Volume") or item.get("volume")
+
+                opens.append(float(item.get("Open") or item.get("open")))
+                highs.append(float(item.get("High") or item.get("high")))
+                lows.append(float(item.get("Low") or item.get("low")))
+                closes.append(float(item.get("Close") or item.get("close")))
+                volumes.append(np.nan if volume is None else float(volume))
+            except Exception as e:
+                print(f"Error parsing OHLC item: {e}")
+                print(f"Item data: {item}")
+                raise
+
+            tz_aware = tz_aware or timestamp.tzinfo is not None
+            timestamps.append(_to_naive_utc(timestamp))
+
+        return cls(trading_pair, timestamps, opens, highs, lows, closes, volumes, tz_aware)
+
+    @classmethod
+    def concat(cls, parts: Sequence["OHLCSeries"]) -> "OHLCSeries":
+        first = parts[0]
+        return cls(
+            first.trading_pair,
+            np.concatenate([p.timestamps for p in parts]),
+            np.concatenate([p.open for p in parts]),
+            np.concatenate([p.high for p in parts]),
+            np.concatenate([p.low for p in parts]),
+            np.concatenate([p.close for p in parts]),
+            np.concatenate([p.volume for p in parts]),
+            tz_aware=first.tz_aware,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index) -> "OHLCSeries":
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 if index != -1 else None)
+        sliced = OHLCSeries(
+            self.trading_pair,
+            self.timestamps[index],
+            self.open[index],
+            self.high[index],
+            self.low[index],
+            self.close[index],
+            self.volume[index],
+            tz_aware=self.tz_aware,
+        )
+        # A slice of a monotonic series keeps (or, stepping backwards, flips) its order
+        if isinstance(index, slice) and self._direction:
+            sliced._direction = self._direction if (index.step or 1) > 0 else -self._direction
+        return sliced
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.timestamps.nbytes
+            + self.open.nbytes
+            + self.high.nbytes
+            + self.low.nbytes
+            + self.close.nbytes
+            + self.volume.nbytes
+        )
+
+    @property
+    def direction(self) -> int:
+        """1 if timestamps strictly increase, -1 if they strictly decrease, else 0."""
+        if self._direction is None:
+            steps = np.diff(self.timestamps.view(np.int64))
+            if (steps > 0).all():
+                self._direction = 1
+            elif (steps < 0).all():
+                self._direction = -1
+            else:
+                self._direction = 0
+        return self._direction
+
+    def is_ascending(self) -> bool:
+        return self.direction == 1
+
+    def sort_by_time(self, descending: bool = False) -> "OHLCSeries":
+        if self.direction == (-1 if descending else 1):
+            return self
+        if self.direction:
+            return self[::-1]
+        order = np.argsort(self.timestamps, kind="stable")
+        return self[order[::-1] if descending else order]
+
+    def to_datetimes(self) -> List[datetime]:
+        values = self.timestamps.astype(datetime).tolist()
+        if self.tz_aware:
+            return [value.replace(tzinfo=timezone.utc) for value in values]
+        return values
+
+    def to_ohlc(self) -> List[OHLCData]:
+        volumes = self.volume.tolist()
+        return [
+            # Values were validated on the way in; skip pydantic validation
+            OHLCData.model_construct(
+                timestamp=timestamp,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=None if v != v else v,
+                trading_pair=self.trading_pair,
+            )
+            for timestamp, o, h, l, c, v in zip(
+                self.to_datetimes(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                volumes,
+            )
+        ]
+
+
+def as_series(data: "OHLCSeries | Sequence[OHLCData]") -> OHLCSeries:
+    """Accept either representation at a function boundary."""
+    if isinstance(data, OHLCSeries):
+        return data
+    return OHLCSeries.from_ohlc(data)
@@ -0,0 +1,77 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+_MAX_TRACKED_KEYS = 1000
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls onto one in-flight future.
+
+    The first caller for a key starts the work; everyone arriving while it is
+    running awaits the same task and receives the same result (or exception).
+    """
+
+    def __init__(self, max_tracked_keys: int = _MAX_TRACKED_KEYS):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._callers: Dict[Hashable, int] = {}
+        self._stats: "OrderedDict[Hashable, Dict[str, int]]" = OrderedDict()
+        self._max_tracked_keys = max_tracked_keys
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is not None:
+            self._callers[key] += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._callers[key] = 1
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        served = self._callers.pop(key, 1)
+
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+        stats = self._stats.pop(key, None) or {
+            "fetches": 0,
+            "callers_served": 0,
+            "last_fan_in": 0,
+            "max_fan_in": 0,
+        }
+        stats["fetches"] += 1
+        stats["callers_served"] += served
+        stats["last_fan_in"] = served
+        stats["max_fan_in"] = max(stats["max_fan_in"], served)
+        self._stats[key] = stats
+
+        while len(self._stats) > self._max_tracked_keys:
+            self._stats.popitem(last=False)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        fetches = sum(s["fetches"] for s in self._stats.values())
+        served = sum(s["callers_served"] for s in self._stats.values())
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_fetches": fetches,
+            "callers_served": served,
+            "fan_in": round(served / fetches, 2) if fetches else 0.0,
+            "keys": {
+                ":".join(str(part) for part in key)
+                if isinstance(key, tuple)
+                else str(key): dict(stats)
+                for key, stats in self._stats.items()
+            },
+        }
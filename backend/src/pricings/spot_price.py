@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from src.app_config import app_config
+from .cache import get_cached_ohlc_series
+from .models import TradingPair, WebSocketSymbol
+from .price_client import get_async_client
+from .single_flight import SingleFlight
+from .stream_manager import PriceStreamManager, default_stream_manager
+
+
+class SpotQuote(BaseModel):
+    price: float
+    source: str  # "goldapi", "stream" or "livechart"
+    timestamp: datetime
+
+
+class GoldSpotService:
+    """
+    XAU/USD spot price from goldapi.io, cached for a few seconds.
+
+    Requests go through the shared pricing client and concurrent misses
+    share one upstream call. When goldapi is slow, failing or rate-limited
+    (a 429 pauses it for `rate_limit_backoff` seconds) the price falls back
+    to the latest tick of the internal XAU/USD stream, then to the close of
+    the newest cached 1h candle. Without an API key (GOLDIO unset) goldapi
+    is skipped and only the fallbacks are used.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: Optional[str],
+        ttl_seconds: float = 10.0,
+        timeout: float = 3.0,
+        rate_limit_backoff: float = 60.0,
+        tick_max_age: float = 300.0,
+        stream_manager: Optional[PriceStreamManager] = None,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.rate_limit_backoff = rate_limit_backoff
+        self.tick_max_age = tick_max_age
+        self.stream_manager = stream_manager or default_stream_manager
+
+        self.quote: Optional[SpotQuote] = None
+        self.expires_at = 0.0
+        self.backoff_until = 0.0
+        self.flight = SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.rate_limited = 0
+        self.fallbacks = 0
+
+    async def get_quote(self) -> SpotQuote:
+        if self.quote is not None and time.monotonic() < self.expires_at:
+            self.hits += 1
+            return self.quote
+
+        self.misses += 1
+        return await self.flight.do("XAU/USD", self._refresh)
+
+    async def get_price(self) -> float:
+        return (await self.get_quote()).price
+
+    async def _refresh(self) -> SpotQuote:
+        error: Optional[Exception] = None
+        if self.api_key and time.monotonic() >= self.backoff_until:
+            try:
+                quote = await self._fetch_goldapi()
+                self._store(quote)
+                return quote
+            except Exception as e:
+                error = e
+                self.upstream_errors += 1
+                print(f"Gold spot price from goldapi failed, falling back: {e!r}")
+
+        quote = await self._fallback_quote()
+        if quote is None:
+            reason = "rate-limited" if self.api_key else "not configured (GOLDIO)"
+            raise error or RuntimeError(f"goldapi is {reason} and no internal XAU/USD price is available")
+
+        self.fallbacks += 1
+        self._store(quote)
+        return quote
+
+    def _store(self, quote: SpotQuote):
+        self.quote = quote
+        self.expires_at = time.monotonic() + self.ttl_seconds
+
+    async def _fetch_goldapi(self) -> SpotQuote:
+        self.upstream_calls += 1
+        response = await get_async_client().get(
+            self.api_url,
+            headers={"x-access-token": self.api_key},
+            timeout=self.timeout,
+        )
+        if response.status_code == 429:
+            self.rate_limited += 1
+            self.backoff_until = time.monotonic() + self.rate_limit_backoff
+        response.raise_for_status()
+        return SpotQuote(
+            price=float(response.json()["price"]),
+            source="goldapi",
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    async def _fallback_quote(self) -> Optional[SpotQuote]:
+        tick = self.stream_manager.get_latest_tick(WebSocketSymbol.XAU_USD, self.tick_max_age)
+        if tick is not None:
+            return SpotQuote(price=(tick.bid + tick.ask) / 2, source="stream", timestamp=tick.timestamp)
+
+        try:
+            series = await asyncio.wait_for(
+                get_cached_ohlc_series(TradingPair.XAU_USD, 3600, 1, 0, "desc"),
+                self.timeout,
+            )
+        except Exception as e:
+            print(f"Livechart fallback for gold spot price failed: {e!r}")
+            return None
+        if not len(series):
+            return None
+        return SpotQuote(
+            price=float(series.close[0]),
+            source="livechart",
+            timestamp=series.to_datetimes()[0],
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "rate_limited": self.rate_limited,
+            "fallbacks": self.fallbacks,
+            "source": self.quote.source if self.quote else None,
+        }
+
+
+default_spot_service = GoldSpotService(
+    api_url=app_config.GOLD_SPOT_API_URL,
+    api_key=app_config.GOLDIO,
+    ttl_seconds=app_config.GOLD_SPOT_TTL_SECONDS,
+    timeout=app_config.GOLD_SPOT_TIMEOUT,
+    rate_limit_backoff=app_config.GOLD_SPOT_RATE_LIMIT_BACKOFF,
+    tick_max_age=app_config.GOLD_SPOT_TICK_MAX_AGE,
+)
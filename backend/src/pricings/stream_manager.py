@@ -1,42 +1,77 @@
 import asyncio
-from typing import Dict, Set, Callable, Awaitable
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from src.app_config import app_config
 from .websocket_client import PriceWebSocketClient
 from .models import TickData, WebSocketSymbol
+from .cache import get_cached_ohlc_series
+from .incremental import LiveIndicatorTracker
+from .tick_batch import TickBatch
+from .tick_subscriber import TickSubscriber
+
+
+def _symbol_to_pair(symbol_str: str) -> str:
+    # "ticks:XAU/USD" -> "xau_usd"
+    return symbol_str.split(":", 1)[-1].replace("/", "_").lower()
 
 
 class PriceStreamManager:
+    """
+    One upstream websocket per symbol, fanned out to every subscriber.
+
+    The upstream is opened by the first subscriber and closed when the last
+    one leaves. Subscribe/unsubscribe for a symbol are serialised, so
+    concurrent first subscribers share a single upstream connection.
+
+    Each tick is serialised once and offered to every TickSubscriber without
+    waiting; subscribers deliver from their own queues, so the upstream read
+    loop never runs at the pace of the slowest client.
+    """
+
     def __init__(self):
         self.clients: Dict[str, PriceWebSocketClient] = {}
-        self.subscribers: Dict[str, Set[Callable[[TickData], Awaitable[None]]]] = {}
+        self.subscribers: Dict[str, Set[TickSubscriber]] = {}
         self.tasks: Dict[str, asyncio.Task] = {}
+        self.indicators: Dict[str, LiveIndicatorTracker] = {}
+        # symbol -> (last tick, monotonic time it arrived)
+        self.latest_ticks: Dict[str, Tuple[TickData, float]] = {}
+        self.seed_tasks: Dict[str, asyncio.Task] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
 
     async def subscribe(
         self,
         symbol: WebSocketSymbol | str,
-        callback: Callable[[TickData], Awaitable[None]],
+        subscriber: TickSubscriber,
     ):
         symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
 
-        if symbol_str not in self.subscribers:
-            self.subscribers[symbol_str] = set()
+        async with self.locks.setdefault(symbol_str, asyncio.Lock()):
+            if symbol_str not in self.subscribers:
+                self.subscribers[symbol_str] = set()
 
-        self.subscribers[symbol_str].add(callback)
+            self.subscribers[symbol_str].add(subscriber)
 
-        if symbol_str not in self.clients:
-            await self._start_stream(symbol)
+            if symbol_str not in self.clients:
+                try:
+                    await self._start_stream(symbol)
+                except Exception:
+                    # Upstream unavailable: leave no half-registered subscriber behind
+                    await self._stop_stream(symbol_str)
+                    raise
 
     async def unsubscribe(
         self,
         symbol: WebSocketSymbol | str,
-        callback: Callable[[TickData], Awaitable[None]],
+        subscriber: TickSubscriber,
     ):
         symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
 
-        if symbol_str in self.subscribers:
-            self.subscribers[symbol_str].discard(callback)
+        async with self.locks.setdefault(symbol_str, asyncio.Lock()):
+            if symbol_str in self.subscribers:
+                self.subscribers[symbol_str].discard(subscriber)
 
-            if not self.subscribers[symbol_str]:
-                await self._stop_stream(symbol_str)
+                if not self.subscribers[symbol_str]:
+                    await self._stop_stream(symbol_str)
 
     async def _start_stream(self, symbol: WebSocketSymbol | str):
         symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
@@ -45,60 +80,170 @@ class PriceStreamManager:
         await client.connect()
         self.clients[symbol_str] = client
 
-        async def broadcast_tick(tick: TickData):
-            if symbol_str in self.subscribers:
-                await asyncio.gather(
-                    *[callback(tick) for callback in self.subscribers[symbol_str]],
-                    return_exceptions=True,
-                )
+        tracker = LiveIndicatorTracker(
+            _symbol_to_pair(symbol_str), app_config.STREAM_INDICATOR_INTERVAL
+        )
+        self.indicators[symbol_str] = tracker
+        self.seed_tasks[symbol_str] = asyncio.create_task(self._seed_indicators(tracker))
+
+        batches = 0
+
+        async def broadcast_batch(batch: TickBatch):
+            nonlocal batches
+            batches += 1
+            tick = batch.latest()
+            self.latest_ticks[symbol_str] = (tick, time.monotonic())
+            # Every tick of the message goes into the live candle before fan-out;
+            # subscribers only get the latest, which their conflation would keep anyway
+            tracker.on_prices(batch.mid, batch.timestamps)
+
+            subscribers = self.subscribers.get(symbol_str)
+            if subscribers:
+                payload = tick.model_dump(mode="json")
+                for subscriber in subscribers:
+                    subscriber.offer(symbol_str, payload)
 
         async def listen_with_reconnect():
-            """Listen with automatic reconnection on failure"""
+            """
+            Listen, reconnecting after errors and after upstream closes the
+            connection. The retry budget counts failures in a row: it starts
+            afresh once a connection delivers ticks again. When it runs out,
+            the stream is abandoned.
+            """
             max_retries = 5
             retry_count = 0
             retry_delay = 1
 
-            while retry_count < max_retries:
+            while True:
+                batches_before = batches
                 try:
-                    await client.listen(broadcast_tick)
-                    break  # Successful completion, exit loop
+                    await client.listen_batches(broadcast_batch)
+                    reason = "connection closed by upstream"
                 except Exception as e:
-                    retry_count += 1
-                    print(f"WebSocket error for {symbol_str}, attempt {retry_count}/{max_retries}: {e}")
-
-                    if retry_count < max_retries:
-                        print(f"Reconnecting in {retry_delay} seconds...")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay = min(retry_delay * 2, 30)  # Exponential backoff, max 30s
-
-                        try:
-                            await client.disconnect()
-                            await client.connect()
-                            print(f"Reconnected to {symbol_str}")
-                        except Exception as reconnect_error:
-                            print(f"Reconnection failed: {reconnect_error}")
-                    else:
-                        print(f"Max retries reached for {symbol_str}, giving up")
-                        break
+                    reason = str(e)
+
+                if batches > batches_before:
+                    retry_count = 0
+                    retry_delay = 1
+                retry_count += 1
+                print(f"WebSocket for {symbol_str} stopped ({reason}), attempt {retry_count}/{max_retries}")
+
+                if retry_count >= max_retries:
+                    print(f"Max retries reached for {symbol_str}, giving up")
+                    break
+
+                print(f"Reconnecting in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)  # Exponential backoff, max 30s
+
+                try:
+                    await client.disconnect()
+                    await client.connect()
+                    print(f"Reconnected to {symbol_str}")
+                except Exception as reconnect_error:
+                    # listen_batches tries to connect again on the next pass
+                    print(f"Reconnection failed: {reconnect_error}")
+
+            await self._abandon_stream(symbol_str, client)
 
         task = asyncio.create_task(listen_with_reconnect())
         self.tasks[symbol_str] = task
 
+    async def _seed_indicators(self, tracker: LiveIndicatorTracker):
+        """Load recent candles so indicators are ready from the first tick."""
+        try:
+            series = await get_cached_ohlc_series(
+                tracker.trading_pair,
+                tracker.interval,
+                app_config.STREAM_INDICATOR_HISTORY + 1,  # + the forming candle
+                0,
+                "desc",
+            )
+            tracker.seed(series)
+        except Exception as e:
+            print(f"Failed to seed live indicators for {tracker.trading_pair}: {e}")
+
+    async def _abandon_stream(self, symbol_str: str, client: PriceWebSocketClient):
+        """
+        Upstream is gone for good: tell the subscribers and forget the stream,
+        so the next subscribe opens a fresh upstream connection.
+        """
+        async with self.locks.setdefault(symbol_str, asyncio.Lock()):
+            if self.clients.get(symbol_str) is not client:
+                return  # already stopped (and possibly restarted) meanwhile
+            # Called from the listen task itself, which must not cancel itself
+            self.tasks.pop(symbol_str, None)
+            for subscriber in self.subscribers.get(symbol_str, ()):
+                subscriber.feed_lost(symbol_str)
+            await self._stop_stream(symbol_str)
+
     async def _stop_stream(self, symbol_str: str):
         if symbol_str in self.tasks:
             self.tasks[symbol_str].cancel()
             del self.tasks[symbol_str]
 
-        if symbol_str in self.clients:
-            await self.clients[symbol_str].disconnect()
-            del self.clients[symbol_str]
+        if symbol_str in self.seed_tasks:
+            self.seed_tasks[symbol_str].cancel()
+            del self.seed_tasks[symbol_str]
+
+        self.indicators.pop(symbol_str, None)
+        self.latest_ticks.pop(symbol_str, None)
+        self.subscribers.pop(symbol_str, None)
 
-        if symbol_str in self.subscribers:
-            del self.subscribers[symbol_str]
+        # Forget the client before awaiting its close, so a cancelled
+        # unsubscribe (client socket torn down) cannot leave a dead stream listed
+        client = self.clients.pop(symbol_str, None)
+        if client is not None:
+            await client.disconnect()
 
     async def stop_all(self):
         for symbol in list(self.clients.keys()):
             await self._stop_stream(symbol)
 
+    def is_subscribed(self, symbol: WebSocketSymbol | str, subscriber: TickSubscriber) -> bool:
+        symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
+        return subscriber in self.subscribers.get(symbol_str, ())
+
     def get_active_streams(self) -> list[str]:
         return list(self.clients.keys())
+
+    def get_subscriber_counts(self) -> Dict[str, int]:
+        return {symbol: len(subscribers) for symbol, subscribers in self.subscribers.items() if subscribers}
+
+    def get_delivery_stats(self) -> Dict[str, Any]:
+        """Totals over the current subscribers (one per connection, whatever its symbols)."""
+        subscribers = {s for symbol_subscribers in self.subscribers.values() for s in symbol_subscribers}
+        stats = [s.get_stats() for s in subscribers]
+        return {
+            "sent": sum(s["sent"] for s in stats),
+            "conflated": sum(s["conflated"] for s in stats),
+            "pending": sum(s["pending"] for s in stats),
+            "max_lag_ms": max((s["max_lag_ms"] for s in stats), default=0.0),
+            "lagging": sum(1 for s in subscribers if s.lagging_since is not None and not s.closed),
+        }
+
+    def get_latest_tick(
+        self,
+        symbol: WebSocketSymbol | str,
+        max_age: Optional[float] = None,
+    ) -> Optional[TickData]:
+        """Most recent tick of an active stream, or None if there is none that fresh."""
+        symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
+        entry = self.latest_ticks.get(symbol_str)
+        if entry is None:
+            return None
+        tick, received_at = entry
+        if max_age is not None and time.monotonic() - received_at > max_age:
+            return None
+        return tick
+
+    def get_latest_indicators(self, symbol: WebSocketSymbol | str) -> Optional[Dict[str, Any]]:
+        """Live indicator snapshot for an active stream, or None if not streaming/seeded yet."""
+        symbol_str = symbol.value if isinstance(symbol, WebSocketSymbol) else symbol
+        tracker = self.indicators.get(symbol_str)
+        if tracker is None or not tracker.ready:
+            return None
+        return tracker.snapshot()
+
+
+default_stream_manager = PriceStreamManager()
@@ -0,0 +1,146 @@
+import sys
+import warnings
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from .models import TickData
+from .series import _TS_DTYPE, _to_naive_utc
+
+
+def _parse_timestamps(values: Sequence[Any]) -> tuple[np.ndarray, bool]:
+    """datetime64[us] array (UTC wall time for offset-aware values) and whether any had an offset."""
+    if all(isinstance(value, str) for value in values):
+        # The feed's "2024-12-26 08:10:00.110" parses in one numpy call; numpy
+        # warns on offsets and fails on junk, both handled value by value below
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            try:
+                return np.array(values, dtype=_TS_DTYPE), False
+            except (ValueError, UserWarning, DeprecationWarning):
+                pass
+
+    parsed: List[datetime] = []
+    tz_aware = False
+    for value in values:
+        try:
+            timestamp = datetime.fromisoformat(value.replace(" ", "T"))
+        except (ValueError, AttributeError, TypeError):
+            # Missing or unreadable: arrival time, as UTC wall time like the
+            # feed's own timestamps (a local time would skew candle buckets)
+            parsed.append(_to_naive_utc(datetime.now(timezone.utc)))
+            continue
+        tz_aware = tz_aware or timestamp.tzinfo is not None
+        parsed.append(_to_naive_utc(timestamp))
+    return np.array(parsed, dtype=_TS_DTYPE), tz_aware
+
+
+class TickBatch:
+    """
+    Columnar ticks for one symbol, as received in one upstream message.
+
+    The feed wraps ticks in a `values` array; a batch keeps every one of
+    them as float64 bid/ask/spread arrays and `datetime64[us]` timestamps,
+    in message order. Consumers that want full fidelity (the live candle)
+    read the arrays; those that conflate (fan-out) take `latest()`.
+    Items without a usable bid/ask are left out and counted in `skipped`.
+    Instances are treated as immutable.
+    """
+
+    __slots__ = ("symbol", "timestamps", "bid", "ask", "spread", "tz_aware", "skipped")
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamps: np.ndarray,
+        bid: np.ndarray,
+        ask: np.ndarray,
+        spread: Optional[np.ndarray] = None,
+        tz_aware: bool = False,
+        skipped: int = 0,
+    ):
+        self.symbol = sys.intern(str(symbol))
+        self.timestamps = np.asarray(timestamps, dtype=_TS_DTYPE)
+        self.bid = np.asarray(bid, dtype=np.float64)
+        self.ask = np.asarray(ask, dtype=np.float64)
+        self.spread = self.ask - self.bid if spread is None else np.asarray(spread, dtype=np.float64)
+        self.tz_aware = tz_aware
+        self.skipped = skipped
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict], default_symbol: str) -> "TickBatch":
+        """
+        Build from raw feed items (bid_price/ask_price/date_time or bid/ask/timestamp).
+
+        Malformed items are skipped; raises ValueError only if none is usable.
+        """
+        if not records:
+            raise ValueError("Empty values array in message")
+
+        bids, asks, spreads, timestamps = [], [], [], []
+        symbol = None
+        skipped = 0
+        for item in records:
+            try:
+                bid = item.get("bid_price") or item.get("bid")
+                ask = item.get("ask_price") or item.get("ask")
+                bid, ask = float(bid), float(ask)
+                spread = item.get("spread")
+                spread = ask - bid if spread is None else float(spread)
+            except (AttributeError, TypeError, ValueError):
+                skipped += 1
+                continue
+
+            bids.append(bid)
+            asks.append(ask)
+            spreads.append(spread)
+            timestamps.append(item.get("date_time") or item.get("timestamp"))
+            if symbol is None:
+                symbol = item.get("symbol")
+
+        if skipped:
+            print(f"Skipped {skipped} of {len(records)} ticks without a usable bid/ask for {default_symbol}")
+        if not bids:
+            raise ValueError("Missing bid or ask price in tick data")
+
+        parsed, tz_aware = _parse_timestamps(timestamps)
+        return cls(symbol or default_symbol, parsed, bids, asks, spreads, tz_aware, skipped)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.bid + self.ask) / 2
+
+    def _datetime(self, value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if self.tz_aware else value
+
+    def latest(self) -> TickData:
+        """The last tick of the batch, which is all a conflating consumer needs."""
+        return TickData(
+            symbol=self.symbol,
+            bid=float(self.bid[-1]),
+            ask=float(self.ask[-1]),
+            timestamp=self._datetime(self.timestamps[-1].astype(datetime)),
+            spread=float(self.spread[-1]),
+        )
+
+    def to_ticks(self) -> List[TickData]:
+        return [
+            # Values were validated on the way in; skip pydantic validation
+            TickData.model_construct(
+                symbol=self.symbol,
+                bid=bid,
+                ask=ask,
+                timestamp=self._datetime(timestamp),
+                spread=spread,
+            )
+            for timestamp, bid, ask, spread in zip(
+                self.timestamps.astype(datetime).tolist(),
+                self.bid.tolist(),
+                self.ask.tolist(),
+                self.spread.tolist(),
+            )
+        ]
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from src.app_config import app_config
+
+
+class TickSubscriber:
+    """
+    One downstream consumer of PriceStreamManager, with its own writer task.
+
+    The stream manager hands ticks over with `offer`, which never waits:
+    only the latest undelivered tick of each symbol is kept (a newer tick
+    replaces it, counted as conflated), so the queue is bounded by the
+    number of symbols and a slow client only ever sees fewer, fresher ticks.
+    The writer task sends them oldest symbol first, after any control
+    messages queued with `post`.
+
+    A subscriber whose ticks keep waiting longer than `max_lag` for
+    `slow_grace` seconds, or whose send takes longer than `send_timeout`,
+    is marked slow, stops receiving and has `on_slow` called (the router
+    closes the websocket). When the upstream of a symbol is lost for good,
+    `feed_lost` calls `on_feed_lost` if given, else queues an error message
+    so the client can subscribe again. Only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        on_slow: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_feed_lost: Optional[Callable[[str], Awaitable[None]]] = None,
+        send_timeout: float = 5.0,
+        max_lag: float = 2.0,
+        slow_grace: float = 10.0,
+        max_control: int = 100,
+    ):
+        self.send = send
+        self.on_slow = on_slow
+        self.on_feed_lost = on_feed_lost
+        self.send_timeout = send_timeout
+        self.max_lag = max_lag
+        self.slow_grace = slow_grace
+        self.max_control = max_control
+
+        # symbol -> (latest undelivered tick, monotonic time the oldest undelivered one arrived)
+        self.pending: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.control: Deque[Dict[str, Any]] = deque()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.close_task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.slow = False
+        self.lagging_since: Optional[float] = None
+
+        self.sent = 0
+        self.conflated = 0
+        self.last_lag = 0.0
+        self.max_lag_seen = 0.0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._write())
+
+    async def stop(self):
+        self.closed = True
+        if self.task is not None and self.task is not asyncio.current_task():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def offer(self, symbol: str, tick: Dict[str, Any]):
+        """Queue a serialised tick, replacing any undelivered one for the symbol."""
+        if self.closed:
+            return
+        entry = self.pending.get(symbol)
+        if entry is None:
+            self.pending[symbol] = (tick, time.monotonic())
+        else:
+            # Keeps its place and the arrival time of the tick it replaces
+            self.pending[symbol] = (tick, entry[1])
+            self.conflated += 1
+        self.wakeup.set()
+
+    def discard(self, symbol: str):
+        """Drop the undelivered tick of a symbol the consumer no longer follows."""
+        self.pending.pop(symbol, None)
+
+    def feed_lost(self, symbol: str):
+        """The stream manager gave up on `symbol`; this subscriber no longer follows it."""
+        self.discard(symbol)
+        if self.closed:
+            return
+        if self.on_feed_lost is not None:
+            self.close_task = asyncio.create_task(self.on_feed_lost(symbol))
+        else:
+            self.post({"error": f"Price feed lost for {symbol}, subscribe again to retry", "symbol": symbol})
+
+    def post(self, message: Dict[str, Any]):
+        """Queue a control message (status, error); these are never conflated."""
+        if self.closed:
+            return
+        if len(self.control) >= self.max_control:
+            self._give_up(f"more than {self.max_control} unsent control messages")
+            return
+        self.control.append(message)
+        self.wakeup.set()
+
+    async def _write(self):
+        while not self.closed:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+
+            while not self.closed and (self.control or self.pending):
+                if self.control:
+                    message, queued_at = self.control.popleft(), None
+                else:
+                    _, (message, queued_at) = self.pending.popitem(last=False)
+
+                try:
+                    await asyncio.wait_for(self.send(message), self.send_timeout)
+                except asyncio.TimeoutError:
+                    self._give_up(f"send took longer than {self.send_timeout}s")
+                    return
+                except Exception:
+                    # Socket already gone; the connection handler cleans up
+                    self.closed = True
+                    return
+
+                if queued_at is not None:
+                    self._record_delivery(queued_at)
+
+    def _record_delivery(self, queued_at: float):
+        now = time.monotonic()
+        lag = now - queued_at
+        self.sent += 1
+        self.last_lag = lag
+        self.max_lag_seen = max(self.max_lag_seen, lag)
+
+        if lag <= self.max_lag:
+            self.lagging_since = None
+        elif self.lagging_since is None:
+            self.lagging_since = now
+        elif now - self.lagging_since > self.slow_grace:
+            self._give_up(f"ticks lagging more than {self.max_lag}s for over {self.slow_grace}s")
+
+    def _give_up(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self.slow = True
+        self.pending.clear()
+        self.control.clear()
+        # Wake the writer so it sees `closed` and exits
+        self.wakeup.set()
+        print(f"Disconnecting slow tick subscriber: {reason}")
+        if self.on_slow is not None:
+            self.close_task = asyncio.create_task(self.on_slow(reason))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "conflated": self.conflated,
+            "pending": len(self.pending) + len(self.control),
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag_seen * 1000, 3),
+            "slow": self.slow,
+        }
+
+
+def create_tick_subscriber(
+    send: Callable[[Dict[str, Any]], Awaitable[None]],
+    on_slow: Optional[Callable[[str], Awaitable[None]]] = None,
+    on_feed_lost: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> TickSubscriber:
+    """TickSubscriber with the configured send timeout and lag limits."""
+    return TickSubscriber(
+        send,
+        on_slow,
+        on_feed_lost,
+        send_timeout=app_config.STREAM_SEND_TIMEOUT,
+        max_lag=app_config.STREAM_MAX_LAG,
+        slow_grace=app_config.STREAM_SLOW_GRACE,
+    )
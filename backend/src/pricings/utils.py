@@ -1,67 +1,62 @@
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Sequence
+from datetime import datetime, timedelta, tzinfo
+import numpy as np
+from .analytics import compute_price_stats, date_range_indices, select
 from .models import OHLCData, TickData
+from .resample import resample_series
+from .series import OHLCSeries, as_series
+
+# The helpers below accept either a list of candles or an OHLCSeries. When
+# several statistics are needed for the same window, call
+# `analytics.compute_price_stats` once instead.
 
 
 def filter_ohlc_by_date_range(
-    data: List[OHLCData],
+    data: OHLCSeries | Sequence[OHLCData],
     start_date: datetime,
     end_date: datetime,
-) -> List[OHLCData]:
-    return [
-        item for item in data
-        if start_date <= item.timestamp <= end_date
-    ]
+) -> OHLCSeries | List[OHLCData]:
+    series = as_series(data)
+    indices = date_range_indices(series, start_date, end_date)
+    if isinstance(data, OHLCSeries):
+        return series[indices]
+    return select(data, indices)
 
 
-def get_latest_ohlc(data: List[OHLCData]) -> OHLCData:
-    if not data:
+def get_latest_ohlc(data: OHLCSeries | Sequence[OHLCData]) -> OHLCData:
+    if not len(data):
         raise ValueError("No OHLC data available")
-    return max(data, key=lambda x: x.timestamp)
+    if isinstance(data, OHLCSeries):
+        return data[int(np.argmax(data.timestamps))].to_ohlc()[0]
+    return data[int(np.argmax(as_series(data).timestamps))]
 
 
-def get_price_change(data: List[OHLCData]) -> float:
-    if len(data) < 2:
-        return 0.0
-    sorted_data = sorted(data, key=lambda x: x.timestamp)
-    return sorted_data[-1].close - sorted_data[0].close
+def get_price_change(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    return compute_price_stats(data)["change"]
 
 
-def get_price_change_percentage(data: List[OHLCData]) -> float:
-    if len(data) < 2:
-        return 0.0
-    sorted_data = sorted(data, key=lambda x: x.timestamp)
-    initial_price = sorted_data[0].close
-    final_price = sorted_data[-1].close
-    return ((final_price - initial_price) / initial_price) * 100
+def get_price_change_percentage(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    return compute_price_stats(data)["change_percent"]
 
 
-def calculate_average_price(data: List[OHLCData]) -> float:
-    if not data:
-        return 0.0
-    return sum(item.close for item in data) / len(data)
+def calculate_average_price(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    return compute_price_stats(data)["average"]
 
 
-def get_highest_price(data: List[OHLCData]) -> float:
-    if not data:
+def get_highest_price(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    if not len(data):
         return 0.0
-    return max(item.high for item in data)
+    return float(as_series(data).high.max())
 
 
-def get_lowest_price(data: List[OHLCData]) -> float:
-    if not data:
+def get_lowest_price(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    if not len(data):
         return 0.0
-    return min(item.low for item in data)
-
+    return float(as_series(data).low.min())
 
-def calculate_volatility(data: List[OHLCData]) -> float:
-    if len(data) < 2:
-        return 0.0
 
-    prices = [item.close for item in data]
-    mean_price = sum(prices) / len(prices)
-    variance = sum((price - mean_price) ** 2 for price in prices) / len(prices)
-    return variance ** 0.5
+def calculate_volatility(data: OHLCSeries | Sequence[OHLCData]) -> float:
+    return compute_price_stats(data)["volatility"]
 
 
 def calculate_tick_spread_percentage(tick: TickData) -> float:
@@ -75,39 +70,20 @@ def get_mid_price(tick: TickData) -> float:
 
 
 def resample_ohlc(
-    data: List[OHLCData],
+    data: OHLCSeries | Sequence[OHLCData],
     target_interval_minutes: int,
-) -> List[OHLCData]:
-    if not data:
-        return []
-
-    sorted_data = sorted(data, key=lambda x: x.timestamp)
-    resampled = []
-    current_bucket = []
-    bucket_start = sorted_data[0].timestamp
-
-    for item in sorted_data:
-        if (item.timestamp - bucket_start).total_seconds() / 60 >= target_interval_minutes:
-            if current_bucket:
-                resampled.append(_aggregate_ohlc_bucket(current_bucket))
-            current_bucket = [item]
-            bucket_start = item.timestamp
-        else:
-            current_bucket.append(item)
-
-    if current_bucket:
-        resampled.append(_aggregate_ohlc_bucket(current_bucket))
-
-    return resampled
-
-
-def _aggregate_ohlc_bucket(bucket: List[OHLCData]) -> OHLCData:
-    return OHLCData(
-        timestamp=bucket[0].timestamp,
-        open=bucket[0].open,
-        high=max(item.high for item in bucket),
-        low=min(item.low for item in bucket),
-        close=bucket[-1].close,
-        volume=sum(item.volume for item in bucket if item.volume) if any(item.volume for item in bucket) else None,
-        trading_pair=bucket[0].trading_pair,
+    tz: str | tzinfo | None = "UTC",
+    session_start: timedelta = timedelta(0),
+    fill_gaps: bool = False,
+) -> OHLCSeries | List[OHLCData]:
+    """Clock-aligned resampling; see `resample.resample_series`."""
+    resampled = resample_series(
+        as_series(data),
+        target_interval_minutes * 60,
+        tz=tz,
+        session_start=session_start,
+        fill_gaps=fill_gaps,
     )
+    if isinstance(data, OHLCSeries):
+        return resampled
+    return resampled.to_ohlc()
@@ -1,10 +1,10 @@
 import asyncio
 import json
 from typing import Callable, Optional, Awaitable
-from datetime import datetime
 import websockets
 from websockets.client import WebSocketClientProtocol
 from .models import TickData, WebSocketSymbol
+from .tick_batch import TickBatch
 
 
 BASE_WS_URL = "wss://gpcintegral.southeastasia.cloudapp.azure.com"
@@ -44,7 +44,8 @@ class PriceWebSocketClient:
             await self.websocket.close()
             self.websocket = None
 
-    async def receive_tick(self) -> TickData:
+    async def receive_batch(self) -> TickBatch:
+        """Every tick of the next upstream message, parsed once into columns."""
         if not self.websocket:
             raise RuntimeError("WebSocket not connected")
 
@@ -67,84 +68,28 @@ class PriceWebSocketClient:
 
         # Handle wrapped format with 'values' array
         if "values" in data and isinstance(data["values"], list):
-            if not data["values"]:
-                raise ValueError("Empty values array in message")
-
-            # Get the latest tick (last item in array)
-            latest_tick = data["values"][-1]
-            print(f"Extracted latest tick from values array: {latest_tick}")
-
-            # Map field names: bid_price -> bid, ask_price -> ask, date_time -> timestamp
-            bid = latest_tick.get("bid_price") or latest_tick.get("bid")
-            ask = latest_tick.get("ask_price") or latest_tick.get("ask")
-            timestamp_str = latest_tick.get("date_time") or latest_tick.get("timestamp")
-
-            if bid is None or ask is None:
-                print(f"Missing bid/ask in tick: {latest_tick.keys()}")
-                raise ValueError("Missing bid or ask price in tick data")
-
-            # Parse timestamp
-            if timestamp_str:
-                try:
-                    # Handle format: "2024-12-26 08:10:00.110"
-                    timestamp = datetime.fromisoformat(timestamp_str.replace(" ", "T"))
-                except (ValueError, AttributeError):
-                    timestamp = datetime.now()
-            else:
-                timestamp = datetime.now()
-
-            spread = float(ask) - float(bid)
-
-            return TickData(
-                symbol=latest_tick.get("symbol", self.symbol.value),
-                bid=float(bid),
-                ask=float(ask),
-                timestamp=timestamp,
-                spread=spread,
-            )
+            return TickBatch.from_records(data["values"], self.symbol.value)
 
         # Handle direct format (legacy)
         elif "bid" in data or "ask" in data or "bid_price" in data or "ask_price" in data:
-            bid = data.get("bid_price") or data.get("bid")
-            ask = data.get("ask_price") or data.get("ask")
-
-            if bid is None or ask is None:
-                print(f"Missing required fields in message: {data.keys()}")
-                raise ValueError(f"Message missing bid or ask fields")
-
-            timestamp_str = data.get("date_time") or data.get("timestamp")
-            if timestamp_str:
-                try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace(" ", "T"))
-                except (ValueError, AttributeError):
-                    timestamp = datetime.now()
-            else:
-                timestamp = datetime.now()
-
-            spread = data.get("spread")
-            if spread is None:
-                spread = float(ask) - float(bid)
-
-            return TickData(
-                symbol=data.get("symbol", self.symbol.value),
-                bid=float(bid),
-                ask=float(ask),
-                timestamp=timestamp,
-                spread=float(spread) if spread is not None else None,
-            )
+            return TickBatch.from_records([data], self.symbol.value)
         else:
             print(f"Unknown message format. Keys: {data.keys()}")
             raise ValueError(f"Unknown message format: {data.keys()}")
 
-    async def listen(self, callback: Callable[[TickData], Awaitable[None]]):
+    async def receive_tick(self) -> TickData:
+        """Latest tick of the next upstream message (earlier ticks in it are skipped)."""
+        return (await self.receive_batch()).latest()
+
+    async def listen_batches(self, callback: Callable[[TickBatch], Awaitable[None]]):
         if not self.websocket:
             await self.connect()
 
         try:
             print(f"Starting to listen for ticks on {self.symbol.value}")
             while self.running:
-                tick = await self.receive_tick()
-                await callback(tick)
+                batch = await self.receive_batch()
+                await callback(batch)
         except websockets.exceptions.ConnectionClosed as e:
             print(f"WebSocket connection closed for {self.symbol.value}: {e}")
             self.running = False
@@ -155,6 +100,13 @@ class PriceWebSocketClient:
             self.running = False
             raise e
 
+    async def listen(self, callback: Callable[[TickData], Awaitable[None]]):
+        """Like listen_batches, with only the latest tick of each message."""
+        async def latest_of_batch(batch: TickBatch):
+            await callback(batch.latest())
+
+        await self.listen_batches(latest_of_batch)
+
     async def listen_sync_callback(self, callback: Callable[[TickData], None]):
         async def async_wrapper(tick: TickData):
             callback(tick)
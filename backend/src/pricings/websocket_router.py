@@ -1,102 +1,166 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import json
-from .price_client import get_ohlc_data
-from .models import WebSocketSymbol, TickData, TradingPair
+from typing import Awaitable, Callable, Set
+from .models import WebSocketSymbol
+from .stream_manager import default_stream_manager
+from .tick_subscriber import TickSubscriber, create_tick_subscriber
 
 router = APIRouter(prefix="/api/pricing/ws", tags=["Pricing WebSocket"])
 
-_SYMBOL_TO_TRADING_PAIR = {
-    "XAU/USD": TradingPair.XAU_USD,
-    "XAG/USD": TradingPair.XAG_USD,
-    "XPT/USD": TradingPair.XPT_USD,
-    "USD/SGD": TradingPair.USD_SGD,
-    "USD/MYR": TradingPair.USD_MYR,
-}
-
-
-async def _fetch_tick(symbol: str) -> TickData | None:
-    trading_pair = _SYMBOL_TO_TRADING_PAIR.get(symbol)
-    if not trading_pair:
-        return None
-
-    data = await get_ohlc_data(trading_pair, interval=3600, limit=1, sort="desc")
-    if not data:
-        return None
-
-    latest = data[0]
-    return TickData(
-        symbol=symbol,
-        bid=latest.close,
-        ask=latest.close,
-        timestamp=latest.timestamp,
-        spread=0.0,
-    )
+# Browser connections currently open on this router
+_connections: Set[WebSocket] = set()
+# Connections closed for falling behind the tick stream
+_slow_disconnects = 0
+
+# 1013 "Try Again Later": the client may reconnect once it can keep up,
+# or once the upstream feed is back
+_TRY_AGAIN_LATER_CLOSE_CODE = 1013
+
+
+def _parse_symbol(symbol: str) -> WebSocketSymbol:
+    """Accept "XAU/USD" or "ticks:XAU/USD"; raises ValueError for unknown symbols."""
+    return WebSocketSymbol(symbol if symbol.startswith("ticks:") else f"ticks:{symbol}")
+
+
+def _slow_consumer_closer(websocket: WebSocket) -> Callable[[str], Awaitable[None]]:
+    async def close(reason: str):
+        global _slow_disconnects
+        _slow_disconnects += 1
+        try:
+            await websocket.close(code=_TRY_AGAIN_LATER_CLOSE_CODE, reason="Too slow to keep up with the price feed")
+        except Exception:
+            pass  # Already closed by the client
+
+    return close
+
+
+def _feed_lost_closer(websocket: WebSocket) -> Callable[[str], Awaitable[None]]:
+    async def close(symbol: str):
+        try:
+            await websocket.close(code=_TRY_AGAIN_LATER_CLOSE_CODE, reason=f"Price feed lost for {symbol}")
+        except Exception:
+            pass  # Already closed by the client
+
+    return close
+
+
+def _offer_latest(subscriber: TickSubscriber, symbol: WebSocketSymbol):
+    # New subscribers to a running stream get the last tick instead of waiting for the next
+    tick = default_stream_manager.get_latest_tick(symbol)
+    if tick:
+        subscriber.offer(symbol.value, tick.model_dump(mode="json"))
 
 
-@router.websocket("/ticks/{symbol}")
+@router.websocket("/ticks/{symbol:path}")
 async def websocket_price_feed(websocket: WebSocket, symbol: str):
     await websocket.accept()
 
     try:
-        WebSocketSymbol(f"ticks:{symbol}")
+        ws_symbol = _parse_symbol(symbol)
     except ValueError:
         await websocket.send_json({"error": f"Invalid symbol: {symbol}"})
         await websocket.close()
         return
 
+    # Everything sent after this point goes through the subscriber's writer task
+    subscriber = create_tick_subscriber(
+        websocket.send_json, _slow_consumer_closer(websocket), _feed_lost_closer(websocket)
+    )
+    _connections.add(websocket)
     try:
-        tick = await _fetch_tick(symbol)
-        if tick:
-            await websocket.send_json(tick.model_dump(mode="json"))
-        else:
-            await websocket.send_json({"error": f"No price data for {symbol}"})
-    except Exception as e:
-        await websocket.send_json({"error": str(e)})
-
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
+        try:
+            await default_stream_manager.subscribe(ws_symbol, subscriber)
+        except Exception as e:
+            await websocket.send_json({"error": f"Price feed unavailable for {symbol}: {e}"})
+            await websocket.close()
+            return
+
+        subscriber.start()
+        try:
+            _offer_latest(subscriber, ws_symbol)
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await default_stream_manager.unsubscribe(ws_symbol, subscriber)
+            await subscriber.stop()
+    finally:
+        _connections.discard(websocket)
 
 
 @router.websocket("/multi")
 async def websocket_multi_price_feed(websocket: WebSocket):
     await websocket.accept()
 
+    subscriber = create_tick_subscriber(websocket.send_json, _slow_consumer_closer(websocket))
+    subscriptions: Set[WebSocketSymbol] = set()
+    _connections.add(websocket)
+    subscriber.start()
+
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                subscriber.post({"error": "Invalid JSON"})
+                continue
+            if not isinstance(message, dict):
+                subscriber.post({"error": "Expected a JSON object"})
+                continue
 
             action = message.get("action")
             symbol = message.get("symbol")
 
             if not symbol:
-                await websocket.send_json({"error": "Symbol is required"})
+                subscriber.post({"error": "Symbol is required"})
+                continue
+
+            try:
+                ws_symbol = _parse_symbol(symbol)
+            except ValueError:
+                subscriber.post({"error": f"Invalid symbol: {symbol}"})
                 continue
 
             if action == "subscribe":
-                try:
-                    tick = await _fetch_tick(symbol)
-                    if tick:
-                        await websocket.send_json(tick.model_dump(mode="json"))
-                    else:
-                        await websocket.send_json({"error": f"No price data for {symbol}"})
-                except Exception as e:
-                    await websocket.send_json({"error": str(e)})
-                await websocket.send_json({"status": "subscribed", "symbol": symbol})
+                # Also after the manager gave up on a lost feed, which starts a fresh one
+                if not default_stream_manager.is_subscribed(ws_symbol, subscriber):
+                    try:
+                        await default_stream_manager.subscribe(ws_symbol, subscriber)
+                    except Exception as e:
+                        subscriber.post({"error": f"Price feed unavailable for {symbol}: {e}"})
+                        continue
+                    subscriptions.add(ws_symbol)
+                subscriber.post({"status": "subscribed", "symbol": symbol})
+                _offer_latest(subscriber, ws_symbol)
 
             elif action == "unsubscribe":
-                await websocket.send_json({"status": "unsubscribed", "symbol": symbol})
+                if ws_symbol in subscriptions:
+                    subscriptions.discard(ws_symbol)
+                    await default_stream_manager.unsubscribe(ws_symbol, subscriber)
+                    # Not offered any more; nothing queued may follow the reply
+                    subscriber.discard(ws_symbol.value)
+                subscriber.post({"status": "unsubscribed", "symbol": symbol})
 
             else:
-                await websocket.send_json({"error": f"Unknown action: {action}"})
+                subscriber.post({"error": f"Unknown action: {action}"})
 
     except WebSocketDisconnect:
         pass
+    finally:
+        _connections.discard(websocket)
+        for ws_symbol in subscriptions:
+            await default_stream_manager.unsubscribe(ws_symbol, subscriber)
+        await subscriber.stop()
 
 
 @router.get("/active-streams")
 async def get_active_streams():
-    return {"active_streams": [], "connection_count": 0}
+    return {
+        "active_streams": default_stream_manager.get_active_streams(),
+        "subscribers": default_stream_manager.get_subscriber_counts(),
+        "connection_count": len(_connections),
+        "delivery": default_stream_manager.get_delivery_stats(),
+        "slow_disconnects": _slow_disconnects,
+    }
@@ -1,20 +1,14 @@
 import asyncio
 import json
 from pydantic_ai import RunContext
-from src.pricings.price_client import get_ohlc_data
+from src.pricings.cache import get_cached_ohlc_data, get_cached_ohlc_series
 from src.pricings.models import TradingPair
 from src.pricings.batch_operations import (
     get_all_metals_ohlc,
     get_all_trading_pairs_ohlc,
     get_market_summary,
 )
-from src.pricings.utils import (
-    get_price_change,
-    get_price_change_percentage,
-    get_highest_price,
-    get_lowest_price,
-    calculate_volatility,
-)
+from src.pricings.analytics import compute_price_stats, moving_average
 
 VALID_PAIRS = ", ".join([p.value for p in TradingPair])
 
@@ -44,7 +38,7 @@ async def get_current_price(
     except ValueError:
         return f"Invalid trading pair '{trading_pair}'. Valid options: {VALID_PAIRS}"
 
-    data = await get_ohlc_data(pair, interval=3600, limit=1, sort="desc")
+    data = await get_cached_ohlc_data(pair, interval=3600, limit=1, sort="desc")
     if not data:
         return f"No price data available for {trading_pair}"
 
@@ -79,13 +73,13 @@ async def get_market_summary_tool(
         return f"Invalid trading pair '{trading_pair}'. Valid options: {VALID_PAIRS}"
 
     interval = INTERVAL_MAP.get(timeframe, 3600)
-    data = await get_ohlc_data(pair, interval=interval, limit=limit, sort="desc")
+    data = await get_cached_ohlc_series(pair, interval=interval, limit=limit, sort="desc")
 
     if not data:
         return f"No data available for {trading_pair}"
 
     summary = get_market_summary(data)
-    volatility = calculate_volatility(data)
+    volatility = compute_price_stats(data)["volatility"]
 
     return (
         f"Market Summary — {pair.value.upper()} ({timeframe} × {limit} candles):\n"
@@ -120,7 +114,7 @@ async def get_price_history(
         return f"Invalid trading pair '{trading_pair}'. Valid options: {VALID_PAIRS}"
 
     interval = INTERVAL_MAP.get(timeframe, 3600)
-    data = await get_ohlc_data(pair, interval=interval, limit=limit, sort="desc")
+    data = await get_cached_ohlc_data(pair, interval=interval, limit=limit, sort="desc")
 
     if not data:
         return f"No historical data available for {trading_pair}"
@@ -159,26 +153,27 @@ async def analyze_price_trend(
         return f"Invalid trading pair '{trading_pair}'. Valid options: {VALID_PAIRS}"
 
     interval = INTERVAL_MAP.get(timeframe, 3600)
-    data = await get_ohlc_data(pair, interval=interval, limit=limit, sort="asc")
+    data = await get_cached_ohlc_series(pair, interval=interval, limit=limit, sort="asc")
 
     if len(data) < 2:
         return f"Not enough data for trend analysis on {trading_pair}"
 
-    closes = [d.close for d in data]
-    current = closes[-1]
+    closes = data.close
+    current = float(closes[-1])
 
-    sma_10 = sum(closes[-10:]) / min(10, len(closes))
-    sma_20 = sum(closes[-20:]) / min(20, len(closes))
-    sma_50 = sum(closes) / len(closes)
+    sma_10 = moving_average(closes, 10)
+    sma_20 = moving_average(closes, 20)
+    sma_50 = moving_average(closes, len(closes))
 
     momentum = "Bullish" if current > sma_20 else "Bearish"
     trend_direction = "Up" if closes[-1] > closes[-2] else "Down"
 
-    change = get_price_change(data)
-    change_pct = get_price_change_percentage(data)
-    volatility = calculate_volatility(data)
-    highest = get_highest_price(data)
-    lowest = get_lowest_price(data)
+    stats = compute_price_stats(data)
+    change = stats["change"]
+    change_pct = stats["change_percent"]
+    volatility = stats["volatility"]
+    highest = stats["high"]
+    lowest = stats["low"]
 
     def _rel(val: float) -> str:
         return "above" if current > val else "below"
@@ -264,7 +259,7 @@ async def compare_trading_pairs_tool(
 
     interval = INTERVAL_MAP.get(timeframe, 3600)
     results = await asyncio.gather(
-        *[get_ohlc_data(pair, interval=interval, limit=limit, sort="desc") for pair in pairs],
+        *[get_cached_ohlc_series(pair, interval=interval, limit=limit, sort="desc") for pair in pairs],
         return_exceptions=True,
     )
 
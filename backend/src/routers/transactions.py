@@ -1,13 +1,22 @@
+import logging
 from collections import defaultdict
 from datetime import date
-from typing import Optional
+from typing import Literal, Optional
 
-import requests
-from fastapi import APIRouter, Depends, HTTPException
+import psycopg2
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
 from src.app_config import app_config
-from src.db import get_db
+from src import db
+from src.account_registry import default_account_registry
+from src.balance_checkpoints import default_checkpointer
+from src.balance_reconciliation import default_reconciler
+from src.db import default_db_stats, run_db
+from src.idempotency import default_idempotency_cache
+from src.pricings.spot_price import default_spot_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
@@ -34,6 +43,36 @@ class SellGoldResponse(BaseModel):
     transaction_id: str
 
 
+class BatchTrade(BaseModel):
+    side: Literal["buy", "sell"]
+    gold_grams: float
+    price_usd_per_oz: float
+    value_date: Optional[date] = None
+    reference: Optional[str] = None
+
+
+class BatchTradeRequest(BaseModel):
+    trades: list[BatchTrade]
+    # True: one transaction, any failure rolls back the whole batch.
+    # False: committed in chunks, each trade in its own savepoint; failed
+    # trades are reported and skipped.
+    atomic: bool = True
+
+
+class BatchTradeResult(BaseModel):
+    index: int
+    transaction_id: Optional[str] = None
+    error: Optional[str] = None
+    # True only once the trade's transaction has committed
+    committed: bool = False
+
+
+class BatchTradeResponse(BaseModel):
+    executed: int
+    failed: int
+    results: list[BatchTradeResult]
+
+
 class AssetBalance(BaseModel):
     asset: str
     balance: float
@@ -46,103 +85,215 @@ class AccountBalance(BaseModel):
 
 class GoldPriceResponse(BaseModel):
     price_usd_per_oz: float
+    source: str = "goldapi"
 
 
 @router.get("/gold-price", response_model=GoldPriceResponse)
 async def get_gold_price():
-    if not app_config.GOLDIO:
-        raise HTTPException(500, detail="GOLDIO API key is not configured")
     try:
-        res = requests.get(
-            "https://www.goldapi.io/api/XAU/USD",
-            headers={"x-access-token": app_config.GOLDIO},
-            timeout=10,
-        )
-        res.raise_for_status()
-        return GoldPriceResponse(price_usd_per_oz=res.json()["price"])
-    except requests.RequestException as e:
+        quote = await default_spot_service.get_quote()
+        return GoldPriceResponse(price_usd_per_oz=quote.price, source=quote.source)
+    except Exception as e:
         raise HTTPException(502, detail=f"Failed to fetch gold price: {e}")
 
 
 def _resolve_account(conn, name: str) -> str:
+    return default_account_registry.resolve(conn, name)
+
+
+def _resolve_assets(conn) -> tuple[str, str]:
+    return (
+        default_account_registry.resolve_asset(conn, "USD"),
+        default_account_registry.resolve_asset(conn, "XAU"),
+    )
+
+
+def _execute_trade(
+    cur,
+    buyer_id: str,
+    seller_id: str,
+    asset_ids: tuple[str, str],
+    req,
+    trade_type: str,
+    idempotency_key: Optional[str] = None,
+) -> str:
+    usd_id, xau_id = asset_ids
+    cur.execute(
+        "SELECT create_gold_trade(%s::UUID, %s::UUID, %s::UUID, %s::UUID, %s::NUMERIC, %s::NUMERIC, %s::DATE, "
+        "%s::TEXT, %s::TEXT, NULL::UUID, %s::TEXT)",
+        (
+            buyer_id,
+            seller_id,
+            usd_id,
+            xau_id,
+            req.gold_grams,
+            req.price_usd_per_oz,
+            req.value_date or date.today(),
+            trade_type,
+            req.reference,
+            idempotency_key,
+        ),
+    )
+    return str(cur.fetchone()[0])
+
+
+def _create_trade(
+    conn, buyer_name: str, seller_name: str, req, trade_type: str, idempotency_key: Optional[str] = None
+) -> str:
+    buyer_id = _resolve_account(conn, buyer_name)
+    seller_id = _resolve_account(conn, seller_name)
+    asset_ids = _resolve_assets(conn)
+
     with conn.cursor() as cur:
-        cur.execute("SELECT id FROM accounts WHERE name = %s", (name,))
-        row = cur.fetchone()
-    if not row:
-        raise HTTPException(404, detail=f"Account '{name}' not found")
-    return str(row[0])
+        return _execute_trade(cur, buyer_id, seller_id, asset_ids, req, trade_type, idempotency_key)
 
 
-@router.post("/buy", response_model=BuyGoldResponse)
-async def mc_buy_gold(req: BuyGoldRequest, conn=Depends(get_db)):
-    try:
-        buyer_id = _resolve_account(conn, "MC")
-        seller_id = _resolve_account(conn, "House Admin")
-
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT create_gold_trade(%s::UUID, %s::UUID, %s::NUMERIC, %s::NUMERIC, %s::DATE, %s::TEXT, %s::TEXT, NULL::UUID)",
-                (
-                    buyer_id,
-                    seller_id,
-                    req.gold_grams,
-                    req.price_usd_per_oz,
-                    req.value_date or date.today(),
-                    "buy",
-                    req.reference,
-                ),
-            )
-            txn_id = cur.fetchone()[0]
-
-        return BuyGoldResponse(transaction_id=str(txn_id))
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(400, detail=str(e))
+# Savepoint mode runs one transaction per this many trades: past 64
+# savepoints in one transaction Postgres overflows its subtransaction cache
+# and every trade gets slower. Trades are independent in this mode.
+_SAVEPOINTS_PER_COMMIT = 50
 
 
-@router.post("/sell", response_model=SellGoldResponse)
-async def mc_sell_gold(req: SellGoldRequest, conn=Depends(get_db)):
-    try:
-        seller_id = _resolve_account(conn, "MC")
-        buyer_id = _resolve_account(conn, "House Admin")
-
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT create_gold_trade(%s::UUID, %s::UUID, %s::NUMERIC, %s::NUMERIC, %s::DATE, %s::TEXT, %s::TEXT, NULL::UUID)",
-                (
-                    buyer_id,
-                    seller_id,
-                    req.gold_grams,
-                    req.price_usd_per_oz,
-                    req.value_date or date.today(),
-                    "sell",
-                    req.reference,
-                ),
-            )
-            txn_id = cur.fetchone()[0]
-
-        return SellGoldResponse(transaction_id=str(txn_id))
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(400, detail=str(e))
+def _create_trades(
+    conn, trades: list[BatchTrade], atomic: bool, first_index: int = 0
+) -> list[BatchTradeResult]:
+    """Book `trades` in the caller's transaction; indexes in the results start at `first_index`."""
+    mc_id = _resolve_account(conn, "MC")
+    house_id = _resolve_account(conn, "House Admin")
+    asset_ids = _resolve_assets(conn)
 
+    results = []
+    with conn.cursor() as cur:
+        for index, trade in enumerate(trades, first_index):
+            buyer_id, seller_id = (mc_id, house_id) if trade.side == "buy" else (house_id, mc_id)
+            if atomic:
+                try:
+                    txn_id = _execute_trade(cur, buyer_id, seller_id, asset_ids, trade, trade.side)
+                except psycopg2.Error as e:
+                    # run_db rolls back the trades already executed
+                    raise HTTPException(400, detail=f"Trade {index} failed, batch rolled back: {e}")
+                results.append(BatchTradeResult(index=index, transaction_id=txn_id))
+            else:
+                cur.execute("SAVEPOINT batch_trade")
+                try:
+                    txn_id = _execute_trade(cur, buyer_id, seller_id, asset_ids, trade, trade.side)
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT batch_trade")
+                    results.append(BatchTradeResult(index=index, error=str(e).strip()))
+                else:
+                    cur.execute("RELEASE SAVEPOINT batch_trade")
+                    results.append(BatchTradeResult(index=index, transaction_id=txn_id))
+    return results
+
+
+async def _create_trade_chunks(trades: list[BatchTrade]) -> list[BatchTradeResult]:
+    """
+    Savepoint mode: one transaction per chunk of trades. A chunk that fails
+    as a whole (lost connection, failed rollback to a savepoint, any other
+    error) is reported trade by trade as not booked and the next chunk still
+    runs, so the results always say exactly which trades committed.
+    """
+    results = []
+    for start in range(0, len(trades), _SAVEPOINTS_PER_COMMIT):
+        chunk = trades[start:start + _SAVEPOINTS_PER_COMMIT]
+        try:
+            chunk_results = await run_db(_create_trades, chunk, False, start)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e).strip()
+            logger.error(f"Batch trades {start}-{start + len(chunk) - 1} rolled back: {detail}")
+            chunk_results = [
+                BatchTradeResult(
+                    index=index,
+                    error=f"Not booked, trades {start}-{start + len(chunk) - 1} rolled back together: {detail}",
+                )
+                for index in range(start, start + len(chunk))
+            ]
+        else:
+            for result in chunk_results:
+                result.committed = result.transaction_id is not None
+        results.extend(chunk_results)
+    return results
+
+
+async def _submit_trade(buyer_name: str, seller_name: str, req, trade_type: str, idempotency_key: Optional[str]) -> str:
+    """
+    Book one trade. With an idempotency key, a retry returns the original
+    transaction id: from the in-memory cache if the key is recent (or the
+    original is still in flight), otherwise create_gold_trade finds it by the
+    unique index before locking anything.
+    """
+
+    async def book() -> str:
+        try:
+            return await run_db(_create_trade, buyer_name, seller_name, req, trade_type, idempotency_key)
+        except HTTPException:
+            raise
+        except psycopg2.errors.UniqueViolation as e:
+            raise HTTPException(409, detail=e.diag.message_primary or str(e))
+        except Exception as e:
+            raise HTTPException(400, detail=str(e))
+
+    if idempotency_key is None:
+        return await book()
+    fingerprint = (trade_type, req.gold_grams, req.price_usd_per_oz)
+    return await default_idempotency_cache.run(idempotency_key, fingerprint, book)
 
-@router.get("/balances", response_model=list[AccountBalance])
-async def get_all_balances(conn=Depends(get_db)):
+
+@router.post("/buy", response_model=BuyGoldResponse)
+async def mc_buy_gold(
+    req: BuyGoldRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+):
+    txn_id = await _submit_trade("MC", "House Admin", req, "buy", idempotency_key)
+    return BuyGoldResponse(transaction_id=txn_id)
+
+
+@router.post("/sell", response_model=SellGoldResponse)
+async def mc_sell_gold(
+    req: SellGoldRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+):
+    txn_id = await _submit_trade("House Admin", "MC", req, "sell", idempotency_key)
+    return SellGoldResponse(transaction_id=txn_id)
+
+
+@router.post("/batch", response_model=BatchTradeResponse)
+async def batch_trades(req: BatchTradeRequest):
+    """
+    Execute many MC buys/sells. Atomic batches run in one transaction;
+    otherwise trades are committed in chunks and every result says whether
+    its trade committed.
+    """
+    if not req.trades:
+        raise HTTPException(400, detail="No trades in batch")
+    if len(req.trades) > app_config.BATCH_MAX_TRADES:
+        raise HTTPException(400, detail=f"At most {app_config.BATCH_MAX_TRADES} trades per batch")
+
+    if req.atomic:
+        results = await run_db(_create_trades, req.trades, True)
+        for result in results:
+            result.committed = True
+    else:
+        results = await _create_trade_chunks(req.trades)
+    failed = sum(1 for result in results if result.error is not None)
+    return BatchTradeResponse(executed=len(results) - failed, failed=failed, results=results)
+
+
+def _fetch_all_balances(conn) -> list:
     with conn.cursor() as cur:
         cur.execute("""
-            SELECT a.name, ast.symbol, SUM(le.amount) as balance
-            FROM ledger_entries le
-            JOIN accounts a   ON a.id   = le.account_id
-            JOIN assets   ast ON ast.id = le.asset_id
-            GROUP BY a.name, ast.symbol
+            SELECT a.name, ast.symbol, ab.balance
+            FROM account_balances ab
+            JOIN accounts a   ON a.id   = ab.account_id
+            JOIN assets   ast ON ast.id = ab.asset_id
             ORDER BY a.name, ast.symbol
         """)
-        rows = cur.fetchall()
+        return cur.fetchall()
+
+
+@router.get("/balances", response_model=list[AccountBalance])
+async def get_all_balances():
+    rows = await run_db(_fetch_all_balances)
 
     grouped: dict[str, list[AssetBalance]] = defaultdict(list)
     for name, symbol, balance in rows:
@@ -154,23 +305,47 @@ async def get_all_balances(conn=Depends(get_db)):
     ]
 
 
-@router.get("/balance/{account_name}", response_model=AccountBalance)
-async def get_balance(account_name: str, conn=Depends(get_db)):
-    _resolve_account(conn, account_name)
+def _fetch_balance(conn, account_name: str) -> list:
+    account_id = _resolve_account(conn, account_name)
 
     with conn.cursor() as cur:
         cur.execute(
             """
-            SELECT ast.symbol, SUM(le.amount) as balance
-            FROM ledger_entries le
-            JOIN assets ast ON ast.id = le.asset_id
-            WHERE le.account_id = (SELECT id FROM accounts WHERE name = %s)
-            GROUP BY ast.symbol
+            SELECT ast.symbol, ab.balance
+            FROM account_balances ab
+            JOIN assets ast ON ast.id = ab.asset_id
+            WHERE ab.account_id = %s::UUID
             ORDER BY ast.symbol
         """,
-            (account_name,),
+            (account_id,),
         )
-        rows = cur.fetchall()
+        return cur.fetchall()
+
+
+def _fetch_balance_as_of(conn, account_name: str, as_of: date) -> list:
+    account_id = _resolve_account(conn, account_name)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT ast.symbol, balance_as_of(ab.account_id, ab.asset_id, %s::DATE)
+            FROM account_balances ab
+            JOIN assets ast ON ast.id = ab.asset_id
+            WHERE ab.account_id = %s::UUID
+            ORDER BY ast.symbol
+        """,
+            (as_of, account_id),
+        )
+        return cur.fetchall()
+
+
+@router.get("/balance/{account_name}", response_model=AccountBalance)
+async def get_balance(account_name: str, as_of: Optional[date] = None):
+    """Current balances, or at the end of value date `as_of` (nearest checkpoint plus later entries)."""
+    if as_of is None:
+        rows = await run_db(_fetch_balance, account_name)
+    else:
+        rows = await run_db(_fetch_balance_as_of, account_name, as_of)
 
     return AccountBalance(
         account=account_name,
@@ -178,3 +353,16 @@ async def get_balance(account_name: str, conn=Depends(get_db)):
             AssetBalance(asset=symbol, balance=float(bal)) for symbol, bal in rows
         ],
     )
+
+
+@router.get("/db-stats")
+async def get_db_stats():
+    """Connection pool state plus per-operation and per-query timings."""
+    return {
+        "pool": db.default_pool.get_stats(),
+        "accounts": default_account_registry.get_stats(),
+        "reconciliation": default_reconciler.get_stats(),
+        "checkpoints": default_checkpointer.get_stats(),
+        "idempotency": default_idempotency_cache.get_stats(),
+        **default_db_stats.get_stats(),
+    }
@@ -0,0 +1,102 @@
+"""
+Tests for the gold spot price service against a local fake of goldapi.io.
+
+Run from the backend directory:
+    python -m pytest src/tests/test_gold_spot_price.py
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from src.benchmarks.fake_goldapi import FakeGoldApi
+from src.pricings import price_client
+from src.pricings.models import TickData, WebSocketSymbol
+from src.pricings.spot_price import GoldSpotService
+from src.pricings.stream_manager import PriceStreamManager
+
+
+def _service(api: FakeGoldApi, **kwargs) -> GoldSpotService:
+    options = {"ttl_seconds": 10.0, "timeout": 0.5, "stream_manager": PriceStreamManager()}
+    options.update(kwargs)
+    return GoldSpotService(api.api_url, "test-key", **options)
+
+
+def _with_tick(manager: PriceStreamManager, bid: float, ask: float):
+    tick = TickData(
+        symbol=WebSocketSymbol.XAU_USD.value,
+        bid=bid,
+        ask=ask,
+        timestamp=datetime.now(timezone.utc),
+        spread=ask - bid,
+    )
+    manager.latest_ticks[WebSocketSymbol.XAU_USD.value] = (tick, time.monotonic())
+
+
+def _run(api: FakeGoldApi, scenario):
+    api.start()
+    try:
+        async def main():
+            try:
+                return await scenario()
+            finally:
+                await price_client.close_http_clients()
+
+        return asyncio.run(main())
+    finally:
+        api.stop()
+
+
+def test_cached_and_coalesced():
+    api = FakeGoldApi(port=8767, latency=0.2)
+    service = _service(api)
+
+    async def scenario():
+        quotes = await asyncio.gather(*[service.get_quote() for _ in range(20)])
+        again = await service.get_quote()
+        return quotes, again
+
+    quotes, again = _run(api, scenario)
+    assert api.request_count == 1
+    assert {quote.price for quote in quotes} == {2350.25}
+    assert again.source == "goldapi"
+    assert service.hits == 1
+
+
+def test_slow_api_falls_back_to_stream_tick():
+    api = FakeGoldApi(port=8768, latency=2.0)
+    service = _service(api, timeout=0.2)
+
+    async def scenario():
+        _with_tick(service.stream_manager, 2340.0, 2341.0)
+        started = asyncio.get_running_loop().time()
+        quote = await service.get_quote()
+        return quote, asyncio.get_running_loop().time() - started
+
+    quote, elapsed = _run(api, scenario)
+    assert quote.source == "stream"
+    assert quote.price == 2340.5
+    assert elapsed < 1.0
+
+
+def test_rate_limit_backs_off():
+    api = FakeGoldApi(port=8769)
+    api.status = 429
+    service = _service(api, ttl_seconds=0.0, rate_limit_backoff=60.0)
+
+    async def scenario():
+        _with_tick(service.stream_manager, 2330.0, 2330.5)
+        return [await service.get_quote() for _ in range(5)]
+
+    quotes = _run(api, scenario)
+    # Only the first call reaches goldapi; the rest skip it during the backoff
+    assert api.request_count == 1
+    assert service.rate_limited == 1
+    assert all(quote.source == "stream" for quote in quotes)
+
+
+if __name__ == "__main__":
+    test_cached_and_coalesced()
+    test_slow_api_falls_back_to_stream_tick()
+    test_rate_limit_backs_off()
+    print("ok")
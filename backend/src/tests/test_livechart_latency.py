@@ -0,0 +1,74 @@
+"""
+Latency test: /livechart_data must not block the event loop.
+
+Points the pricing client at a local stand-in upstream that answers after
+UPSTREAM_LATENCY seconds, starts a /livechart_data request and, while it is
+in flight, polls GET / and checks each probe still answers promptly.
+
+Run from the backend directory:
+    python -m pytest src/tests/test_livechart_latency.py
+or
+    python -m src.tests.test_livechart_latency
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.benchmarks.stand_in_server import StandInServer
+from src.main import app
+from src.pricings import price_client
+
+UPSTREAM_LATENCY = 2.0  # seconds
+PROBE_INTERVAL = 0.05
+MAX_PROBE_LATENCY = 0.25  # seconds, far below UPSTREAM_LATENCY
+
+
+async def _measure(base_url: str) -> tuple[float, list[float], dict]:
+    price_client.BASE_URL = base_url
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"trading_pairs": "xau_usd", "interval": 3600, "sort": "asc", "limit": 500, "offset": 0}
+
+        started = time.perf_counter()
+        livechart = asyncio.create_task(client.post("/livechart_data", json=payload))
+
+        probes = []
+        while not livechart.done():
+            probe_started = time.perf_counter()
+            response = await client.get("/")
+            assert response.status_code == 200
+            probes.append(time.perf_counter() - probe_started)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+        response = await livechart
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200
+        await price_client.close_http_clients()
+        return elapsed, probes, response.json()
+
+
+def test_other_endpoints_stay_responsive():
+    server = StandInServer(port=8766, latency=UPSTREAM_LATENCY)
+    server.start()
+    original_base_url = price_client.BASE_URL
+    try:
+        elapsed, probes, data = asyncio.run(_measure(server.base_url))
+    finally:
+        price_client.BASE_URL = original_base_url
+        server.stop()
+
+    print(
+        f"livechart {elapsed:.2f}s, {len(probes)} probes, "
+        f"max {max(probes) * 1000:.1f}ms, mean {sum(probes) / len(probes) * 1000:.1f}ms"
+    )
+    assert elapsed >= UPSTREAM_LATENCY
+    # A blocking upstream call would leave no room for probes, or hold one for ~2s
+    assert len(probes) >= UPSTREAM_LATENCY / (PROBE_INTERVAL + MAX_PROBE_LATENCY)
+    assert max(probes) < MAX_PROBE_LATENCY
+    assert data["data"][-1]["EMA_20"] is not None
+
+
+if __name__ == "__main__":
+    test_other_endpoints_stay_responsive()
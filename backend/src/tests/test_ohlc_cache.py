@@ -0,0 +1,74 @@
+"""
+Tests for stitching cached OHLC windows when upstream moves between reads.
+
+Run from the backend directory:
+    python -m pytest src/tests/test_ohlc_cache.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.pricings import cache as cache_module
+from src.pricings.cache import CACHE_MISS, CACHE_PARTIAL, OHLCCache
+from src.pricings.models import TradingPair
+from src.pricings.series import OHLCSeries
+
+
+class FakeUpstream:
+    """Hourly candles served newest first; `close_candle` appends a new one."""
+
+    def __init__(self, candles: int):
+        self.start = datetime(2026, 10, 1)
+        self.count = candles
+        self.requests = []
+
+    def close_candle(self):
+        self.count += 1
+
+    async def get_ohlc_series(self, trading_pair, interval=3600, limit=50, offset=0, sort="desc"):
+        self.requests.append((offset, limit))
+        indexes = np.arange(self.count)[::-1][offset:offset + limit]
+        closes = 1000.0 + indexes
+        return OHLCSeries(
+            trading_pair.value,
+            [self.start + timedelta(hours=int(i)) for i in indexes],
+            closes,
+            closes,
+            closes,
+            closes,
+        )
+
+
+def test_new_candle_between_reads_is_not_stitched(monkeypatch):
+    upstream = FakeUpstream(1000)
+    monkeypatch.setattr(cache_module, "get_ohlc_series", upstream.get_ohlc_series)
+    cache = OHLCCache(ttl_seconds=600)
+
+    async def scenario():
+        await cache.get_series(TradingPair.XAU_USD, 3600, limit=24, offset=10)
+        upstream.close_candle()
+        return await cache.get_series_with_status(TradingPair.XAU_USD, 3600, limit=30, offset=0)
+
+    series, status = asyncio.run(scenario())
+
+    # The head edge overlapped the cached segment, saw the shift and refetched
+    assert status == CACHE_MISS
+    assert series.close.tolist() == [1000.0 + i for i in range(1000, 970, -1)]
+
+
+def test_unchanged_upstream_is_stitched(monkeypatch):
+    upstream = FakeUpstream(1000)
+    monkeypatch.setattr(cache_module, "get_ohlc_series", upstream.get_ohlc_series)
+    cache = OHLCCache(ttl_seconds=600)
+
+    async def scenario():
+        await cache.get_series(TradingPair.XAU_USD, 3600, limit=24, offset=10)
+        return await cache.get_series_with_status(TradingPair.XAU_USD, 3600, limit=40, offset=0)
+
+    series, status = asyncio.run(scenario())
+
+    assert status == CACHE_PARTIAL
+    assert upstream.requests[1:] == [(0, 11), (33, 7)]
+    assert series.close.tolist() == [1000.0 + i for i in range(999, 959, -1)]